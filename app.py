@@ -9,10 +9,17 @@ Created on Sun Jun 15 13:45:54 2025
 # main_app.py
 import streamlit as st
 
+from core import data_store, perf, warmup
+
 st.set_page_config(
     page_title="国企改革量化指标分析",
     layout="wide"
 )
+perf.start_run("主页")
+# 服务启动后第一位访问者打开主页时，就在后台加载两个工作表、省界并建好索引，
+# 用户选择页面、输入密码时数据已经就绪（每个数据版本只启动一次）
+data_version = data_store.data_version()
+warmup.start_background(data_version)
 
 def protect_page():
     """
@@ -48,8 +55,14 @@ def protect_page():
             return False
 
 
-# 使用 st.title 设置页面上的主标题
-st.title("中央企业、地方国企改革深化提升行动重点量化指标")
-# 在主页上添加一些引导性文字
-st.write("---")
-st.info("请在左侧的侧边栏中选择“中央企业”或“地方国企”页面进行查看。")
\ No newline at end of file
+with perf.stage("主页渲染"):
+    # 使用 st.title 设置页面上的主标题
+    st.title("中央企业、地方国企改革深化提升行动重点量化指标")
+    # 在主页上添加一些引导性文字
+    st.write("---")
+    st.info("请在左侧的侧边栏中选择“中央企业”或“地方国企”页面进行查看。")
+
+if data_version is not None:
+    warmup.render_status(data_version)
+
+perf.render_panel()
\ No newline at end of file
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+比较页面各区改成片段（st.fragment）前后，单次操作的重跑耗时和发往浏览器的数据量。
+
+同一个操作分别以两种方式执行：
+- 整页重跑：原先的行为，任何控件变化都从头执行页面脚本，所有图表重新发送；
+- 片段重跑：只执行控件所在的片段，只发送该片段内的元素。
+
+AppTest 每次运行都新建 ScriptRunner 和片段存储，只能整页重跑。这里沿用 AppTest 的 LocalScriptRunner，
+让同一个模拟会话的各次运行共用一份片段存储，并像浏览器那样在 RerunData 中指明要重跑的片段。
+共享缓存（st.cache_resource、面板缓存）在计时前已预热，两种方式的差别只来自重跑的范围。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_fragments.py [--repeat 10] [--page central|province|all]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+try:
+    # 装了 orjson 时 plotly 用它序列化，先在主线程导入
+    import orjson  # noqa: F401
+except ImportError:
+    pass
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from streamlit import source_util  # noqa: E402
+from streamlit.runtime.fragment import MemoryFragmentStorage  # noqa: E402
+from streamlit.runtime.pages_manager import PagesManager  # noqa: E402
+from streamlit.runtime.scriptrunner import RerunData  # noqa: E402
+from streamlit.runtime.state import SafeSessionState, SessionState  # noqa: E402
+from streamlit.runtime.state.common import TESTING_KEY  # noqa: E402
+from streamlit.testing.v1.element_tree import parse_tree_from_messages  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner, require_widgets_deltas  # noqa: E402
+
+from bench_pages import PAGES, TIMEOUT, share_runtime  # noqa: E402
+
+# 页面 -> [(操作说明, 控件类型, 控件 key, 新的取值)]，取值为 None 时选下拉框的另一项
+INTERACTIONS = {
+    'central': [
+        ("修改趋势起始年份", 'selectbox', 'start_year', None),
+        ("打开跨期对比", 'toggle', 'compare_on', True),
+        ("切换导出格式", 'radio', 'central_export_format', 'Excel'),
+    ],
+    'province': [
+        ("打开跨期对比", 'toggle', 'compare_on', True),
+        ("打开多指标分析", 'toggle', 'multi_on', True),
+        ("切换导出格式", 'radio', 'province_export_format', 'Parquet'),
+    ],
+}
+
+
+class FragmentScriptRunner(LocalScriptRunner):
+    """一次运行的 ScriptRunner：片段存储由会话传入，可以只重跑指定的片段。"""
+
+    def __init__(self, script_path, session_state, fragment_storage):
+        # 页面列表在进程内缓存，换一个页面文件运行前要清空（AppTest 也这样做），否则执行的仍是上一个页面
+        source_util.invalidate_pages_cache()
+        super().__init__(script_path, session_state, PagesManager(script_path, setup_watcher=False))
+        self._fragment_storage = fragment_storage
+
+    def run_once(self, widget_state, fragment_id=None):
+        # 与浏览器的请求相同：片段内的控件变化时带上片段 id，ScriptRunner 只执行该片段
+        self.request_rerun(RerunData(
+            widget_states=widget_state, fragment_id=fragment_id, is_fragment_scoped_rerun=bool(fragment_id),
+        ))
+        self.start()
+        require_widgets_deltas(self, TIMEOUT)
+        return parse_tree_from_messages(self.forward_msgs())
+
+
+class PageSession:
+    """一个已登录的模拟会话：会话状态和片段存储在各次运行之间保留。"""
+
+    def __init__(self, page):
+        self.path = PAGES[page]
+        state = SessionState()
+        # 控件树读取下拉框的 format_func 时用到（与 AppTest 相同）
+        state[TESTING_KEY] = {}
+        state["password_correct"] = True
+        self.session_state = SafeSessionState(state, lambda: None)
+        self.fragments = MemoryFragmentStorage()
+        self.tree = None
+        self.widget_fragments = {}
+
+    def run(self, widget_state=None, fragment_id=None):
+        """执行一次运行，返回 (耗时 ms, 发送的 delta 数, 字节数)。"""
+        runner = FragmentScriptRunner(self.path, self.session_state, self.fragments)
+        t0 = time.perf_counter()
+        tree = runner.run_once(widget_state, fragment_id)
+        elapsed = (time.perf_counter() - t0) * 1000
+        if tree.exception:
+            raise RuntimeError(f"{self.path} 出错: {tree.exception[0].message}")
+        deltas = [msg for msg in runner.forward_msgs() if msg.HasField("delta")]
+        if fragment_id is None:
+            self.tree = tree
+            self.tree._runner = self
+            self.widget_fragments = widget_fragments(deltas)
+        return elapsed, len(deltas), sum(msg.ByteSize() for msg in deltas)
+
+    def changed_state(self, kind, key, value):
+        """在最近一次整页运行的控件树上修改一个控件，返回 (浏览器会发回的控件状态, 控件所在片段)。"""
+        widget = getattr(self.tree, kind)(key=key)
+        if value is None:
+            value = next(option for option in widget.options if option != str(widget.value))
+            value = type(widget.value)(value)
+        widget.set_value(value)
+        return self.tree.get_widget_states(), self.widget_fragments.get(key)
+
+
+def widget_fragments(deltas):
+    """控件 key -> 所在片段的 id（不在片段内的控件不出现）。"""
+    result = {}
+    for msg in deltas:
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        widget_id = getattr(getattr(element, kind), "id", "") if kind else ""
+        if msg.delta.fragment_id and widget_id.startswith("$$ID-"):
+            result[widget_id.split("-", 2)[2]] = msg.delta.fragment_id
+    return result
+
+
+def measure(page, kind, key, value, scoped, repeat):
+    samples = []
+    for _ in range(repeat + 1):
+        session = PageSession(page)
+        session.run()
+        widget_state, fragment_id = session.changed_state(kind, key, value)
+        if scoped and fragment_id is None:
+            raise RuntimeError(f"控件 {key} 不在片段内")
+        samples.append(session.run(widget_state, fragment_id if scoped else None))
+    # 第一轮预热缓存，不计入
+    samples = samples[1:]
+    return (statistics.median(ms for ms, _, _ in samples), samples[-1][1], samples[-1][2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较整页重跑与片段重跑")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--page", choices=[*PAGES, 'all'], default='all')
+    args = parser.parse_args()
+
+    share_runtime()
+    print(f"{'页面':<10}{'操作':<14}{'整页(ms)':>10}{'片段(ms)':>10}{'整页 delta':>12}{'片段 delta':>12}"
+          f"{'整页(KB)':>10}{'片段(KB)':>10}")
+    for page in (PAGES if args.page == 'all' else [args.page]):
+        for label, kind, key, value in INTERACTIONS[page]:
+            full_ms, full_deltas, full_bytes = measure(page, kind, key, value, False, args.repeat)
+            frag_ms, frag_deltas, frag_bytes = measure(page, kind, key, value, True, args.repeat)
+            print(f"{page:<10}{label:<14}{full_ms:>10.1f}{frag_ms:>10.1f}{full_deltas:>12}{frag_deltas:>12}"
+                  f"{full_bytes / 1024:>10.1f}{frag_bytes / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+比较不同简化级别的省界对地图的影响：加载耗时、px.choropleth 构图 + 序列化耗时，
+以及 st.plotly_chart 发往浏览器的 JSON 大小。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_geo.py [--repeat 10]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import plotly.express as px  # noqa: E402
+
+from core import data_store, geo  # noqa: E402
+
+INDICATOR = "截至本填报期末，监管企业营业收入（亿元）"
+
+
+def build_map(panel_data, geojson):
+    fig = px.choropleth(
+        panel_data, geojson=geojson, locations='省份', featureidkey="properties.name",
+        color='数值', color_continuous_scale="spectral",
+    )
+    fig.update_geos(fitbounds="locations", visible=False)
+    return fig.to_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    df = data_store.load_sheet('地方')
+    panel_data = df[(df['指标名称'] == INDICATOR) & (df['年份'] == 2025) & (df['季度'] == 1)]
+
+    print(f"{'级别':<8}{'点数':>8}{'读取(ms)':>10}{'构图+序列化(ms)':>18}{'载荷(KB)':>10}")
+    for level in [None] + list(geo.SIMPLIFY_LEVELS):
+        geo.load_china_geojson.cache_clear()
+        t0 = time.perf_counter()
+        geojson = geo.load_china_geojson(level)
+        load_ms = (time.perf_counter() - t0) * 1000
+
+        samples = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            payload = build_map(panel_data, geojson)
+            samples.append((time.perf_counter() - t0) * 1000)
+        print(f"{level or 'full':<8}{geo.count_points(geojson):>8}{load_ms:>10.1f}"
+              f"{statistics.median(samples):>18.1f}{len(payload.encode('utf-8')) / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+比较页面每次重跑时的数据筛选耗时：整表布尔筛选 vs. 预建的行位置索引。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_index.py [--repeat 50]
+
+只统计页面脚本中的数据准备部分（显示名称、按指标/章节/面板筛选），不含作图。
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from core import data_store, indexing  # noqa: E402
+
+CENTRAL_INDICATOR = "截至本填报期末，本企业研发人员占比（%），指标68/指标4"
+LOCAL_CHAPTER = "基本情况统计"
+LOCAL_INDICATOR = "截至本填报期末，监管企业营业收入（亿元）"
+
+
+def central_scan(df, year, quarter):
+    df['指标显示名称'] = df['指标名称'] + ' --- ' + df['指标序号'].astype(str)
+    sorted(df['指标显示名称'].unique())
+    data = df[df['指标名称'] == CENTRAL_INDICATOR].copy()
+    data[(data['年份'] == year) & (data['季度'] == quarter)].nlargest(10, '数值')
+
+
+def central_indexed(index, year, quarter):
+    catalog = index.indicator_catalog
+    sorted((catalog['指标名称'] + ' --- ' + catalog['指标序号']).unique())
+    index.indicator_rows(CENTRAL_INDICATOR)
+    index.panel_rows(CENTRAL_INDICATOR, year, quarter).nlargest(10, '数值')
+
+
+def local_scan(df, year, quarter):
+    chapter = df[df['所属章节'] == LOCAL_CHAPTER].copy()
+    chapter['指标显示名称'] = chapter['指标序号'].astype(str) + ' --- ' + chapter['指标名称']
+    sorted(chapter['指标显示名称'].unique())
+    chapter[(chapter['指标名称'] == LOCAL_INDICATOR) & (chapter['年份'] == year) & (chapter['季度'] == quarter)]
+    chapter[chapter['指标名称'] == LOCAL_INDICATOR]['单位'].dropna()
+
+
+def local_indexed(index, year, quarter):
+    index.chapter_rows(LOCAL_CHAPTER)
+    catalog = index.indicator_catalog[index.indicator_catalog['所属章节'] == LOCAL_CHAPTER]
+    sorted((catalog['指标序号'] + ' --- ' + catalog['指标名称']).unique())
+    index.panel_rows(LOCAL_INDICATOR, year, quarter)
+    index.indicator_rows(LOCAL_INDICATOR)['单位'].dropna()
+
+
+def timeit(func, arg, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(arg, 2025, 1)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    cases = [
+        ('中央', '企业名称', central_scan, central_indexed),
+        ('地方', '省份', local_scan, local_indexed),
+    ]
+    print(f"{'工作表':<6}{'整表筛选(ms)':>14}{'索引(ms)':>12}{'加速比':>10}{'建索引(ms)':>14}")
+    for sheet, entity_col, scan, indexed in cases:
+        df = data_store.load_sheet(sheet)
+        t0 = time.perf_counter()
+        index = indexing.SheetIndex(df, entity_col)
+        build_ms = (time.perf_counter() - t0) * 1000
+        scan_ms = timeit(scan, df, args.repeat)
+        indexed_ms = timeit(indexed, index, args.repeat)
+        print(f"{sheet:<6}{scan_ms:>14.2f}{indexed_ms:>12.2f}{scan_ms / indexed_ms:>9.1f}x{build_ms:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+比较工作表加载耗时：原先的 pd.read_excel 路径 vs. 列式缓存的冷/热读取。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_load.py [--repeat 5]
+
+每一轮都在新的子进程中执行，模拟 Streamlit 进程重启后的冷启动。
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+SHEETS = ['中央', '地方']
+
+# 在子进程中执行的代码片段，输出耗时（秒）
+SNIPPETS = {
+    # 页面原先 load_data 的做法
+    "read_excel": """
+import pandas as pd
+df = pd.read_excel(DATA_FILE, sheet_name=SHEET)
+df['数值'] = df['数值'].astype(str).str.replace('%', '', regex=False)
+df['数值'] = pd.to_numeric(df['数值'], errors='coerce')
+df.dropna(subset=['数值'], inplace=True)
+df['年份'] = df['年份'].astype(int)
+df['季度'] = df['季度'].astype(int)
+""",
+    # 没有缓存文件：解析 Excel 并写入缓存（写到临时目录，不动仓库下已部署的 .cache/）
+    "cache_cold": """
+import atexit, shutil, tempfile
+data_store.CACHE_DIR = tempfile.mkdtemp(prefix="bench_load_")
+atexit.register(shutil.rmtree, data_store.CACHE_DIR, True)
+T0 = time.perf_counter()
+df = data_store.load_sheet(SHEET)
+""",
+    # 缓存文件已存在：内存映射读取
+    "cache_warm": """
+data_store.load_sheet(SHEET)
+T0 = time.perf_counter()
+df = data_store.load_sheet(SHEET)
+""",
+}
+
+
+def run_once(name, sheet):
+    code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {ROOT_DIR!r})\n"
+        "from core import data_store\n"
+        "DATA_FILE = data_store.DATA_FILE\n"
+        f"SHEET = {sheet!r}\n"
+        "T0 = time.perf_counter()\n"
+        + SNIPPETS[name]
+        + "print(time.perf_counter() - T0)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'工作表':<6}{'方式':<12}{'中位数(s)':>10}{'最小(s)':>10}")
+    for sheet in SHEETS:
+        for name in SNIPPETS:
+            samples = [run_once(name, sheet) for _ in range(args.repeat)]
+            print(f"{sheet:<6}{name:<12}{statistics.median(samples):>10.3f}{min(samples):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+比较页面共享数据的两种内存表示：
+
+- 字符串列: 原先 load_shared_sheet 的结果。文本列是 object 数组（字符串对象已去重共享，
+            每行仍要一个 8 字节指针），整数列为 int64。
+- 紧凑表示: data_store.compact_frame 之后。文本列为 category（每行 1~2 字节的整数编码），
+            整数列缩到最小整数类型。
+
+报告每列实际占用的字节数（共享的字符串对象只算一次，与 memory_usage(deep=True) 不同），
+以及构建整份数据时 tracemalloc 统计的常驻内存，再比较页面上常见的等值筛选的耗时。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_memory.py [--repeat 50]
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import pandas as pd  # noqa: E402
+
+from core import data_store, indexing  # noqa: E402
+
+SHEETS = {
+    '中央': ("截至本填报期末，本企业研发人员占比（%），指标68/指标4", ['中国一汽', '东风公司', '航天科技']),
+    '地方': ("截至本填报期末，监管企业营业收入（亿元）", ['北京市', '上海市', '广东省']),
+}
+
+
+def load_strings(sheet_name):
+    """原先的共享数据：派生列补齐后直接冻结，不做紧凑转换。"""
+    df = data_store.add_derived_columns(data_store.load_sheet(sheet_name), sheet_name)
+    return data_store.freeze_frame(df)
+
+
+def column_bytes(df):
+    sizes = {}
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            sizes[col] = values.cat.codes.to_numpy().nbytes + object_bytes(values.cat.categories.to_numpy())
+        elif values.dtype == object:
+            sizes[col] = values.to_numpy().nbytes + object_bytes(values.to_numpy())
+        else:
+            sizes[col] = values.to_numpy().nbytes
+    return pd.Series(sizes)
+
+
+def object_bytes(array):
+    unique = {id(obj): obj for obj in array}
+    return sum(sys.getsizeof(obj) for obj in unique.values())
+
+
+def resident_bytes(load, sheet_name):
+    """加载一份数据后仍被它引用的内存（列式缓存事先建好，这里只读内存映射文件）。"""
+    gc.collect()
+    tracemalloc.start()
+    df = load(sheet_name)
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return df, current
+
+
+def timeit(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def filters(df, sheet_name, indicator, entities):
+    entity_col = data_store.SHEET_ENTITY[sheet_name]
+    return {
+        '指标名称 ==': lambda: df[df['指标名称'] == indicator],
+        f'{entity_col} isin': lambda: df[df[entity_col].isin(entities)],
+        '年份/季度 ==': lambda: df[(df['年份'] == 2025) & (df['季度'] == 1)],
+        '建 SheetIndex': lambda: indexing.SheetIndex(df, entity_col),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    data_store.build_cache(list(SHEETS))
+    for sheet_name, (indicator, entities) in SHEETS.items():
+        strings, strings_resident = resident_bytes(load_strings, sheet_name)
+        compact, compact_resident = resident_bytes(data_store.load_shared_sheet, sheet_name)
+        before, after = column_bytes(strings), column_bytes(compact)
+
+        print(f"\n== {sheet_name}：{len(compact)} 行")
+        print(f"{'列':<10}{'原类型':>10}{'紧凑类型':>10}{'原(KB)':>12}{'紧凑(KB)':>12}")
+        for col in compact.columns:
+            print(f"{col:<10}{str(strings[col].dtype):>10}{str(compact[col].dtype):>10}"
+                  f"{before[col] / 1024:>12.1f}{after[col] / 1024:>12.1f}")
+        print(f"{'合计':<10}{'':>20}{before.sum() / 1024:>12.1f}{after.sum() / 1024:>12.1f}"
+              f"  （{before.sum() / after.sum():.1f}x）")
+        print(f"{'常驻(tracemalloc)':<30}{strings_resident / 1024:>12.1f}{compact_resident / 1024:>12.1f}"
+              f"  （{strings_resident / compact_resident:.1f}x）")
+
+        print(f"{'筛选':<16}{'原(ms)':>10}{'紧凑(ms)':>10}{'加速比':>10}")
+        old_cases = filters(strings, sheet_name, indicator, entities)
+        new_cases = filters(compact, sheet_name, indicator, entities)
+        for name in old_cases:
+            old_ms = timeit(old_cases[name], args.repeat)
+            new_ms = timeit(new_cases[name], args.repeat)
+            print(f"{name:<16}{old_ms:>10.2f}{new_ms:>10.2f}{old_ms / new_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
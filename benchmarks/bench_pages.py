@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+用 Streamlit AppTest 模拟多个用户同时使用两个页面（不需要浏览器或网络），
+报告重跑延迟的 p50/p95/p99、各缓存阶段的命中率、全进程面板缓存的命中情况和每个会话的内存占用。
+
+每个模拟会话：输入密码登录（走页面的 check_password 表单），然后按脚本随机地
+切换指标、年份、季度、章节和搜索关键词，每个操作触发一次重跑并计时。
+所有会话在同一进程中并发执行，共享 st.cache_resource，和线上部署时一致。
+缓存命中率来自 core.perf 的分阶段埋点（每个会话都带 ?perf=1）。
+
+每个会话的内存在并发测试之后单独测：依次打开若干个会话并保持引用，
+用 tracemalloc 统计新增的内存再取平均，避免 tracemalloc 拖慢延迟测试。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_pages.py [--sessions 8] [--actions 10] [--page central|province|all]
+                                     [--seed 0] [--json out.json]
+
+比较数据层改动时，在改动前后各运行一次，用 --json 保存结果对比。
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import warnings
+from unittest.mock import MagicMock
+
+import numpy as np
+try:
+    # 装了 orjson 时 plotly 用它序列化；先在主线程导入，避免多个线程同时首次导入
+    import orjson  # noqa: F401
+except ImportError:
+    pass
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import streamlit as st  # noqa: E402
+from streamlit import config  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.secrets import Secrets  # noqa: E402
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner  # noqa: E402
+
+from core import panel_cache  # noqa: E402
+
+for _name in ("streamlit.runtime.scriptrunner_utils.script_run_context",
+              "streamlit.runtime.caching.cache_data_api",
+              "streamlit.runtime.caching.cache_resource_api"):
+    logging.getLogger(_name).disabled = True
+# 页面和 plotly 的弃用提示与负载无关，每次重跑都打印会淹没报告
+warnings.simplefilter("ignore", (DeprecationWarning, FutureWarning))
+
+PASSWORD = "bench"
+TIMEOUT = 300
+SEARCH_TERMS = ["研发", "营业收入", "占比", "yfry", "3(68/4)", "研发 投入", "资产 负债"]
+PAGES = {
+    'central': os.path.join(ROOT_DIR, "pages", "1_central.py"),
+    'province': os.path.join(ROOT_DIR, "pages", "2_province.py"),
+}
+
+
+def share_runtime():
+    """
+    AppTest 按单个测试设计：每次 run() 都临时替换全局的 Runtime 实例、st.secrets 和 config.get_option，
+    结束时再清空/还原，多个会话并发时会互相覆盖（如另一个会话运行到一半时 Runtime 被清空、
+    global.appTest 被还原，下拉框不再登记测试用的 format_func）。
+    这里让所有会话共用一个模拟的 Runtime、一份 secrets 和固定的配置，AppTest 的替换和还原不再生效。
+
+    另外每个 AppTest 会话各自编译页面脚本，Python 3.11 在多个线程同时 compile() 时偶尔会报
+    "AST constructor recursion depth mismatch"。线上一个进程只有一份 ScriptCache，这里也让所有会话共用一份，
+    编译在它的锁内串行进行，且每个页面只编译一次。
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+    secrets = Secrets()
+    secrets._secrets = {"password": PASSWORD}
+    st.secrets = secrets
+    config.set_option("global.appTest", True)
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+
+
+class Session:
+    """一个模拟用户：登录后按随机脚本操作页面，记录每次重跑的耗时和缓存命中情况。"""
+
+    def __init__(self, page, seed):
+        self.page = page
+        self.rng = random.Random(seed)
+        self.latencies = []
+        self.stages = []
+        self.at = AppTest.from_file(PAGES[page], default_timeout=TIMEOUT)
+        self.at.query_params["perf"] = "1"
+
+    def run(self, widget=None):
+        t0 = time.perf_counter()
+        (widget or self.at).run()
+        self.latencies.append((time.perf_counter() - t0) * 1000)
+        if self.at.exception:
+            raise RuntimeError(f"{self.page} 页面出错: {self.at.exception[0].message}")
+        if self.at.error:
+            raise RuntimeError(f"{self.page} 页面报错: {self.at.error[0].value}")
+        state = self.at.session_state
+        if "_perf" in state:
+            self.stages.extend(state["_perf"]["current"])
+
+    def login(self):
+        self.run()
+        self.at.text_input(key="password").input(PASSWORD)
+        # check_password 表单的提交按钮，密码正确时页面会调用 st.rerun()
+        self.run(self.at.button[0].click())
+
+    def act(self):
+        """随机执行一个操作。"""
+        action = self.rng.choice(self.actions())
+        action()
+
+    def actions(self):
+        """当前页面上可执行的操作（搜索无结果时页面提前结束，只剩搜索框和指标下拉框）。"""
+        boxes = list(self.at.selectbox)
+        if self.page == 'central':
+            # 第一个下拉框是指标，带 key 的是面板年份 / 季度
+            picks = boxes[:1] + [box for box in boxes if box.key in ("panel_year", "panel_quarter")]
+            return [self._search] + [self._pick(box) for box in picks]
+        # 地方页面的四个下拉框依次为 章节 / 指标 / 年份 / 季度
+        return [self._pick(box) for box in boxes[:4]]
+
+    def _pick(self, box):
+        def action():
+            if box.disabled or not box.options:
+                return self.run()
+            self.run(box.select(self.rng.choice(box.options)))
+        return action
+
+    def _search(self):
+        term = self.rng.choice(SEARCH_TERMS)
+        self.run(self.at.text_input[0].input(term))
+
+
+def run_concurrent(page, sessions, actions, seed):
+    """sessions 个会话同时登录并各执行 actions 个操作，返回全部会话。"""
+    users = [Session(page, seed + i) for i in range(sessions)]
+    barrier = threading.Barrier(sessions)
+    errors = []
+
+    def worker(user):
+        barrier.wait()
+        try:
+            user.login()
+            for _ in range(actions):
+                user.act()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return users
+
+
+def session_memory(page, sessions, seed):
+    """依次打开 sessions 个会话（登录并各操作几次）并保持引用，返回平均每个会话新增的字节数。"""
+    # 先完整走一遍，保证共享缓存已经建好，下面只统计会话自身的开销
+    Session(page, seed).login()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = []
+    for i in range(sessions):
+        user = Session(page, seed + i)
+        user.login()
+        for _ in range(3):
+            user.act()
+        held.append(user)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / sessions
+
+
+def cache_rates(users):
+    """各缓存阶段的命中次数和命中率（登录前的首次运行没有埋点，不计入）。"""
+    counts = {}
+    for user in users:
+        for sample in user.stages:
+            if sample["cache"]:
+                hit, total = counts.get(sample["stage"], (0, 0))
+                counts[sample["stage"]] = (hit + (sample["cache"] == "hit"), total + 1)
+    return {stage: {"hits": hit, "total": total, "rate": hit / total} for stage, (hit, total) in counts.items()}
+
+
+def panel_cache_delta(before, after):
+    """一次并发测试期间全进程面板缓存的命中 / 未命中 / 淘汰次数。"""
+    delta = {name: after[name] - before[name] for name in ("hits", "misses", "evictions")}
+    total = delta["hits"] + delta["misses"]
+    delta["hit_rate"] = delta["hits"] / total if total else None
+    delta["entries"] = after["entries"]
+    return delta
+
+
+def summarize(page, users, elapsed, memory, panels):
+    latencies = np.array([ms for user in users for ms in user.latencies])
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "page": page,
+        "sessions": len(users),
+        "reruns": len(latencies),
+        "seconds": elapsed,
+        "reruns_per_second": len(latencies) / elapsed,
+        "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": latencies.max(),
+        "cache": cache_rates(users),
+        "panel_cache": panels,
+        "session_memory_mb": memory / 2**20,
+    }
+
+
+def print_report(result):
+    print(f"\n== {result['page']}：{result['sessions']} 个会话，{result['reruns']} 次重跑，"
+          f"{result['seconds']:.1f} s（{result['reruns_per_second']:.1f} 次/秒）")
+    print(f"{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'最大(ms)':>10}{'内存/会话(MB)':>16}")
+    print(f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+          f"{result['max_ms']:>10.1f}{result['session_memory_mb']:>16.2f}")
+    print(f"{'缓存阶段':<24}{'命中':>8}{'总数':>8}{'命中率':>8}")
+    for stage, rate in result["cache"].items():
+        print(f"{stage:<24}{rate['hits']:>8}{rate['total']:>8}{rate['rate']:>8.0%}")
+    panels = result["panel_cache"]
+    rate = f"{panels['hit_rate']:.0%}" if panels["hit_rate"] is not None else "-"
+    print(f"面板缓存：命中 {panels['hits']}，未命中 {panels['misses']}（命中率 {rate}），"
+          f"淘汰 {panels['evictions']}，现有 {panels['entries']} 条")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多会话并发的页面负载测试")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--actions", type=int, default=10, help="每个会话登录后的操作次数")
+    parser.add_argument("--page", choices=[*PAGES, 'all'], default='all')
+    parser.add_argument("--memory-sessions", type=int, default=4, help="测内存时依次打开的会话数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="把结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    share_runtime()
+    results = []
+    for page in (PAGES if args.page == 'all' else [args.page]):
+        before = panel_cache.stats()
+        t0 = time.perf_counter()
+        users = run_concurrent(page, args.sessions, args.actions, args.seed)
+        elapsed = time.perf_counter() - t0
+        panels = panel_cache_delta(before, panel_cache.stats())
+        memory = session_memory(page, args.memory_sessions, args.seed)
+        result = summarize(page, users, elapsed, memory, panels)
+        print_report(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2, default=float)
+
+
+if __name__ == "__main__":
+    main()
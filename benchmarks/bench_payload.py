@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+比较页面默认视图中各图表发往浏览器的 JSON 大小：原先的 px 构图（全精度数值、条形图附带 text 数组、
+地图嵌入整份省界）与 core.figures 构建层（舍入到显示精度、省界以 URL 引用）。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_payload.py
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import plotly.express as px  # noqa: E402
+
+from core import data_store, figures, geo  # noqa: E402
+
+CENTRAL_INDICATOR = "截至本填报期末，本企业研发人员占比（%），指标68/指标4"
+LOCAL_INDICATOR = "截至本填报期末，监管企业营业收入（亿元）"
+
+
+def old_bar(panel_data):
+    fig = px.bar(panel_data, x='数值', y='企业名称', orientation='h', title='Top 10', text='数值', color='企业名称')
+    fig.update_traces(texttemplate='%{text:.1f}', textposition='outside')
+    fig.update_traces(hovertemplate='<b>%{y}</b><br>数值: %{x:.1f}<extra></extra>')
+    return fig
+
+
+def old_line(time_series_data):
+    fig = px.line(time_series_data, x='时间', y='数值', color='企业名称', markers=True, title='趋势')
+    fig.update_traces(hovertemplate='时间: %{x}<br>数值: %{y:.1f}<extra></extra>')
+    return fig
+
+
+def old_map(panel_data, geojson):
+    fig = px.choropleth(panel_data, geojson=geojson, locations='省份', featureidkey="properties.name",
+                        color='数值', color_continuous_scale="spectral", title='地图')
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_traces(hovertemplate='<b>%{location}</b><br>数值: %{z:.1f}<extra></extra>')
+    return fig
+
+
+def main():
+    central = data_store.add_derived_columns(data_store.load_sheet('中央'), '中央')
+    indicator = central[central['指标名称'] == CENTRAL_INDICATOR]
+    latest = indicator['期序'].max()
+    panel = indicator[indicator['期序'] == latest].nlargest(10, '数值')
+    trend = indicator[indicator['企业名称'].isin(panel['企业名称'])].sort_values('期序')
+
+    local = data_store.load_sheet('地方')
+    local_panel = local[(local['指标名称'] == LOCAL_INDICATOR) & (local['年份'] == 2025) & (local['季度'] == 1)]
+
+    rows = [
+        ("Top 10 条形图", old_bar(panel), figures.top_bar(panel, 'Top 10', '数值', {})),
+        ("趋势折线图", old_line(trend), figures.trend_line(trend, '趋势', '数值', {})),
+        ("地图（嵌入省界）", old_map(local_panel, geo.load_china_geojson()),
+         figures.province_map(local_panel, geo.load_china_geojson(), '地图', '数值')),
+        ("地图（省界 URL）", old_map(local_panel, geo.load_china_geojson()),
+         figures.province_map(local_panel, geo.geojson_url(), '地图', '数值')),
+    ]
+    print(f"{'图表':<14}{'原先(KB)':>10}{'构建层(KB)':>12}{'减少':>8}")
+    for name, before, after in rows:
+        old_size, new_size = figures.payload_bytes(before), figures.payload_bytes(after)
+        print(f"{name:<14}{old_size / 1024:>10.1f}{new_size / 1024:>12.1f}{1 - new_size / old_size:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
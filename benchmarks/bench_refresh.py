@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+比较工作簿追加一个季度后，整表重建缓存与增量刷新（core.refresh）的耗时。
+
+新季度由脚本模拟：把工作表中最近一期的行复制一份、季度 +1，追加到表尾后写入临时工作簿。
+缓存写在临时目录中，不影响仓库下的 .cache/。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_refresh.py [--repeat 3]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from core import data_store, refresh, xlsx_stream  # noqa: E402
+
+ROW_RE = re.compile(rb'<row\b.*?</row>', re.S)
+CELL_REF_RE = re.compile(rb'(<c r="[A-Z]+)\d+"')
+
+
+def append_quarter(src, dst, sheet_name):
+    """复制 sheet_name 中最近一期的行作为下一个季度，追加到表尾。"""
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, "w", zipfile.ZIP_DEFLATED) as zout:
+        path = xlsx_stream.sheet_paths(zin)[sheet_name]
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == path:
+                data = _append_rows(data)
+            zout.writestr(item, data)
+
+
+def _append_rows(data):
+    start = data.index(b"<sheetData>") + len(b"<sheetData>")
+    end = data.index(b"</sheetData>")
+    rows = ROW_RE.findall(data[start:end])
+    periods = [re.search(rb'<c r="D\d+" t="n"><v>(\d+)</v></c><c r="E\d+" t="n"><v>(\d)</v>', row) for row in rows[1:]]
+    latest = max((int(m.group(1)), int(m.group(2))) for m in periods if m)
+    year, quarter = latest if latest[1] < 4 else (latest[0] + 1, 0)
+    pattern = rb'(<c r="D\d+" t="n"><v>)%d(</v></c><c r="E\d+" t="n"><v>)%d(</v>)' % latest
+    replacement = rb'\g<1>%d\g<2>%d\3' % (year, quarter + 1)
+    added = [re.sub(pattern, replacement, row) for row, m in zip(rows[1:], periods)
+             if m and (int(m.group(1)), int(m.group(2))) == latest]
+    number = len(rows)
+    renumbered = []
+    for row in added:
+        number += 1
+        row = re.sub(rb'<row r="\d+"', b'<row r="%d"' % number, row, count=1)
+        renumbered.append(CELL_REF_RE.sub(rb'\g<1>%d"' % number, row))
+    return data[:end] + b"".join(renumbered) + data[end:]
+
+
+def timed_refresh(cache_dir, sheet_name, file_path):
+    data_store.CACHE_DIR = cache_dir
+    t0 = time.perf_counter()
+    stats = refresh.refresh_sheet(sheet_name, file_path)
+    return time.perf_counter() - t0, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    # 计算临时工作簿的数据版本时也会写清单（manifest.json），从一开始就指向临时目录
+    cache_dir = data_store.CACHE_DIR
+    data_store.CACHE_DIR = tmp
+    try:
+        print(f"{'工作表':<8}{'新增行':>8}{'整表重建(s)':>14}{'增量刷新(s)':>14}")
+        for sheet_name in data_store.SHEET_ENTITY:
+            new_file = os.path.join(tmp, f"{sheet_name}.xlsx")
+            append_quarter(data_store.DATA_FILE, new_file, sheet_name)
+            data_store.data_version(new_file)
+            full, incremental = [], []
+            for i in range(args.repeat):
+                full_dir = os.path.join(tmp, f"full-{sheet_name}-{i}")
+                full.append(timed_refresh(full_dir, sheet_name, new_file)[0])
+
+                inc_dir = os.path.join(tmp, f"inc-{sheet_name}-{i}")
+                timed_refresh(inc_dir, sheet_name, data_store.DATA_FILE)
+                seconds, stats = timed_refresh(inc_dir, sheet_name, new_file)
+                incremental.append(seconds)
+            print(f"{sheet_name:<8}{stats['parsed_rows']:>8}"
+                  f"{statistics.median(full):>14.2f}{statistics.median(incremental):>14.2f}")
+    finally:
+        data_store.CACHE_DIR = cache_dir
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
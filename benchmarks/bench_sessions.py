@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+模拟多个会话同时重跑中央企业页面，比较两种加载方式的内存和延迟：
+
+- cache_data:     原先的做法。每次调用都从 st.cache_data 拿到一份反序列化的副本，
+                  再在整表上添加 指标显示名称 / 时间点 列。
+- cache_resource: 所有会话共享 data_store.load_shared_sheet 返回的同一个只读对象，
+                  派生列在加载时已经算好。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_sessions.py [--sessions 20]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import streamlit as st  # noqa: E402
+
+from core import data_store  # noqa: E402
+
+# 脱离 streamlit run 调用缓存函数时会刷屏提示缺少 ScriptRunContext
+for _name in ("streamlit.runtime.scriptrunner_utils.script_run_context",
+              "streamlit.runtime.caching.cache_data_api",
+              "streamlit.runtime.caching.cache_resource_api"):
+    logging.getLogger(_name).disabled = True
+
+INDICATOR = "截至本填报期末，本企业研发人员占比（%），指标68/指标4"
+
+
+@st.cache_data
+def load_copied(sheet_name):
+    return data_store.load_sheet(sheet_name)
+
+
+@st.cache_resource
+def load_shared(sheet_name, data_version):
+    return data_store.load_shared_sheet(sheet_name)
+
+
+def rerun_cache_data():
+    df = load_copied('中央')
+    df['指标显示名称'] = df['指标名称'] + ' --- ' + df['指标序号'].astype(str)
+    sorted(df['指标显示名称'].unique())
+    data = df[df['指标名称'] == INDICATOR].copy()
+    data['时间点'] = data['年份'] + data['季度'] / 10.0
+    return df, data
+
+
+def rerun_cache_resource():
+    df = load_shared('中央', data_store.data_version())
+    sorted(df['指标显示名称'].unique())
+    data = df[df['指标名称'] == INDICATOR]
+    return df, data
+
+
+def run_sessions(rerun, sessions):
+    """sessions 个线程同时执行一次重跑，并在全部完成前保持各自的结果引用。"""
+    barrier = threading.Barrier(sessions)
+    done = threading.Barrier(sessions + 1)
+    latencies = []
+    held = []
+    lock = threading.Lock()
+
+    def worker():
+        barrier.wait()
+        t0 = time.perf_counter()
+        result = rerun()
+        elapsed = (time.perf_counter() - t0) * 1000
+        with lock:
+            latencies.append(elapsed)
+            held.append(result)
+        done.wait()
+
+    threads = [threading.Thread(target=worker) for _ in range(sessions)]
+    tracemalloc.start()
+    for t in threads:
+        t.start()
+    done.wait()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for t in threads:
+        t.join()
+    return latencies, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    # 先各调用一次，把缓存填好，只比较缓存命中后的重跑
+    rerun_cache_data()
+    rerun_cache_resource()
+
+    print(f"{'方式':<16}{'p50(ms)':>10}{'最大(ms)':>10}{'常驻(MB)':>10}{'峰值(MB)':>10}")
+    for name, rerun in [('cache_data', rerun_cache_data), ('cache_resource', rerun_cache_resource)]:
+        latencies, current, peak = run_sessions(rerun, args.sessions)
+        print(f"{name:<16}{statistics.median(latencies):>10.1f}{max(latencies):>10.1f}"
+              f"{current / 2**20:>10.1f}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+比较两个工作表的完整解析：原先的 pd.read_excel + astype(str).str.replace
+与 xlsx_stream 的流式解析（串行 / 进程池并行）的耗时和峰值内存。
+
+用法（在仓库根目录下）：
+    python benchmarks/bench_stream.py [--repeat 3]
+
+每一轮都在新的子进程中执行；峰值内存取该进程及其子进程中最大的常驻内存 (ru_maxrss)。
+注意：并行版本的收益取决于机器的 CPU 核数。
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPETS = {
+    # 只导入依赖、不解析，作为内存基线
+    "import_only": """
+import pandas as pd
+from core import xlsx_stream
+""",
+    "read_excel": """
+import pandas as pd
+for sheet in SHEETS:
+    df = pd.read_excel(DATA_FILE, sheet_name=sheet)
+    df['数值'] = df['数值'].astype(str).str.replace('%', '', regex=False)
+    df['数值'] = pd.to_numeric(df['数值'], errors='coerce')
+    df.dropna(subset=['数值'], inplace=True)
+    df['年份'] = df['年份'].astype(int)
+    df['季度'] = df['季度'].astype(int)
+""",
+    "stream": """
+from core import xlsx_stream
+for sheet in SHEETS:
+    df = xlsx_stream.read_sheet(DATA_FILE, sheet)
+""",
+    "stream_parallel": """
+from core import xlsx_stream
+frames = xlsx_stream.read_sheets(DATA_FILE, SHEETS)
+""",
+}
+
+RUNNER = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from core import data_store
+DATA_FILE = data_store.DATA_FILE
+SHEETS = ['中央', '地方']
+T0 = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - T0
+peak_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+              resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+print(json.dumps({{"seconds": elapsed, "peak_mb": peak_kb / 1024}}))
+"""
+
+
+def run_once(name):
+    code = RUNNER.format(root=ROOT_DIR, body=SNIPPETS[name])
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"CPU 核数: {os.cpu_count()}")
+    print(f"{'方式':<18}{'耗时中位数(s)':>14}{'峰值内存(MB)':>14}")
+    for name in SNIPPETS:
+        samples = [run_once(name) for _ in range(args.repeat)]
+        seconds = statistics.median(s["seconds"] for s in samples)
+        peak = max(s["peak_mb"] for s in samples)
+        print(f"{name:<18}{seconds:>14.2f}{peak:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
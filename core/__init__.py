@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+仪表盘共用的数据层。
+
+各页面通过这里的模块读取 1_data.xlsx，而不是各自调用 pd.read_excel。
+"""
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+跨期对比：环比、同比、排名变化和增长率。
+
+每个指标的数据先透视成 主体 × 期序 的 numpy 矩阵（缺失为 NaN），每一期的排名也在建矩阵时
+一次算好。对比某一期时只需取出本期和对比期两列做向量运算，不需要逐个企业/省份循环；
+页面以 (工作表, 数据版本, 指标显示名称) 为键缓存矩阵，切换对比期只是一次列切片。
+
+地方表中同一 指标名称 可能对应多个 指标序号，因此矩阵以 指标显示名称 区分指标。
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import data_store, periods
+
+# 对比方式 -> 对比期相对本期向前推的季度数
+MODES = {'环比': 1, '同比': 4}
+
+COLUMNS = ['本期数值', '对比期数值', '变化', '增长率(%)', '本期排名', '对比期排名', '排名变化']
+
+
+class PanelMatrix:
+    """
+    参数:
+    rows (pd.DataFrame): 某一指标的全部行，需含 entity_col、期序 和 数值，且 (主体, 期序) 不重复。
+    entity_col (str): 主体列名，中央为 '企业名称'，地方为 '省份'。
+    """
+
+    def __init__(self, rows, entity_col):
+        self.entity_col = entity_col
+        # 主体按首次出现的顺序编号，排名并列时按这个顺序先后排
+        entity_codes, self.entities = data_store.factorize(rows[entity_col])
+        self.ordinals, period_codes = np.unique(rows['期序'].to_numpy(), return_inverse=True)
+
+        self.values = np.full((len(self.entities), len(self.ordinals)), np.nan)
+        self.values[entity_codes, period_codes] = rows['数值'].to_numpy()
+
+        # 每一列按数值从大到小排名，缺失值排在最后且不给名次
+        missing = np.isnan(self.values)
+        order = np.argsort(np.where(missing, np.inf, -self.values), axis=0, kind='stable')
+        self.ranks = np.empty_like(self.values)
+        np.put_along_axis(self.ranks, order, np.arange(1, len(self.entities) + 1, dtype=float)[:, None], axis=0)
+        self.ranks[missing] = np.nan
+
+    def column(self, ordinal):
+        """期序对应的列号，矩阵中没有这一期时返回 None。"""
+        pos = np.searchsorted(self.ordinals, ordinal)
+        if pos < len(self.ordinals) and self.ordinals[pos] == ordinal:
+            return pos
+        return None
+
+    def _slice(self, matrix, ordinal):
+        pos = self.column(ordinal)
+        if pos is None:
+            return np.full(len(self.entities), np.nan)
+        return matrix[:, pos]
+
+    def compare(self, ordinal, mode):
+        """
+        返回本期（ordinal）与对比期的对比表，按本期排名排列，本期无数据的主体排在最后。
+        排名变化为正表示名次上升。
+        """
+        base = ordinal - MODES[mode]
+        current, previous = self._slice(self.values, ordinal), self._slice(self.values, base)
+        current_rank, previous_rank = self._slice(self.ranks, ordinal), self._slice(self.ranks, base)
+        change = current - previous
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = np.where(previous != 0, change / np.abs(previous) * 100, np.nan)
+
+        table = pd.DataFrame({
+            self.entity_col: self.entities,
+            '本期数值': current,
+            '对比期数值': previous,
+            '变化': change,
+            '增长率(%)': growth,
+            '本期排名': current_rank,
+            '对比期排名': previous_rank,
+            '排名变化': previous_rank - current_rank,
+        })
+        order = np.argsort(np.where(np.isnan(current_rank), np.inf, current_rank), kind='stable')
+        table = table.take(order).reset_index(drop=True)
+        for col in ['本期排名', '对比期排名', '排名变化']:
+            table[col] = table[col].astype('Int64')
+        return table
+
+    def base_label(self, ordinal, mode):
+        return periods.period_label(ordinal - MODES[mode])
+
+    def __len__(self):
+        return len(self.entities)
+
+
+def build_matrix(index, display_name):
+    """从 SheetIndex 中取出某个显示名称的行，建立对比矩阵。"""
+    return PanelMatrix(index.take('display', display_name), index.entity_col)
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+1_data.xlsx 的列式缓存层。
+
+第一次读取某个工作表时，用 xlsx_stream 流式解析工作簿（各工作表在进程池中并行），
+把清洗后的结果写成 .cache/ 下的 Feather (Arrow IPC) 文件；之后的读取直接以内存映射方式
+打开该文件，不再解析几十 MB 的 XML。缓存文件以工作簿的修改时间和内容哈希为键，
+Excel 更新后会自动失效；重建时由 core.refresh 沿用上一版缓存中未变的季度，只解析有改动的季度。
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from . import periods, xlsx_stream
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_FILE = os.path.join(ROOT_DIR, "1_data.xlsx")
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache")
+
+# 在两个工作表中大量重复的文本列，存成字典编码（pandas 中为 category）
+CATEGORY_COLUMNS = ['所属章节', '指标名称', '企业名称', '省份']
+
+# 各工作表的主体列，以及页面下拉框中“指标显示名称”的拼接顺序
+SHEET_ENTITY = {'中央': '企业名称', '地方': '省份'}
+DISPLAY_NAME_ORDER = {'中央': ('指标名称', '指标序号'), '地方': ('指标序号', '指标名称')}
+
+_digest_lock = threading.Lock()
+_digest_memo = {}
+_build_lock = threading.Lock()
+
+
+def file_digest(file_path=DATA_FILE):
+    """返回工作簿内容的 sha256。修改时间和大小未变时直接复用上次的结果。"""
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        if key in _digest_memo:
+            return _digest_memo[key]
+
+    # 先查看磁盘上的清单，避免每个新进程都重新计算哈希
+    manifest_path = os.path.join(CACHE_DIR, "manifest.json")
+    manifest = _read_manifest(manifest_path)
+    entry = manifest.get(key[0])
+    if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+        digest = entry["sha256"]
+    else:
+        h = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        manifest[key[0]] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+        _write_manifest(manifest_path, manifest)
+
+    with _digest_lock:
+        _digest_memo[key] = digest
+    return digest
+
+
+def data_version(file_path=DATA_FILE):
+    """
+    数据版本号：工作簿内容哈希的前 16 位。下游的各类缓存都以它为键。
+    文件不存在时返回 None，由调用方的加载函数给出错误提示。
+    """
+    if not os.path.exists(file_path):
+        return None
+    return file_digest(file_path)[:16]
+
+
+def parse_sheet(sheet_name, file_path=DATA_FILE):
+    """
+    直接从 Excel 解析一个工作表（慢路径）。
+
+    去掉 '%'、丢弃无效数值、整数列转换都在流式解析时完成；
+    指标序号 统一为字符串（原表中整数和 "3(68/4)" 这样的文本混在一起，Arrow 要求单一类型）。
+    这里只需再把重复文本列转为 category。
+    """
+    return categorize(xlsx_stream.read_sheet(file_path, sheet_name))
+
+
+def categorize(df):
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def build_cache(sheet_names, file_path=DATA_FILE):
+    """
+    为尚未缓存的工作表建立列式缓存。
+
+    多个工作表在进程池中并行解析（工作进程数不超过 CPU 核数），每个子进程直接写自己的缓存文件，
+    不需要把 DataFrame 传回主进程。
+    """
+    version = data_version(file_path)
+    with _build_lock:
+        missing = [name for name in sheet_names if not os.path.exists(cache_path(name, version))]
+        workers = xlsx_stream.pool_workers(len(missing))
+        if workers <= 1:
+            for name in missing:
+                _build_one(file_path, name, version)
+        else:
+            n = len(missing)
+            with xlsx_stream.process_pool(workers) as pool:
+                list(pool.map(_build_one, [file_path] * n, missing, [version] * n, [CACHE_DIR] * n))
+
+
+def _build_one(file_path, sheet_name, version, cache_dir=None):
+    # spawn 出的子进程重新导入本模块，调用方改过的缓存目录要显式传入
+    global CACHE_DIR
+    if cache_dir is not None:
+        CACHE_DIR = cache_dir
+    # refresh 依赖本模块，放在函数内导入
+    from . import refresh
+    refresh.refresh_sheet(sheet_name, file_path, version)
+
+
+def cache_path(sheet_name, version):
+    return os.path.join(CACHE_DIR, f"{sheet_name}-{version}.feather")
+
+
+def periods_path(sheet_name, version):
+    """与缓存文件配套的各季度摘要清单，供增量刷新判断哪些季度有改动。"""
+    return os.path.join(CACHE_DIR, f"{sheet_name}-{version}.periods.json")
+
+
+def write_periods(sheet_name, version, manifest):
+    _write_manifest(periods_path(sheet_name, version), manifest)
+
+
+def load_table(sheet_name, file_path=DATA_FILE):
+    """
+    返回工作表对应的 Arrow 表（内存映射）。
+
+    缓存不存在时解析 Excel 并写入缓存：已知的工作表（SHEET_ENTITY）会一起并行解析，
+    这样另一个页面第一次打开时也能直接命中缓存。同一工作表的旧版本缓存文件会被删除。
+    """
+    version = data_version(file_path)
+    path = cache_path(sheet_name, version)
+    if not os.path.exists(path):
+        sheet_names = [sheet_name] + [name for name in SHEET_ENTITY if name != sheet_name]
+        with zipfile.ZipFile(file_path) as zf:
+            available = xlsx_stream.sheet_paths(zf)
+        build_cache([name for name in sheet_names if name in available], file_path)
+        if not os.path.exists(path):
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    return feather.read_table(path, memory_map=True)
+
+
+def load_version_table(sheet_name, version):
+    """
+    返回指定数据版本的 Arrow 表（内存映射），不看工作簿当前是哪个版本，也不会新建缓存。
+    按行位置取数时用它，保证位置与建索引时的数据一致；该版本的缓存已被新数据替换时抛出 FileNotFoundError。
+    """
+    path = cache_path(sheet_name, version)
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return feather.read_table(path, memory_map=True)
+
+
+def load_sheet(sheet_name, file_path=DATA_FILE):
+    """
+    读取一个工作表，返回清洗后的 DataFrame，文本列为普通字符串列（重复的字符串对象会被去重共享）。
+    页面使用的共享数据见 load_shared_sheet()，由 compact_frame() 再转成紧凑表示。
+    """
+    table = load_table(sheet_name, file_path)
+    columns = [
+        col.cast(col.type.value_type) if pa.types.is_dictionary(col.type) else col
+        for col in table.columns
+    ]
+    return pa.table(columns, names=table.column_names).to_pandas()
+
+
+def add_derived_columns(df, sheet_name):
+    """页面原先在每次重跑时临时拼出的列，这里在加载时一次算好。"""
+    first, second = DISPLAY_NAME_ORDER[sheet_name]
+    df['指标显示名称'] = df[first].astype(object) + ' --- ' + df[second].astype(object)
+    df['期序'] = periods.period_ordinal(df['年份'], df['季度'])
+    df['时间'] = periods.period_labels(df['期序'])
+    return df
+
+
+def compact_frame(df):
+    """
+    原地把数据转成紧凑表示并返回：
+
+    - 文本列（章节、指标、企业/省份、单位、显示名称等）转成 category：每行只存 1~2 字节的整数编码，
+      字符串只在类别表中存一份。类别按字符串排序，排序、比较的结果与原先的字符串列一致；
+      按值筛选（==、isin、groupby）都在整数编码上进行。
+    - 整数列（年份、季度、序号、期序）缩到能容纳其取值的最小整数类型。
+    - 数值 保持 float64：改成 float32 会改变显示的数值和并列排名。
+    """
+    for col in df.columns:
+        dtype = df[col].dtype
+        if dtype == object:
+            df[col] = df[col].astype('category')
+        elif isinstance(dtype, pd.CategoricalDtype):
+            values = df[col].cat.remove_unused_categories()
+            if not dtype.ordered:
+                values = values.cat.reorder_categories(sorted(values.cat.categories))
+            df[col] = values
+        elif np.issubdtype(dtype, np.integer):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def factorize(values):
+    """
+    同 pd.factorize：按首次出现的顺序编号，返回 (编号数组, 取值数组)。
+    category 列直接在整数编码上编号，只把出现过的类别还原成字符串。
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = pd.factorize(values.array)
+        return codes, np.asarray(uniques, dtype=object)
+    return pd.factorize(values.to_numpy())
+
+
+def freeze_frame(df):
+    """
+    返回一个底层数组全部只读的副本。
+
+    对它做 df.loc[...] = ... 之类的原地赋值会抛出 ValueError，
+    从而保证多个会话共享的同一份数据不会被某个页面意外改写。
+    """
+    arrays = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            codes = df[col].cat.codes.to_numpy(copy=True)
+            codes.flags.writeable = False
+            arrays[col] = pd.Categorical.from_codes(codes, dtype=df[col].dtype)
+        else:
+            arr = df[col].to_numpy(copy=True)
+            arr.flags.writeable = False
+            arrays[col] = arr
+    return pd.DataFrame(arrays, copy=False)
+
+
+def load_shared_sheet(sheet_name, file_path=DATA_FILE):
+    """读取工作表、补齐派生列、转成紧凑表示并冻结，供 st.cache_resource 在所有会话间共享同一个对象。"""
+    df = add_derived_columns(load_sheet(sheet_name, file_path), sheet_name)
+    return freeze_frame(compact_frame(df))
+
+
+def write_table(df, sheet_name, version):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = cache_path(sheet_name, version)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # 先写临时文件再改名，避免其他进程读到写了一半的缓存
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    # 不压缩，才能以内存映射方式零拷贝读取
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    _remove_stale(sheet_name, version)
+
+
+def _remove_stale(sheet_name, version):
+    prefix, current = f"{sheet_name}-", f"{sheet_name}-{version}."
+    for name in os.listdir(CACHE_DIR):
+        if (name.startswith(prefix) and name.endswith((".feather", ".periods.json"))
+                and not name.startswith(current)):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
+
+def _read_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(path, manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+各页面打开时的默认视图：中央页面的默认指标，地方页面的章节列表和每个章节的默认指标。
+页面和 core.prerender 共用这里的定义，预渲染的正是页面落地时看到的图。
+"""
+
+# 中央页面默认选中的指标（显示名称）
+CENTRAL_DEFAULT_INDICATOR = "截至本填报期末，本企业研发人员占比（%），指标68/指标4 --- 3(68/4)"
+
+# 地方页面的章节（按下拉框顺序）
+LOCAL_CHAPTERS = [
+    "基本情况统计", "零、总体要求", "一、优化国有经济布局结构，加快建设现代化产业体系",
+    "二、完善国有企业科技创新机制，加快实现高水平自立自强", "三、强化国有企业对重点领域保障，支撑国家战略安全",
+    "四、以市场化方式推进整合重组，提升国有资本配置效率", "五、推动中国特色国有企业现代公司治理和市场化经营机制制度化长效化",
+    "六、健全以管资本为主的国资监管体制", "七、营造更加市场化法治化国际化的公平竞争环境",
+    "八、全面加强国有企业党的领导和党的建设", "九、组织保障"
+]
+LOCAL_DEFAULT_CHAPTER = "基本情况统计"
+
+# 地方页面每个章节默认选中的指标（指标名称）
+DEFAULT_INDICATORS_LOCAL = {
+    "基本情况统计": "截至本填报期末，监管企业营业收入（亿元）",
+    "零、总体要求": "截至本填报期末，本年度省级国资委及监管企业组织开展学习宣贯国有企业改革深化提升行动的专题会议及集中培训次数",
+    "一、优化国有经济布局结构，加快建设现代化产业体系": "截至本填报期末，本年度监管企业前瞻性战略性新兴产业营业收入占比（指标7/指标4）",
+    "二、完善国有企业科技创新机制，加快实现高水平自立自强": "截至本填报期末，本年度监管企业（全口径）研发投入强度（指标26/指标4）",
+    "三、强化国有企业对重点领域保障，支撑国家战略安全": "截至本填报期末，省级国资委针对国务院领导同志提出的十一大问题，开展专项清理整治的次数",
+    "四、以市场化方式推进整合重组，提升国有资本配置效率": "2023年以来，监管企业开展战略性重组的次（组）数",
+    "五、推动中国特色国有企业现代公司治理和市场化经营机制制度化长效化": "今年以来，一级企业通过竞争上岗方式新聘任的管理人员总人数占比（指标87/指标86）",
+    "六、健全以管资本为主的国资监管体制": "截至本填报期末，经营性国有资产集中统一监管比例",
+    "七、营造更加市场化法治化国际化的公平竞争环境": "截至本填报期末，各级子企业中，混合所有制企业户数（穿透式口径）占比（指标129/指标2）",
+    "八、全面加强国有企业党的领导和党的建设": "截至本填报期末，一级企业中已开展党建工作责任制考核的户数占比(指标135/指标1)",
+    "九、组织保障": "截至本填报期末，本地区国有企业改革深化提升行动整体任务完成百分比（自我评估值）"
+}
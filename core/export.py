@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+把页面上的数据切片导出为 CSV / Parquet / Excel。
+
+导出直接读 .cache/ 下内存映射的列式缓存（data_store.load_version_table），按行位置分块取出再逐块写入，
+不在内存里拼出整个结果的 DataFrame；同一数据版本的缓存与页面共享的 DataFrame 行序相同，
+可以直接用 SheetIndex / RankingCube 给出的位置。
+
+页面上的 download_panel() 是一个片段，只在点击“生成导出文件”时才取位置、生成文件，平时重跑不做任何导出工作；
+生成的文件暂存在会话中，切换指标或时间后自动丢弃。
+"""
+
+import io
+import re
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import streamlit as st
+from openpyxl import Workbook
+
+from . import data_store, perf
+
+# 格式 -> (扩展名, MIME 类型)
+FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+# 每次从列式缓存取出的行数
+CHUNK_ROWS = 10_000
+# Excel 单个工作表最多 1048576 行，其中一行是表头
+EXCEL_MAX_ROWS = 1_048_575
+
+_UNSAFE_CHARS = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def iter_chunks(table, positions, extra=None, chunk_rows=CHUNK_ROWS):
+    """
+    按 positions 的顺序分块取出 Arrow 表的行，字典编码列解码为普通列。
+    extra 为 {列名: 与 positions 等长的数组}，放在最前面（如排名）。
+    positions 为空时产出一个只有表头的空块。
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    extra = extra or {}
+    for start in range(0, max(len(positions), 1), chunk_rows):
+        stop = start + chunk_rows
+        chunk = table.take(pa.array(positions[start:stop]))
+        columns = [pa.array(np.asarray(values)[start:stop]) for values in extra.values()]
+        columns += [
+            col.cast(col.type.value_type) if pa.types.is_dictionary(col.type) else col
+            for col in chunk.columns
+        ]
+        yield pa.table(columns, names=list(extra) + chunk.column_names)
+
+
+def write_csv(chunks, out):
+    # 带 BOM，Excel 直接打开时中文不会乱码
+    out.write(b'\xef\xbb\xbf')
+    writer = None
+    for chunk in chunks:
+        if writer is None:
+            writer = pa_csv.CSVWriter(out, chunk.schema)
+        writer.write_table(chunk)
+    writer.close()
+
+
+def write_parquet(chunks, out):
+    writer = None
+    for chunk in chunks:
+        if writer is None:
+            writer = pq.ParquetWriter(out, chunk.schema)
+        writer.write_table(chunk)
+    writer.close()
+
+
+def write_xlsx(chunks, out, sheet_title="数据"):
+    # write_only 模式逐行写入临时文件，不在内存中保留整个工作表
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    header_written = False
+    for chunk in chunks:
+        if not header_written:
+            ws.append(chunk.column_names)
+            header_written = True
+        for row in zip(*(col.to_pylist() for col in chunk.columns)):
+            ws.append(row)
+    wb.save(out)
+
+
+def export_rows(sheet_name, data_version, positions, fmt, extra=None):
+    """
+    把工作表中 positions 指定的行按 fmt（FORMATS 的键）导出，返回文件内容。
+    positions 来自页面按 data_version 建的索引，这里读取同一版本的列式缓存；
+    工作簿已更新、该版本的缓存已被替换时抛出 ValueError，不会从新数据中取错行。
+    """
+    if fmt == 'Excel' and len(positions) > EXCEL_MAX_ROWS:
+        raise ValueError(f"共 {len(positions)} 行，超过 Excel 单表上限，请改用 CSV 或 Parquet。")
+    try:
+        table = data_store.load_version_table(sheet_name, data_version)
+    except FileNotFoundError:
+        raise ValueError("数据文件已更新，请刷新页面后重新导出。") from None
+    chunks = iter_chunks(table, positions, extra)
+    out = io.BytesIO()
+    if fmt == 'CSV':
+        write_csv(chunks, out)
+    elif fmt == 'Parquet':
+        write_parquet(chunks, out)
+    elif fmt == 'Excel':
+        write_xlsx(chunks, out, sheet_title=sheet_name)
+    else:
+        raise ValueError(f"未知的导出格式: {fmt}")
+    return out.getvalue()
+
+
+def file_name(*parts):
+    """由指标名、时间等拼出文件名（不含扩展名），去掉文件系统不允许的字符。"""
+    name = "_".join(_UNSAFE_CHARS.sub("_", str(part)).strip("_") for part in parts if part != "")
+    return name[:120]
+
+
+def ranked(positions):
+    """按排名顺序排列的行位置，附加从 1 开始的 排名 列。"""
+    return positions, {'排名': np.arange(1, len(positions) + 1)}
+
+
+@st.fragment
+@perf.fragment("导出数据")
+def download_panel(key, sheet_name, data_version, slices):
+    """
+    页面上的导出区（片段）：选择导出内容和格式，点击后才生成文件并显示下载按钮。
+    导出区内的操作只重跑这一块，不重跑整个页面。
+
+    参数:
+    key (str): 组件 key 的前缀，同一页面内唯一。
+    sheet_name (str): 数据所在的工作表。
+    data_version (str): 页面取行位置时所用索引的数据版本，导出读取同一版本的列式缓存。
+    slices (dict 或返回 dict 的无参数函数): {导出内容名称: (文件名, 无参数函数)}。
+        文件名（不含扩展名，通常由 file_name() 生成）应包含决定该切片的全部选择（指标、时间等），
+        选择变化时旧文件随之失效；函数返回 (行位置数组, 附加列 dict 或 None)，只在点击时调用。
+        某些选择由页面上其他片段修改（整页不重跑）时传函数，每次运行导出区时重新生成。
+    """
+    if callable(slices):
+        slices = slices()
+    state_key = f"_export_{key}"
+    with st.expander("导出数据"):
+        left, right = st.columns(2)
+        with left:
+            content = st.radio("导出内容", options=list(slices), key=f"{key}_content")
+        with right:
+            fmt = st.radio("文件格式", options=list(FORMATS), horizontal=True, key=f"{key}_format")
+        stem, build = slices[content]
+        extension, mime = FORMATS[fmt]
+        name = f"{stem}.{extension}"
+
+        if st.button("生成导出文件", key=f"{key}_build"):
+            with perf.stage(f"生成导出文件 ({fmt})"):
+                positions, extra = build()
+                try:
+                    content_bytes = export_rows(sheet_name, data_version, positions, fmt, extra)
+                    st.session_state[state_key] = ((data_version, name), content_bytes)
+                except ValueError as e:
+                    st.error(str(e))
+
+        generated = st.session_state.get(state_key)
+        if generated is None:
+            return
+        if generated[0] != (data_version, name):
+            # 选择或数据版本已经变了，丢弃上一次生成的文件
+            del st.session_state[state_key]
+            return
+        st.download_button(
+            f"下载 {name}（{len(generated[1]) / 1024:.1f} KB）", generated[1],
+            file_name=name, mime=mime, key=f"{key}_download"
+        )
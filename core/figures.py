@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+页面图表的构建层。
+
+st.plotly_chart 每次重跑都会把整张图的 JSON 发给浏览器，这里在 px 构图之后尽量减小它：
+- 只带图上实际用到的数据：条形图的数值标签直接引用 x，不再附带一份相同的 text 数组；
+- 数值数组舍入到显示精度：标签和悬停都只显示 1 位小数，这里至少保留 3 位小数、6 位有效数字，
+  显示结果不变，小数值的条形长度也不会失真；
+- 地图的省界可以传 geo.geojson_url() 返回的地址，由浏览器下载一次后缓存，
+  重跑时只发送省份名和数值，不再每次嵌入整份 GeoJSON。
+
+payload_bytes() 返回图表 JSON 的字节数（与 st.plotly_chart 发送的内容相同），
+供 perf 面板和 benchmarks/bench_payload.py 对比。
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# 页面上数值统一以 1 位小数显示
+DISPLAY_DECIMALS = 1
+SIGNIFICANT_DIGITS = 6
+# 并行构图的线程数上限（不超过 CPU 核数）
+MAX_BUILD_WORKERS = min(8, os.cpu_count() or 1)
+# 相关性热力图在指标数不超过此值时才在格子里标出数值
+HEATMAP_TEXT_LIMIT = 20
+# 逐季动画地图每一帧停留的毫秒数
+MAP_FRAME_MS = 800
+
+
+def round_display(values, decimals=DISPLAY_DECIMALS, significant=SIGNIFICANT_DIGITS):
+    """
+    把数值舍入到足以显示的精度：至少比显示多 2 位小数（避免二次舍入改变显示结果），
+    且至少保留 significant 位有效数字。NaN 和 0 原样保留。
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = values.copy()
+    mask = np.isfinite(values) & (values != 0)
+    magnitude = np.floor(np.log10(np.abs(values[mask])))
+    digits = np.clip(np.maximum(decimals + 2, significant - 1 - magnitude), 0, 15)
+    scale = 10.0 ** digits
+    rounded[mask] = np.round(values[mask] * scale) / scale
+    return rounded
+
+
+def trim_figure(fig, keys=("x", "y", "z")):
+    """原地舍入各 trace 中的数值数组，返回 fig。"""
+    for trace in fig.data:
+        for key in keys:
+            values = getattr(trace, key, None)
+            if values is None or isinstance(values, str):
+                continue
+            array = np.asarray(values)
+            if array.dtype.kind in "fc":
+                trace[key] = round_display(array)
+    return fig
+
+
+def payload_bytes(fig):
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+def entity_colors(entities):
+    """按顺序给企业分配 Plotly 默认色板中的颜色，条形图和趋势图共用同一映射。"""
+    color_sequence = px.colors.qualitative.Plotly
+    return {entity: color_sequence[i % len(color_sequence)] for i, entity in enumerate(entities)}
+
+
+def plain_columns(df, *columns):
+    """
+    把 df 中的 category 列还原成普通字符串列（只处理传入的小切片）。
+    plotly 5.9 的 px 按 category 列分组时会为没有出现的类别取分组而报错。
+    """
+    decoded = {col: df[col].astype(object) for col in columns if isinstance(df[col].dtype, pd.CategoricalDtype)}
+    return df.assign(**decoded) if decoded else df
+
+
+def top_bar(panel_data, title, axis_title, color_map):
+    """中央页面的 Top 10 横向条形图。"""
+    fig = px.bar(
+        plain_columns(panel_data, '企业名称'), x='数值', y='企业名称', orientation='h',
+        title=title, color='企业名称', color_discrete_map=color_map
+    )
+    fig.update_layout(yaxis_title="企业名称", xaxis_title=axis_title, showlegend=False)
+    fig.update_yaxes(categoryorder='total ascending')
+    fig.update_traces(texttemplate='%{x:.1f}', textposition='outside')
+    fig.update_traces(hovertemplate='<b>%{y}</b><br>数值: %{x:.1f}<extra></extra>')
+    return trim_figure(fig)
+
+
+def trend_line(time_series_data, title, axis_title, color_map):
+    """
+    中央页面的 Top 10 趋势折线图。
+    数据是季度值，每个点都带标记，时间范围再长也不做降采样，只舍入数值。
+    """
+    fig = px.line(
+        plain_columns(time_series_data, '企业名称'), x='时间', y='数值', color='企业名称', markers=True,
+        title=title, color_discrete_map=color_map
+    )
+    fig.update_layout(xaxis_title="时间", yaxis_title=axis_title, legend_title="企业名称")
+    fig.update_traces(hovertemplate='时间: %{x}<br>数值: %{y:.1f}<extra></extra>')
+    return trim_figure(fig)
+
+
+def province_map(df_for_map, geojson, title, colorbar_title):
+    """
+    地方页面的省份分布地图。
+    geojson 可以是 GeoJSON dict，也可以是 geo.geojson_url() 返回的地址（推荐，省界不随每次重跑发送）。
+    """
+    fig = px.choropleth(
+        plain_columns(df_for_map, '省份'),
+        geojson=geojson,
+        locations='省份',
+        featureidkey="properties.name",
+        color='数值',
+        color_continuous_scale="spectral",
+        #color_continuous_scale="rdylbu",
+        title=title
+    )
+    fig.update_coloraxes(colorbar_title=colorbar_title)
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(margin={"r":0, "t":40, "l":0, "b":0})
+    fig.update_traces(hovertemplate='<b>%{location}</b><br>数值: %{z:.1f}<extra></extra>')
+    return trim_figure(fig)
+
+
+def province_map_animation(provinces, labels, values, geojson, indicator, colorbar_title, active=0):
+    """
+    地方页面的逐季动画地图：values 为 省份 × 期 的矩阵，labels 为各期的时间标签，active 为初始显示的期。
+
+    播放按钮和滑块在浏览器中切换帧，拖动时不重跑页面。省界和省份只放在第一条 trace 中，
+    每一帧只带该期的数值；色阶范围固定为全部期的最小、最大值，不同季度的颜色可以直接比较。
+    """
+    z = round_display(values)
+    finite = values[np.isfinite(values)]
+    cmin, cmax = (finite.min(), finite.max()) if finite.size else (0, 1)
+    hovertemplate = '<b>%{location}</b><br>数值: %{z:.1f}<extra></extra>'
+
+    def title(i):
+        return f"{labels[i]} - {indicator}"
+
+    frames = [
+        go.Frame(name=label, data=[go.Choropleth(z=z[:, i])], layout=dict(title_text=title(i)))
+        for i, label in enumerate(labels)
+    ]
+    # geo 图换帧时必须重绘
+    jump = dict(mode="immediate", frame=dict(duration=0, redraw=True), transition=dict(duration=0))
+    fig = go.Figure(
+        data=[go.Choropleth(
+            geojson=geojson, locations=list(provinces), featureidkey="properties.name",
+            z=z[:, active], coloraxis="coloraxis", hovertemplate=hovertemplate,
+        )],
+        frames=frames,
+        layout=dict(
+            title_text=title(active),
+            coloraxis=dict(colorscale="spectral", cmin=cmin, cmax=cmax, colorbar_title=colorbar_title),
+            margin={"r": 0, "t": 40, "l": 0, "b": 0},
+            updatemenus=[dict(
+                type="buttons", direction="left", x=0, y=0, xanchor="left", yanchor="top", pad=dict(t=40),
+                buttons=[
+                    dict(label="播放", method="animate", args=[
+                        None, dict(frame=dict(duration=MAP_FRAME_MS, redraw=True), fromcurrent=True,
+                                   transition=dict(duration=0))
+                    ]),
+                    dict(label="暂停", method="animate", args=[[None], jump]),
+                ],
+            )],
+            sliders=[dict(
+                active=active, x=0.15, len=0.85, y=0, yanchor="top", pad=dict(t=30),
+                currentvalue=dict(prefix="时间: "),
+                steps=[dict(label=label, method="animate", args=[[label], jump]) for label in labels],
+            )],
+        ),
+    )
+    fig.update_geos(fitbounds="locations", visible=False)
+    return fig
+
+
+def small_bar(entities, values, title, axis_title):
+    """
+    多指标小多图中的一格：某个指标数值最大的若干主体（entities / values 按数值从大到小排列）。
+    格子多时 px 的开销成为瓶颈，这里直接用 graph_objects 构图。
+    """
+    fig = go.Figure(
+        go.Bar(
+            x=round_display(values[::-1]), y=list(entities[::-1]), orientation='h',
+            hovertemplate='<b>%{y}</b><br>数值: %{x:.1f}<extra></extra>',
+        ),
+        layout=dict(
+            title=title, title_font_size=13, height=320, xaxis_title=axis_title,
+            margin={"r": 10, "t": 40, "l": 10, "b": 10},
+        ),
+    )
+    return fig
+
+
+def correlation_heatmap(corr, title):
+    """
+    指标间相关系数热力图，行列标签为短标签（指标序号）。
+    指标较多时不在格子里标数值，悬停仍可查看。
+    """
+    labels = list(corr.columns)
+    fig = go.Figure(
+        go.Heatmap(
+            z=np.round(corr.to_numpy(), 4), x=labels, y=labels,
+            zmin=-1, zmax=1, colorscale="RdBu", colorbar_title="相关系数",
+            texttemplate='%{z:.2f}' if len(labels) <= HEATMAP_TEXT_LIMIT else None,
+            hovertemplate='%{y} × %{x}<br>相关系数: %{z:.2f}<extra></extra>',
+        ),
+        layout=dict(title=title, height=max(400, 22 * len(labels) + 120), yaxis_autorange='reversed'),
+    )
+    return fig
+
+
+def build_parallel(builders, max_workers=MAX_BUILD_WORKERS):
+    """
+    在线程池中并行执行一组无参数的构图函数（如 functools.partial），按原顺序返回图表。
+    只有一个任务或只有一个 CPU 核时直接在当前线程依次执行：plotly 构图大部分时间持有 GIL，
+    单核上开线程只会更慢。
+    """
+    builders = list(builders)
+    if len(builders) <= 1 or max_workers <= 1:
+        return [build() for build in builders]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(builders))) as pool:
+        return list(pool.map(lambda build: build(), builders))
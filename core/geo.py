@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+随仓库一起发布的中国省级行政区划 GeoJSON。
+
+static/geo/china.json 是完整精度的省界（由 ECharts 的 china 地图解码而来，
+properties.name 已换成与“地方”工作表一致的省份全称，外环为顺时针以符合 d3/plotly 的约定）。
+同目录下的 china.<级别>.json 是按不同容差预先简化过的版本，地图越粗，
+px.choropleth 序列化发给浏览器的数据越少。修改完整版后执行
+
+    python -m core.geo
+
+重新生成各级简化文件。
+
+.streamlit/config.toml 开启了 server.enableStaticServing，static/ 下的文件以 app/static/... 对外提供，
+地图可以只引用 geojson_url() 返回的地址，由浏览器下载一次后缓存，不必每次重跑都嵌入整份省界。
+"""
+
+import json
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from .data_store import ROOT_DIR
+
+GEO_DIR = os.path.join(ROOT_DIR, "static", "geo")
+FULL_FILE = os.path.join(GEO_DIR, "china.json")
+
+# 级别 -> (Douglas-Peucker 容差（度）, 坐标保留的小数位数)
+SIMPLIFY_LEVELS = {
+    'high': (0.02, 3),
+    'medium': (0.05, 3),
+    'low': (0.1, 2),
+}
+DEFAULT_LEVEL = 'medium'
+
+# Streamlit 静态文件服务下 static/geo 的相对地址
+STATIC_URL = "app/static/geo"
+
+# 地图上兵团的数值并入新疆（见 merge_bingtuan）
+XINJIANG = '新疆维吾尔自治区'
+BINGTUAN = '新疆生产建设兵团'
+
+
+def geojson_path(level=None):
+    """level 为 None 时返回完整精度文件的路径。"""
+    if level is None:
+        return FULL_FILE
+    if level not in SIMPLIFY_LEVELS:
+        raise ValueError(f"未知的简化级别: {level}")
+    return os.path.join(GEO_DIR, f"china.{level}.json")
+
+
+def geojson_url(level=DEFAULT_LEVEL):
+    """
+    省界文件在 Streamlit 静态文件服务下的相对地址，plotly.js 会自行下载。
+    对应的文件不存在时返回 None，调用方应改为嵌入 load_china_geojson() 的结果。
+    """
+    path = geojson_path(level)
+    if not os.path.exists(path):
+        return None
+    return f"{STATIC_URL}/{os.path.basename(path)}"
+
+
+@lru_cache(maxsize=None)
+def load_china_geojson(level=DEFAULT_LEVEL):
+    """
+    从磁盘读取省界 GeoJSON，不访问网络。
+
+    返回的 dict 在进程内共享，调用方不应修改。简化文件缺失时现场从完整版生成。
+    """
+    path = geojson_path(level)
+    if level is not None and not os.path.exists(path):
+        tolerance, precision = SIMPLIFY_LEVELS[level]
+        return simplify_geojson(load_china_geojson(None), tolerance, precision)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def merge_bingtuan(provinces, values, unit):
+    """
+    标准地图中“新疆”是一个整体：单位不是 % 时，把兵团同一期的数值并入新疆维吾尔自治区，兵团本身不上图。
+
+    provinces 为省份数组，values 与之逐行对应，可以是某一期的数值（一维），
+    也可以是 省份 × 期序 的矩阵（二维，各期分别合并，兵团或新疆缺数据的期不合并）。
+    返回 (保留的行 mask, 合并后的数值)，数值与输入同形状，兵团所在行不变。
+    """
+    provinces = np.asarray(provinces, dtype=object)
+    values = np.asarray(values, dtype=float)
+    is_bingtuan = provinces == BINGTUAN
+    is_xinjiang = provinces == XINJIANG
+    if unit == '%' or not is_bingtuan.any() or not is_xinjiang.any():
+        return ~is_bingtuan, values
+    # 同一指标名称对应多个指标序号时一期会有多行新疆，与原先一致，都按第一行合并
+    xinjiang, bingtuan = values[is_xinjiang][0], values[is_bingtuan][0]
+    merged = values.copy()
+    merged[is_xinjiang] = np.where(np.isnan(bingtuan), xinjiang, xinjiang + bingtuan)
+    return ~is_bingtuan, merged
+
+
+def map_frame(panel_data, unit):
+    """把某一期的省份数据整理成地图用的数据（兵团并入新疆，见 merge_bingtuan）。"""
+    keep, values = merge_bingtuan(panel_data['省份'].to_numpy(), panel_data['数值'].to_numpy(), unit)
+    return panel_data[keep].assign(数值=values[keep])
+
+
+def map_matrix(matrix, unit):
+    """
+    逐季动画地图用的数据：comparison.PanelMatrix 的 省份 × 期序 矩阵一次合并兵团，
+    返回 (省份, 期序, 数值矩阵)。
+    """
+    keep, values = merge_bingtuan(matrix.entities, matrix.values, unit)
+    return matrix.entities[keep], matrix.ordinals, values[keep]
+
+
+def simplify_geojson(geojson, tolerance, precision):
+    """对每个环做 Douglas-Peucker 简化并截断坐标精度，返回新的 FeatureCollection。"""
+    features = []
+    for feature in geojson['features']:
+        geometry = feature['geometry']
+        if geometry['type'] == 'Polygon':
+            polygons = [geometry['coordinates']]
+        else:
+            polygons = geometry['coordinates']
+
+        simplified = []
+        for polygon in polygons:
+            exterior = _simplify_ring(polygon[0], tolerance, precision)
+            if exterior is None:
+                # 在该容差下退化的小岛直接舍去
+                continue
+            holes = [_simplify_ring(ring, tolerance, precision) for ring in polygon[1:]]
+            simplified.append([exterior] + [ring for ring in holes if ring is not None])
+        if not simplified:
+            # 整个区域都太小（如澳门），保留最大的外环，只截断精度
+            largest = max(polygons, key=lambda p: len(p[0]))
+            simplified = [[_round_ring(largest[0], precision)]]
+
+        if len(simplified) == 1:
+            new_geometry = {'type': 'Polygon', 'coordinates': simplified[0]}
+        else:
+            new_geometry = {'type': 'MultiPolygon', 'coordinates': simplified}
+        features.append({
+            'type': 'Feature',
+            'id': feature.get('id'),
+            'properties': feature['properties'],
+            'geometry': new_geometry,
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def count_points(geojson):
+    total = 0
+    for feature in geojson['features']:
+        geometry = feature['geometry']
+        polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+        total += sum(len(ring) for polygon in polygons for ring in polygon)
+    return total
+
+
+def build_simplified_files():
+    """根据完整版重新生成所有级别的简化文件，返回 {级别: (点数, 字节数)}。"""
+    full = load_china_geojson(None)
+    report = {}
+    for level, (tolerance, precision) in SIMPLIFY_LEVELS.items():
+        simplified = simplify_geojson(full, tolerance, precision)
+        text = json.dumps(simplified, ensure_ascii=False, separators=(',', ':'))
+        with open(geojson_path(level), "w", encoding="utf-8") as f:
+            f.write(text)
+        report[level] = (count_points(simplified), len(text.encode("utf-8")))
+    load_china_geojson.cache_clear()
+    return report
+
+
+def _round_ring(ring, precision):
+    out = []
+    for x, y in ring:
+        point = [round(x, precision), round(y, precision)]
+        if not out or point != out[-1]:
+            out.append(point)
+    if out[0] != out[-1]:
+        out.append(out[0])
+    return out
+
+
+def _simplify_ring(ring, tolerance, precision):
+    """简化一个闭合环；结果少于 4 个点（无法构成多边形）时返回 None。"""
+    points = ring[:-1] if ring[0] == ring[-1] else list(ring)
+    if len(points) < 3:
+        return None
+    # 闭合环以起点和离起点最远的点为界拆成两段，分别简化
+    far = max(range(len(points)), key=lambda i: _dist2(points[0], points[i]))
+    first = _douglas_peucker(points[:far + 1], tolerance)
+    second = _douglas_peucker(points[far:] + [points[0]], tolerance)
+    result = _round_ring(first[:-1] + second, precision)
+    if len(result) < 4:
+        return None
+    return result
+
+
+def _douglas_peucker(points, tolerance):
+    """非递归的 Douglas-Peucker，返回保留下来的点（含首尾）。"""
+    if len(points) < 3:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_dist, index = 0.0, None
+        for i in range(start + 1, end):
+            d = _segment_distance(points[i], points[start], points[end])
+            if d > max_dist:
+                max_dist, index = d, i
+        if index is not None and max_dist > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _segment_distance(p, a, b):
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx == 0 and dy == 0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    t = ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    return math.hypot(p[0] - a[0] - t * dx, p[1] - a[1] - t * dy)
+
+
+def _dist2(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+
+if __name__ == "__main__":
+    for level, (points, size) in build_simplified_files().items():
+        print(f"{level:<8}{points:>8} 点{size / 1024:>10.1f} KB")
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+按 (指标, 年份, 季度) 等维度预先建立的行位置索引。
+
+页面每次交互都会从头重跑脚本；原先每次都要对整张表做字符串比较的布尔筛选。
+这里在每个数据版本只建一次索引，之后按键取出行位置，再用 take 取出对应切片。
+"""
+
+import numpy as np
+
+# 索引名 -> 分组列
+INDEX_KEYS = {
+    'indicator': ['指标名称'],
+    'chapter': ['所属章节'],
+    'period': ['年份', '季度'],
+    'panel': ['指标名称', '年份', '季度'],
+    # 派生列，load_shared_sheet 加载的数据才有
+    'display': ['指标显示名称'],
+}
+
+_EMPTY = np.array([], dtype=np.intp)
+
+
+class SheetIndex:
+    """
+    一个工作表的行位置索引。
+
+    参数:
+    df (pd.DataFrame): 清洗后的工作表数据（行索引为 0..n-1），建索引后不应再被修改。
+        索引直接引用该对象，不做复制，因此可以与 data_store.load_shared_sheet 的共享数据配合使用。
+    entity_col (str): 主体列名，中央为 '企业名称'，地方为 '省份'。
+    """
+
+    def __init__(self, df, entity_col):
+        self.df = df
+        self.entity_col = entity_col
+        self._positions = {}
+        for name, cols in INDEX_KEYS.items():
+            if not set(cols) <= set(df.columns):
+                continue
+            groups = self.df.groupby(cols, sort=False, observed=True).indices
+            if len(cols) == 1:
+                # 单列分组时 pandas 的键是标量，这里统一成一元组
+                groups = {(k,): v for k, v in groups.items()}
+            self._positions[name] = groups
+
+        # 每个指标的行再按 期序 排一次，时间范围查询就可以二分查找
+        self._timeline = {}
+        if '期序' in df.columns:
+            ordinals = df['期序'].to_numpy()
+            for (indicator,), positions in self._positions['indicator'].items():
+                ordered = positions[np.argsort(ordinals[positions], kind='stable')]
+                self._timeline[indicator] = (ordered, ordinals[ordered])
+
+        # 指标目录：每个 (章节, 指标名称, 指标序号) 组合一行，用来生成下拉选项
+        catalog_cols = [c for c in ['所属章节', '指标名称', '指标序号', '指标显示名称'] if c in df.columns]
+        self.indicator_catalog = self.df[catalog_cols].drop_duplicates().reset_index(drop=True)
+
+    def positions(self, name, *key):
+        """返回某个键对应的行位置数组，键不存在时返回空数组。"""
+        return self._positions.get(name, {}).get(key, _EMPTY)
+
+    def take(self, name, *key):
+        return self.df.take(self.positions(name, *key))
+
+    def indicator_rows(self, indicator):
+        return self.take('indicator', indicator)
+
+    def chapter_rows(self, chapter):
+        return self.take('chapter', chapter)
+
+    def period_rows(self, year, quarter):
+        return self.take('period', year, quarter)
+
+    def panel_rows(self, indicator, year, quarter, display_name=None):
+        """
+        某指标某一期的行。地方表中同一指标名称可能对应多个指标序号，
+        传入 display_name（指标显示名称）时只保留该序号的行。
+        """
+        rows = self.take('panel', indicator, year, quarter)
+        if display_name is not None:
+            rows = rows[rows['指标显示名称'] == display_name]
+        return rows
+
+    def range_positions(self, indicator, start=None, end=None):
+        """
+        某指标在期序 [start, end]（含两端，None 表示不限）内的行位置，按时间先后排列，同期内保持原始行序。
+        两次二分查找定位区间，耗时 O(log n + k)。
+        """
+        if indicator not in self._timeline:
+            return _EMPTY
+        ordered, ordinals = self._timeline[indicator]
+        lo = 0 if start is None else np.searchsorted(ordinals, start, side='left')
+        hi = len(ordered) if end is None else np.searchsorted(ordinals, end, side='right')
+        return ordered[lo:hi]
+
+    def indicator_range(self, indicator, start, end):
+        """返回某指标在期序 [start, end] 内的行，见 range_positions()。"""
+        return self.df.take(self.range_positions(indicator, start, end))
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def empty(self):
+        return self.df.empty
+
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+多指标分析的批量取数。
+
+一次选中多个指标（或整个章节）时，不再对每个指标分别筛选一遍整表：
+先从 SheetIndex 拼出所有指标的行位置，只取 主体 / 期序 / 数值 三列，
+再一次性透视成 指标 × 主体 × 期序 的三维矩阵。小多图和相关性热力图都只是这个矩阵的切片，
+各格小图交给 figures.build_parallel 构建。
+"""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from . import data_store, figures
+
+# 小多图最多显示的指标数
+MAX_SMALL_MULTIPLES = 30
+
+
+class IndicatorBatch:
+    """
+    参数:
+    index (indexing.SheetIndex): 工作表索引（数据需含 指标显示名称 / 期序 派生列）。
+    display_names (sequence of str): 选中的指标显示名称，顺序即展示顺序。
+    """
+
+    def __init__(self, index, display_names):
+        self.entity_col = index.entity_col
+        self.display_names = list(display_names)
+        blocks = [index.positions('display', name) for name in self.display_names]
+        lengths = np.array([len(block) for block in blocks])
+        positions = np.concatenate(blocks) if blocks else np.array([], dtype=np.intp)
+        df = index.df
+
+        indicator_codes = np.repeat(np.arange(len(blocks)), lengths)
+        entity_codes, self.entities = data_store.factorize(df[self.entity_col].take(positions))
+        self.ordinals, period_codes = np.unique(df['期序'].to_numpy()[positions], return_inverse=True)
+        self.values = np.full((len(blocks), len(self.entities), len(self.ordinals)), np.nan)
+        self.values[indicator_codes, entity_codes, period_codes] = df['数值'].to_numpy()[positions]
+
+        # 每个指标取第一行的 指标序号 / 单位，用作图表的短标签和坐标轴标题
+        firsts = np.cumsum(lengths) - lengths
+        has_rows = lengths > 0
+        self.numbers = [''] * len(blocks)
+        self.units = [''] * len(blocks)
+        for col, target in [('指标序号', self.numbers), ('单位', self.units)]:
+            # 只取各指标第一行，不把整列 category 还原成字符串
+            values = df[col].take(positions[firsts[has_rows]]).tolist()
+            for i, value in zip(np.flatnonzero(has_rows), values):
+                target[i] = '' if pd.isna(value) else str(value)
+
+    def period_matrix(self, ordinal):
+        """某一期的 指标 × 主体 矩阵；没有这一期时全为 NaN。"""
+        pos = np.searchsorted(self.ordinals, ordinal)
+        if pos < len(self.ordinals) and self.ordinals[pos] == ordinal:
+            return self.values[:, :, pos]
+        return np.full(self.values.shape[:2], np.nan)
+
+    def top(self, ordinal, n=10):
+        """每个指标在某一期数值最大的 n 个主体，返回 [(主体数组, 数值数组), ...]。"""
+        matrix = self.period_matrix(ordinal)
+        order = np.argsort(np.where(np.isnan(matrix), np.inf, -matrix), axis=1, kind='stable')[:, :n]
+        result = []
+        for row, columns in zip(matrix, order):
+            columns = columns[~np.isnan(row[columns])]
+            result.append((self.entities[columns], row[columns]))
+        return result
+
+    def correlation(self, ordinal, min_periods=3):
+        """
+        某一期各指标之间的相关系数矩阵（按主体成对计算，忽略缺失值）。
+        共同有值的主体少于 min_periods 时为 NaN；与任何指标都算不出相关系数的指标不出现在结果中。
+        """
+        frame = pd.DataFrame(self.period_matrix(ordinal).T, columns=self.labels())
+        corr = frame.corr(min_periods=min_periods)
+        keep = corr.notna().sum(axis=0).to_numpy() > 1
+        return corr.loc[keep, keep]
+
+    def labels(self):
+        """热力图等处使用的短标签：指标序号，重复时附加顺序号。"""
+        labels, seen = [], {}
+        for number, name in zip(self.numbers, self.display_names):
+            label = number or name[:12]
+            seen[label] = seen.get(label, 0) + 1
+            labels.append(label if seen[label] == 1 else f"{label} ({seen[label]})")
+        return labels
+
+    def __len__(self):
+        return len(self.display_names)
+
+
+def small_multiples(batch, ordinal, top_n=10, limit=MAX_SMALL_MULTIPLES):
+    """为前 limit 个指标各建一张 Top N 小图，返回 [(显示名称, 图表), ...]。"""
+    builders = []
+    for i, (entities, values) in enumerate(batch.top(ordinal, top_n)[:limit]):
+        name = batch.display_names[i]
+        title = name if len(name) <= 28 else name[:27] + '…'
+        axis_title = f"数值 ({batch.units[i]})" if batch.units[i] else "数值"
+        builders.append(partial(figures.small_bar, entities, values, title, axis_title))
+    return list(zip(batch.display_names, figures.build_parallel(builders)))
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+进程内共享的面板结果缓存（LRU）。
+
+页面上的一个面板 = 筛选出的小数据切片 + 据此构建的图表。不同会话查看同一个
+(指标, 年份, 季度, ...) 组合时，原先每个会话都要重新取排名、筛选、px 构图；
+这里按 (数据版本, 视图键) 缓存整个面板的结果，所有会话共用，最久未使用的条目在超出容量时淘汰。
+
+- 视图键沿用 prerender.view_key()：预渲染命中的默认视图进入缓存后，与其他视图一样按 LRU 管理；
+- 缓存的是 go.Figure 而不是图表 JSON：Streamlit 1.40 的 st.plotly_chart 收到 dict 时会重新校验成
+  go.Figure，比 px 构图本身还慢；收到 go.Figure 时只读取、不修改它；
+- 缓存的数据切片和图表在会话间共享，调用方不应修改。
+
+stats() 返回命中 / 未命中 / 淘汰次数，perf 面板和 benchmarks/bench_pages.py 会显示。
+"""
+
+import threading
+from collections import OrderedDict
+
+# 默认最多缓存的面板数
+MAX_ENTRIES = 256
+
+
+class PanelCache:
+    """
+    线程安全的 LRU 缓存。构建函数在锁外执行：两个会话同时未命中同一个键时会各构建一次，
+    结果相同，后写入的覆盖先写入的。
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_build(self, key, build):
+        """命中时直接返回缓存的结果，否则调用无参数的 build() 并写入缓存。"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else None,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+_MISSING = object()
+
+# 两个页面共用的全进程缓存
+panels = PanelCache()
+
+
+def get_or_build(data_version, key, build):
+    return panels.get_or_build((data_version, key), build)
+
+
+def stats():
+    return panels.stats()
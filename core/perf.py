@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+可选的页面性能埋点。
+
+在地址后加 ?perf=1，或在 secrets 中设置 perf = true 后开启（开启后本会话一直有效）。
+开启后各页面把每次重跑拆成若干阶段计时：数据加载（并记录 st.cache_resource 命中/未命中）、
+筛选、px 构图、st.plotly_chart 序列化（并记录发往浏览器的图表 JSON 大小），
+在侧边栏的“性能分析”中显示本次重跑的明细和全进程面板缓存（core.panel_cache）的命中情况，
+可把本会话的全部样本导出为 JSON / CSV。
+
+片段（st.fragment）单独重跑时页面脚本不从头执行，侧边栏也不会更新。用 fragment() 装饰片段函数：
+片段单独重跑时开始一次新的、标明片段名的记录，并在片段末尾显示这次重跑的明细；
+整页重跑时片段内的样本仍计入整页这次重跑，只标上片段名。
+
+未开启时 stage() 返回空的上下文管理器，plotly_chart() 直接调用 st.plotly_chart，几乎没有额外开销。
+"""
+
+import contextlib
+import csv
+import functools
+import io
+import json
+import time
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from . import figures, panel_cache
+
+STATE_KEY = "_perf"
+# 每个会话最多保留的样本数，超出后丢弃最早的
+MAX_SAMPLES = 5000
+FIELDS = ["run", "page", "fragment", "stage", "ms", "cache", "bytes"]
+
+
+def enabled():
+    state = st.session_state.get(STATE_KEY)
+    return bool(state and state["enabled"])
+
+
+def _requested():
+    if st.query_params.get("perf") == "1":
+        return True
+    # 没有 secrets.toml 时直接读 st.secrets 会在页面上显示“No secrets found”错误框，先静默检查
+    if not st.secrets.load_if_toml_exists():
+        return False
+    return bool(st.secrets.get("perf", False))
+
+
+def _fragment_rerun():
+    """本次运行是否只重跑片段（而不是从头执行页面脚本）。"""
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+def start_run(page, fragment=None):
+    """
+    在页面脚本开头调用，开始记录一次重跑。
+    在片段内调用时传 fragment（片段名）：片段单独重跑时开始一次新的记录，
+    整页重跑时不另起记录，只把之后的样本标上片段名。
+    """
+    state = st.session_state.get(STATE_KEY)
+    if state is None:
+        state = {"enabled": False, "run": 0, "samples": []}
+        st.session_state[STATE_KEY] = state
+    state["enabled"] = state["enabled"] or _requested()
+    if not state["enabled"]:
+        return
+    state["fragment"] = fragment or ""
+    if fragment and not _fragment_rerun():
+        return
+    state["run"] += 1
+    state["page"] = page
+    state["started"] = time.perf_counter()
+    state["current"] = []
+    state["open"] = []
+
+
+@contextlib.contextmanager
+def _timed(name, cached):
+    state = st.session_state[STATE_KEY]
+    sample = {"run": state["run"], "page": state["page"], "fragment": state["fragment"], "stage": name, "ms": None,
+              "cache": "hit" if cached else "", "bytes": None}
+    state["open"].append(sample)
+    t0 = time.perf_counter()
+    try:
+        yield sample
+    finally:
+        sample["ms"] = (time.perf_counter() - t0) * 1000
+        state["open"].remove(sample)
+        _append(state, sample)
+
+
+def stage(name, cached=False):
+    """
+    计时一个阶段。cached=True 表示该阶段调用的是缓存函数：默认记为命中，
+    缓存函数体内调用 record_miss() 时改记为未命中。
+    """
+    if not enabled():
+        return contextlib.nullcontext()
+    return _timed(name, cached)
+
+
+def record_miss():
+    """在 st.cache_resource / st.cache_data 函数体内调用：函数体只有在缓存未命中时才会执行。"""
+    if not enabled():
+        return
+    for sample in reversed(st.session_state[STATE_KEY]["open"]):
+        if sample["cache"]:
+            sample["cache"] = "miss"
+            return
+
+
+def plotly_chart(fig, name, **kwargs):
+    """st.plotly_chart 的包装：开启埋点时记录序列化 + 发送耗时和图表 JSON 的字节数。"""
+    if not enabled():
+        return st.plotly_chart(fig, **kwargs)
+    with _timed(name, cached=False) as sample:
+        result = st.plotly_chart(fig, **kwargs)
+    sample["bytes"] = figures.payload_bytes(fig)
+    return result
+
+
+def render_panel():
+    """在页面脚本末尾调用：侧边栏显示本次重跑的分阶段耗时，并提供样本导出。"""
+    if not enabled():
+        return
+    state = st.session_state[STATE_KEY]
+    total = (time.perf_counter() - state["started"]) * 1000
+    current = pd.DataFrame(state["current"], columns=FIELDS)
+    with st.sidebar.expander("性能分析", expanded=True):
+        st.caption(f"{state['page']} · 第 {state['run']} 次重跑 · 总耗时 {total:.1f} ms"
+                   f"（已计时 {current['ms'].sum():.1f} ms）")
+        cache = panel_cache.stats()
+        st.caption(f"全进程面板缓存：{cache['entries']}/{cache['max_entries']} 条，命中 {cache['hits']} 次，"
+                   f"未命中 {cache['misses']} 次，淘汰 {cache['evictions']} 次")
+        st.dataframe(
+            current[["stage", "ms", "cache", "bytes"]].round({"ms": 1}),
+            hide_index=True, use_container_width=True,
+        )
+        history = pd.DataFrame(state["samples"], columns=FIELDS)
+        if history["run"].nunique() > 1:
+            st.caption("本会话各阶段耗时中位数 (ms)")
+            summary = history.groupby("stage", sort=False)["ms"].agg(["median", "max", "count"]).round(1)
+            st.dataframe(summary, use_container_width=True)
+        col1, col2 = st.columns(2)
+        col1.download_button("导出 JSON", samples_to_json(state["samples"]),
+                             file_name="perf_samples.json", mime="application/json", key="perf_json")
+        col2.download_button("导出 CSV", samples_to_csv(state["samples"]),
+                             file_name="perf_samples.csv", mime="text/csv", key="perf_csv")
+
+
+def fragment(name):
+    """
+    装饰片段函数（写在 @st.fragment 之下），每次执行片段时调用 start_run(页面, fragment=name)，
+    片段执行完后在片段末尾显示本片段的计时（侧边栏只在整页重跑时更新）。
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            state = st.session_state.get(STATE_KEY)
+            if not (state and state["enabled"]):
+                return func(*args, **kwargs)
+            start_run(state["page"], fragment=name)
+            t0 = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                state["fragment"] = ""
+            _render_fragment(state, name, (time.perf_counter() - t0) * 1000)
+            return result
+        return wrapper
+    return decorator
+
+
+def _render_fragment(state, name, total):
+    current = pd.DataFrame([s for s in state["current"] if s["fragment"] == name], columns=FIELDS)
+    scope = "片段单独重跑" if _fragment_rerun() else "整页重跑"
+    with st.expander(f"性能分析：{name}"):
+        st.caption(f"{state['page']} · 第 {state['run']} 次重跑（{scope}） · 片段耗时 {total:.1f} ms"
+                   f"（已计时 {current['ms'].sum():.1f} ms）")
+        st.dataframe(
+            current[["stage", "ms", "cache", "bytes"]].round({"ms": 1}),
+            hide_index=True, use_container_width=True,
+        )
+
+
+def samples_to_json(samples):
+    return json.dumps(samples, ensure_ascii=False, indent=2)
+
+
+def samples_to_csv(samples):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(samples)
+    return buffer.getvalue()
+
+
+def _append(state, sample):
+    state["current"].append(sample)
+    state["samples"].append(sample)
+    if len(state["samples"]) > MAX_SAMPLES:
+        del state["samples"][:len(state["samples"]) - MAX_SAMPLES]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+季度时间轴的整数表示。
+
+原先用 年份 + 季度/10 这样的浮点数表示时间点再做比较；这里改用整数序号
+期序 = 年份 * 4 + (季度 - 1)，相邻季度的序号恰好相差 1，跨年也连续：
+
+    period_ordinal(2024, 4) == 8099, period_ordinal(2025, 1) == 8100
+
+时间标签（"2024-Q4"）在加载时一次生成为按时间排序的 category 列。
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def period_ordinal(year, quarter):
+    """年份、季度 -> 整数期序。既可传标量，也可传 numpy 数组。"""
+    return year * 4 + (quarter - 1)
+
+
+def ordinal_to_period(ordinal):
+    """整数期序 -> (年份, 季度)。"""
+    year, offset = divmod(int(ordinal), 4)
+    return year, offset + 1
+
+
+def period_label(ordinal):
+    year, quarter = ordinal_to_period(ordinal)
+    return f"{year}-Q{quarter}"
+
+
+def period_labels(ordinals):
+    """把期序数组转成 "2024-Q1" 形式的有序 category，类别只包含出现过的期序。"""
+    ordinals = np.asarray(ordinals)
+    uniques, codes = np.unique(ordinals, return_inverse=True)
+    dtype = pd.CategoricalDtype([period_label(o) for o in uniques], ordered=True)
+    return pd.Categorical.from_codes(codes, dtype=dtype)
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+默认视图的预渲染。
+
+两个页面打开时看到的图是固定的：中央页面默认指标的 Top 10 条形图和趋势图，
+地方页面 11 个章节各自默认指标的省份地图。重启后第一位访问者原本要等数据加载完、
+再冷启动 plotly（首张图约 0.5 秒）才能看到它们。这里把这些图提前做好：
+
+- 部署时运行 `python -m core.prerender`：建好列式缓存，并把所有默认视图的图表 JSON
+  写到 .cache/prerender-{数据版本}-v{视图键格式}.json；
+- 页面启动时调用 start_background()，在后台线程中读入该文件（不存在时先现场生成）、
+  还原成图表对象，顺带把 plotly 预热；
+- 页面构图前用 lookup() 按视图键查找，命中就直接使用，未就绪或未命中时返回 None，照常构图。
+
+视图键由数据版本之外的全部构图参数组成（指标、面板时间点、趋势区间、省界引用），
+只要参数一致就能命中，用户手动切回默认视图时同样适用。
+"""
+
+import argparse
+import json
+import os
+import threading
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from . import data_store, defaults, figures, geo, indexing, periods, rankings
+
+# 视图键的格式，键的组成改变时加一，旧格式的预渲染文件不再读取（地方地图 2：按指标显示名称）
+VIEW_FORMAT = 2
+
+_lock = threading.Lock()
+# 数据版本 -> {视图键: go.Figure}
+_figures = {}
+# 数据版本 -> 'loading' / 'ready' / 'failed: ...'
+_status = {}
+
+
+def prerender_path(version):
+    return os.path.join(data_store.CACHE_DIR, f"prerender-{version}-v{VIEW_FORMAT}.json")
+
+
+def view_key(*parts):
+    return " | ".join(str(part) for part in parts)
+
+
+def geo_ref(geojson):
+    """视图键中的省界部分：URL 原样使用，嵌入的 GeoJSON 统一记为 embedded。"""
+    return geojson if isinstance(geojson, str) else "embedded"
+
+
+def central_views(index, cube):
+    """中央页面落地时的条形图和趋势图，返回 {视图键: 图表}。"""
+    options = sorted(index.indicator_catalog['指标显示名称'].unique())
+    if not options:
+        return {}
+    display_name = defaults.CENTRAL_DEFAULT_INDICATOR
+    if display_name not in options:
+        display_name = options[0]
+    indicator = display_name.split(' --- ')[0]
+    rows = index.indicator_rows(indicator)
+    if rows.empty:
+        return {}
+    unit_series = rows['单位'].dropna()
+    unit = unit_series.iloc[0] if not unit_series.empty else ''
+    axis_title = f"数值 ({unit})" if unit else "数值"
+
+    # 与页面下拉框的默认项一致：面板取最新年份、最早季度，趋势取全部年份
+    year_options = sorted(rows['年份'].unique(), reverse=True)
+    quarter_options = sorted(rows['季度'].unique())
+    panel_year, panel_quarter = year_options[0], quarter_options[0]
+    start_year, start_quarter = year_options[-1], quarter_options[0]
+    end_year, end_quarter = year_options[0], quarter_options[-1]
+
+    views = {}
+    panel_data = cube.top(indicator, panel_year, panel_quarter, 10)
+    if panel_data.empty:
+        return views
+    top_10_companies = panel_data['企业名称'].tolist()
+    color_map = figures.entity_colors(top_10_companies)
+    views[view_key('中央', 'bar', display_name, panel_year, panel_quarter)] = figures.top_bar(
+        panel_data, title=f'{panel_year}年Q{panel_quarter} - Top 10',
+        axis_title=axis_title, color_map=color_map
+    )
+
+    trend = index.indicator_range(
+        indicator, periods.period_ordinal(start_year, start_quarter), periods.period_ordinal(end_year, end_quarter)
+    )
+    trend = trend[trend['企业名称'].isin(top_10_companies)]
+    if not trend.empty:
+        key = view_key('中央', 'line', display_name, panel_year, panel_quarter,
+                       start_year, start_quarter, end_year, end_quarter)
+        views[key] = figures.trend_line(
+            trend, title=f'Top 10 企业趋势 ({start_year}Q{start_quarter} - {end_year}Q{end_quarter})',
+            axis_title=axis_title, color_map=color_map
+        )
+    return views
+
+
+def local_views(index, geojson):
+    """地方页面每个章节默认指标的省份地图，返回 {视图键: 图表}。"""
+    catalog = index.indicator_catalog
+    views = {}
+    for chapter in defaults.LOCAL_CHAPTERS:
+        chapter_rows = index.chapter_rows(chapter)
+        if chapter_rows.empty:
+            continue
+        chapter_catalog = catalog[catalog['所属章节'] == chapter]
+        options = sorted(chapter_catalog['指标显示名称'].unique())
+        display_name = options[0]
+        default_name = defaults.DEFAULT_INDICATORS_LOCAL.get(chapter)
+        default_row = chapter_catalog[chapter_catalog['指标名称'] == default_name]
+        if not default_row.empty:
+            candidate = f"{default_row['指标序号'].iloc[0]} --- {default_name}"
+            if candidate in options:
+                display_name = candidate
+        indicator = display_name.split(' --- ')[1]
+
+        panel_year = sorted(chapter_rows['年份'].unique(), reverse=True)[0]
+        panel_quarter = sorted(chapter_rows['季度'].unique())[0]
+        panel_data = index.panel_rows(indicator, panel_year, panel_quarter, display_name)
+        if panel_data.empty:
+            continue
+        unit_series = index.indicator_rows(indicator)['单位'].dropna()
+        unit = unit_series.iloc[0] if not unit_series.empty else ''
+        axis_title = f"数值 ({unit})" if unit else "数值"
+        key = view_key('地方', 'map', display_name, panel_year, panel_quarter, geo_ref(geojson))
+        views[key] = figures.province_map(
+            geo.map_frame(panel_data, unit), geojson,
+            title=f"{panel_year}年Q{panel_quarter} - {indicator}", colorbar_title=axis_title
+        )
+    return views
+
+
+def build_views(file_path=data_store.DATA_FILE, geojson=None, version=None):
+    """
+    从数据文件生成所有默认视图。geojson 默认与页面一致：优先引用静态文件服务下的省界地址，
+    没有时嵌入简化后的 GeoJSON。
+
+    传入数据版本时，数据、行位置索引和排名通过 warmup.resource() 取预热线程建好的对象
+    （与页面共用同一份，不再重复构建）；没有预热时现场构建。
+    """
+    # warmup 在模块顶层导入本模块，这里延迟导入
+    from . import warmup
+
+    if geojson is None:
+        geojson = geo.geojson_url() or geo.load_china_geojson()
+
+    def sheet_resource(sheet_name, name, build):
+        return build() if version is None else warmup.resource(version, sheet_name, name, build)
+
+    def data(sheet_name):
+        return sheet_resource(sheet_name, 'data', lambda: data_store.load_shared_sheet(sheet_name, file_path))
+
+    central_index = sheet_resource('中央', 'index', lambda: indexing.SheetIndex(data('中央'), '企业名称'))
+    central_cube = sheet_resource('中央', 'rankings', lambda: rankings.RankingCube(data('中央'), '企业名称', version))
+    views = central_views(central_index, central_cube)
+    local_index = sheet_resource('地方', 'index', lambda: indexing.SheetIndex(data('地方'), '省份'))
+    views.update(local_views(local_index, geojson))
+    return views
+
+
+def write_views(version, views):
+    """把图表 JSON 写到 prerender_path(版本)，并删除其他版本（或旧视图键格式）的预渲染文件。"""
+    os.makedirs(data_store.CACHE_DIR, exist_ok=True)
+    path = prerender_path(version)
+    specs = {}
+    for key, fig in views.items():
+        spec = fig.to_plotly_json()
+        # 不保存构图进程的模板：Streamlit 会换上自己的 plotly 模板，还原时由 go.Figure 套用当前进程的默认模板
+        spec['layout'].pop('template', None)
+        specs[key] = spec
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(pio.json.to_json_plotly(specs))
+    os.replace(tmp_path, path)
+    for name in os.listdir(data_store.CACHE_DIR):
+        if name.startswith("prerender-") and name.endswith(".json") and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(data_store.CACHE_DIR, name))
+            except OSError:
+                pass
+    return path
+
+
+def read_views(version):
+    """读入预渲染文件并还原成图表，文件不存在时返回 None。"""
+    try:
+        with open(prerender_path(version), encoding="utf-8") as f:
+            specs = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return {key: go.Figure(spec) for key, spec in specs.items()}
+
+
+def load(version, file_path=data_store.DATA_FILE):
+    """读入（必要时先生成）某个数据版本的默认视图，供 lookup() 使用。"""
+    with _lock:
+        _status[version] = 'loading'
+    try:
+        views = read_views(version)
+        if views is None:
+            write_views(version, build_views(file_path, version=version))
+            views = read_views(version)
+    except Exception as e:
+        with _lock:
+            _status[version] = f"failed: {e}"
+        return
+    with _lock:
+        _figures[version] = views
+        _status[version] = 'ready'
+
+
+def start_background(version, file_path=data_store.DATA_FILE):
+    """每个数据版本只启动一次后台加载线程，立即返回。本次调用启动了线程时返回该线程，否则返回 None。"""
+    with _lock:
+        if version in _status:
+            return None
+        _status[version] = 'loading'
+    thread = threading.Thread(target=load, args=(version, file_path), name=f"prerender-{version}", daemon=True)
+    thread.start()
+    return thread
+
+
+def status(version):
+    with _lock:
+        return _status.get(version, 'idle')
+
+
+def lookup(version, key):
+    """
+    返回预渲染好的图表，未就绪或没有该视图时返回 None。
+    图表在所有会话间共享，调用方不应修改它。
+    """
+    with _lock:
+        return _figures.get(version, {}).get(key)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="预先生成各页面默认视图的图表")
+    parser.add_argument("--file", default=data_store.DATA_FILE, help="Excel 数据文件路径")
+    args = parser.parse_args(argv)
+
+    version = data_store.data_version(args.file)
+    data_store.build_cache(list(data_store.SHEET_ENTITY), args.file)
+    views = build_views(args.file, version=version)
+    path = write_views(version, views)
+    print(f"数据版本 {version}：{len(views)} 张图 -> {path}（{os.path.getsize(path) / 1024:.1f} KB）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+预先计算的排名立方体：每个 (指标名称, 年份, 季度) 组合下各企业/省份按 数值 从大到小的顺序。
+
+中央页面的 Top 10 条形图和地方页面的省份排名表原先每次重跑都要 nlargest 一遍；
+现在数据加载后一次性排好，渲染时只需查字典再取前 n 行。
+数值相同的行按工作簿中的行序排列（nlargest 不保证并列行的先后，两者在并列处的顺序可能不同）。
+立方体记录了生成它的数据版本，调用方以 data_store.data_version() 为缓存键，
+1_data.xlsx 变化后会自动重建。
+"""
+
+import numpy as np
+import pandas as pd
+
+RANK_KEYS = ['指标名称', '年份', '季度']
+
+
+class RankingCube:
+    """
+    参数:
+    df (pd.DataFrame): 工作表数据（行索引为 0..n-1），立方体只保存行位置，不复制数据。
+    entity_col (str): 主体列名，中央为 '企业名称'，地方为 '省份'。
+    version (str): 数据版本号。
+    """
+
+    def __init__(self, df, entity_col, version=None):
+        self.df = df
+        self.entity_col = entity_col
+        self.version = version
+        self._ranked = {}
+        if df.empty:
+            return
+
+        group_ids = df.groupby(RANK_KEYS, sort=False, observed=True).ngroup().to_numpy()
+        values = df['数值'].to_numpy()
+        positions = np.arange(len(df))
+        # 先按组、再按数值降序、最后按原始行序排：并列的行保持工作簿中的先后
+        order = np.lexsort((positions, -values, group_ids))
+        boundaries = np.flatnonzero(np.diff(group_ids[order])) + 1
+        key_frame = df[RANK_KEYS]
+        for chunk in np.split(order, boundaries):
+            key = tuple(key_frame.iloc[chunk[0]])
+            self._ranked[key] = chunk
+
+    def positions(self, indicator, year, quarter, display_name=None):
+        """
+        排好序的行位置。地方表中同一指标名称可能对应多个指标序号，
+        传入 display_name（指标显示名称）时只保留该序号的行，名次在其中重新计算。
+        """
+        positions = self._ranked.get((indicator, year, quarter), np.array([], dtype=np.intp))
+        if display_name is not None and len(positions):
+            positions = positions[self.df['指标显示名称'].to_numpy()[positions] == display_name]
+        return positions
+
+    def top(self, indicator, year, quarter, n=None, display_name=None):
+        """返回排名前 n 的行（n 为 None 时返回全部），按数值降序，并列时按工作簿中的行序。"""
+        positions = self.positions(indicator, year, quarter, display_name)
+        if n is not None:
+            positions = positions[:n]
+        return self.df.take(positions)
+
+    def ranking(self, indicator, year, quarter, n=None, display_name=None):
+        """只含 排名 / 主体 / 数值 三列的排名表。"""
+        top = self.top(indicator, year, quarter, n, display_name)
+        return pd.DataFrame({
+            '排名': np.arange(1, len(top) + 1),
+            self.entity_col: top[self.entity_col].to_numpy(),
+            '数值': top['数值'].to_numpy(),
+        })
+
+    def __len__(self):
+        return len(self._ranked)
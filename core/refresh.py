@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+按季度增量刷新列式缓存。
+
+工作簿每个季度追加一期数据，但原先只要文件哈希变了就整表重新解析。这里先对工作表做一遍
+轻量扫描（只切分行的原始字节、只取 年份/季度/数值 三列），为每个 (年份, 季度) 计算摘要，
+与上一版缓存旁边的 .periods.json 对比：
+
+- 摘要未变的期直接沿用上一版 Feather 中的行；
+- 新增或有改动的期只把这些行拼回 XML 交给 xlsx_stream 解析；
+- 工作簿中已删除的期随之丢弃。
+
+合并时按扫描得到的行顺序重排，结果与整表解析逐行相同（包括并列数值的先后），
+页面上的 SheetIndex / RankingCube 以新的数据版本为键，从合并后的缓存重新建立。
+摘要按单元格的值（共享字符串已换成文本）计算：Excel 追加数据时会重写共享字符串表
+（计数和新增的字符串都会变），但已有各期单元格的值不变，仍可沿用。
+表头变化或找不到上一版缓存时退回整表解析。
+
+命令行（可放进 cron）：
+    python -m core.refresh [--file 1_data.xlsx] [--sheet 中央 --sheet 地方]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from . import data_store, xlsx_stream
+
+PERIOD_COLUMNS = ('年份', '季度')
+
+class SheetScan:
+    """
+    一次轻量扫描的结果。
+
+    root / header: 根元素起始标签和表头行的原始字节；header_rows 为表头及其之前的行数。
+    keys: 按首次出现顺序排列的期（"2025-1" 形式）。
+    digests / counts: 每期有效行（数值 可解析）单元格值的摘要、行数。
+    row_periods: 每个数据行所属期在 keys 中的下标，不属于任何期（空行、数值 无效的行）为 -1。
+    sequence: 有效行按工作簿顺序排列的所属期下标。
+    """
+
+    def __init__(self):
+        self.root = None
+        self.header = None
+        self.header_rows = 0
+        self.header_digest = None
+        self.keys = []
+        self.digests = {}
+        self.counts = {}
+        self.row_periods = []
+        self.sequence = None
+
+    def manifest(self):
+        return {
+            "header": self.header_digest,
+            "periods": {key: {"digest": self.digests[key], "rows": self.counts[key]} for key in self.keys},
+        }
+
+
+def period_key(year, quarter):
+    return f"{year}-{quarter}"
+
+
+def scan_sheet(sheet_name, file_path=data_store.DATA_FILE):
+    """第一遍扫描：不解析文本列，只计算每期的摘要和有效行的先后顺序。"""
+    scan = SheetScan()
+    hashers = {}
+    period_ids = {}
+    sequence = []
+    with zipfile.ZipFile(file_path) as zf:
+        strings = xlsx_stream.shared_strings(zf)
+        with xlsx_stream.open_sheet(zf, sheet_name) as data:
+            rows = xlsx_stream.iter_raw_rows(data)
+            scan.root = next(rows)
+            pattern = positions = None
+            for row in rows:
+                if pattern is None:
+                    scan.header_rows += 1
+                    cells = xlsx_stream.raw_cells(row, strings)
+                    if not cells:
+                        continue
+                    scan.header = row
+                    scan.header_digest = hashlib.sha1(xlsx_stream.canonical_row(row, strings)).hexdigest()
+                    positions = _key_positions(cells)
+                    pattern = xlsx_stream.cell_pattern(positions)
+                    continue
+                cells = xlsx_stream.raw_cells(row, strings, pattern)
+                if not cells:
+                    scan.row_periods.append(-1)
+                    continue
+                year, quarter, value = (cells.get(i) for i in positions)
+                # 与整表解析一致：数值 无效的行（页脚、备注等）丢弃，不归入任何期
+                if np.isnan(xlsx_stream.to_value(value)):
+                    scan.row_periods.append(-1)
+                    continue
+                try:
+                    key = period_key(xlsx_stream.to_int(year), xlsx_stream.to_int(quarter))
+                except ValueError as e:
+                    raise ValueError(f"工作表 '{sheet_name}' 第 {xlsx_stream.row_number(row) or '?'} 行: {e}") from None
+                if key not in period_ids:
+                    period_ids[key] = len(scan.keys)
+                    hashers[key] = hashlib.sha1()
+                    scan.counts[key] = 0
+                    scan.keys.append(key)
+                # 摘要按单元格的值计算：行号、样式和共享字符串下标的变化不算改动
+                hashers[key].update(xlsx_stream.canonical_row(row, strings))
+                hashers[key].update(b"\n")
+                period_id = period_ids[key]
+                scan.row_periods.append(period_id)
+                scan.counts[key] += 1
+                sequence.append(period_id)
+    if scan.header is None:
+        raise ValueError(f"工作表 '{sheet_name}' 没有表头")
+    scan.digests = {key: h.hexdigest() for key, h in hashers.items()}
+    scan.sequence = np.array(sequence, dtype=np.intp)
+    return scan
+
+
+def refresh_sheet(sheet_name, file_path=data_store.DATA_FILE, version=None):
+    """
+    把一个工作表的缓存刷新到工作簿当前的数据版本，返回本次刷新的统计信息。
+
+    上一版缓存中摘要未变的期原样沿用，只解析新增或改动的期。
+    """
+    started = time.perf_counter()
+    version = version or data_store.data_version(file_path)
+    stats = {"sheet": sheet_name, "version": version, "mode": "cached", "changed": [], "removed": [], "parsed_rows": 0}
+    if os.path.exists(data_store.cache_path(sheet_name, version)) and os.path.exists(
+            data_store.periods_path(sheet_name, version)):
+        stats["seconds"] = time.perf_counter() - started
+        return stats
+
+    scan = scan_sheet(sheet_name, file_path)
+    previous = _previous_cache(sheet_name, version)
+    old_periods = {}
+    if previous is not None:
+        old_manifest = previous[1]
+        if old_manifest.get("header") == scan.header_digest:
+            old_periods = old_manifest.get("periods", {})
+        else:
+            previous = None
+
+    changed = [key for key in scan.keys if old_periods.get(key, {}).get("digest") != scan.digests[key]]
+    stats["removed"] = [key for key in old_periods if key not in scan.digests]
+    stats["changed"] = changed
+    if previous is None or len(changed) == len(scan.keys):
+        stats["mode"] = "full"
+        df = data_store.parse_sheet(sheet_name, file_path)
+        stats["parsed_rows"] = len(df)
+    else:
+        stats["mode"] = "incremental"
+        old_df = feather.read_table(data_store.cache_path(sheet_name, previous[0])).to_pandas()
+        new_df = _parse_periods(sheet_name, file_path, scan, set(changed))
+        stats["parsed_rows"] = len(new_df)
+        df = _merge(scan, old_df, new_df, set(changed))
+
+    data_store.write_table(df, sheet_name, version)
+    data_store.write_periods(sheet_name, version, scan.manifest())
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def _parse_periods(sheet_name, file_path, scan, changed):
+    """第二遍：只挑出有改动的期的原始行，拼回 XML 解析。"""
+    wanted = {scan.keys.index(key) for key in changed}
+    with zipfile.ZipFile(file_path) as zf:
+        strings = xlsx_stream.shared_strings(zf)
+        with xlsx_stream.open_sheet(zf, sheet_name) as data:
+            rows = xlsx_stream.iter_raw_rows(data)
+            next(rows)
+            selected = [scan.header]
+            for index, row in enumerate(rows):
+                # 表头及其之前的行不计入 row_periods
+                index -= scan.header_rows
+                if index >= 0 and scan.row_periods[index] in wanted:
+                    selected.append(row)
+    return data_store.categorize(xlsx_stream.parse_raw_rows(scan.root, selected, strings))
+
+
+def _merge(scan, old_df, new_df, changed):
+    """按期拼接沿用的旧行和新解析的行，再按扫描到的行顺序重排。"""
+    old_groups = old_df.groupby(list(PERIOD_COLUMNS), sort=False).indices
+    new_groups = new_df.groupby(list(PERIOD_COLUMNS), sort=False).indices
+    blocks = []
+    for key in scan.keys:
+        year, quarter = (int(part) for part in key.split("-"))
+        source, groups = (new_df, new_groups) if key in changed else (old_df, old_groups)
+        positions = groups.get((year, quarter), np.array([], dtype=np.intp))
+        if len(positions) != scan.counts[key]:
+            raise ValueError(f"期 {key} 的行数与扫描结果不一致")
+        blocks.append(source.take(positions))
+
+    # 每期的行在块内保持工作簿中的相对顺序；把块按期下标排好后，
+    # 第 j 行对应工作簿中的第 order[j] 个有效行
+    combined = pd.concat(blocks, ignore_index=True)
+    order = np.argsort(scan.sequence, kind="stable")
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    combined = combined.take(inverse).reset_index(drop=True)
+    for col in data_store.CATEGORY_COLUMNS:
+        if col in combined.columns:
+            combined[col] = combined[col].astype(object)
+    return data_store.categorize(combined)
+
+
+def _key_positions(header_cells):
+    names = {name: index for index, name in header_cells.items()}
+    missing = [name for name in PERIOD_COLUMNS + (xlsx_stream.VALUE_COLUMN,) if name not in names]
+    if missing:
+        raise ValueError(f"表头缺少列: {', '.join(missing)}")
+    return [names[name] for name in PERIOD_COLUMNS + (xlsx_stream.VALUE_COLUMN,)]
+
+
+def _previous_cache(sheet_name, version):
+    """找到同一工作表最近写入的、带有期摘要清单的旧版本缓存，返回 (版本号, 清单)。"""
+    candidates = []
+    prefix, suffix = f"{sheet_name}-", ".feather"
+    if not os.path.isdir(data_store.CACHE_DIR):
+        return None
+    for name in os.listdir(data_store.CACHE_DIR):
+        if not (name.startswith(prefix) and name.endswith(suffix)):
+            continue
+        old_version = name[len(prefix):-len(suffix)]
+        manifest_path = data_store.periods_path(sheet_name, old_version)
+        if old_version == version or not os.path.exists(manifest_path):
+            continue
+        candidates.append((os.path.getmtime(manifest_path), old_version, manifest_path))
+    if not candidates:
+        return None
+    _, old_version, manifest_path = max(candidates)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return old_version, json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按季度增量刷新 1_data.xlsx 的列式缓存")
+    parser.add_argument("--file", default=data_store.DATA_FILE, help="工作簿路径")
+    parser.add_argument("--sheet", action="append", help="只刷新指定工作表，可重复；默认刷新全部已知工作表")
+    args = parser.parse_args()
+
+    with zipfile.ZipFile(args.file) as zf:
+        available = xlsx_stream.sheet_paths(zf)
+    sheet_names = args.sheet or [name for name in data_store.SHEET_ENTITY if name in available]
+    version = data_store.data_version(args.file)
+    for sheet_name in sheet_names:
+        stats = refresh_sheet(sheet_name, args.file, version)
+        print(f"{sheet_name}: {stats['mode']}, 版本 {version}, 新增/改动 {len(stats['changed'])} 期"
+              f"{'(' + ', '.join(stats['changed']) + ')' if stats['changed'] else ''}, "
+              f"删除 {len(stats['removed'])} 期, 解析 {stats['parsed_rows']} 行, {stats['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
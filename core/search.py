@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+指标关键词搜索的倒排索引。
+
+原先每次输入都要重新生成、排序全部显示名称，再逐个做 `term in name` 的子串判断。
+这里在每个数据版本只建一次索引：
+
+- 对每个显示名称（小写）的单字和相邻二字建倒排表，查询时先取各二字的交集得到候选，
+  再用子串判断确认，结果与原先的子串匹配一致；
+- 空格分隔的多个关键词按“同时包含”匹配；
+- 指标序号（如 "3(68/4)"）与关键词完全相同时排在最前；
+- 安装了 pypinyin 时，纯字母的关键词还会匹配指标名称的拼音首字母（如 "yfry" -> 研发人员），
+  未安装时忽略这一项。
+
+结果按相关度排序：序号完全匹配 > 关键词在名称中出现得越靠前 > 名称越短，其余保持字典序。
+"""
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:  # 可选依赖
+    lazy_pinyin = None
+
+# 只出现在拼音首字母中的匹配排在文字匹配之后
+_PINYIN_OFFSET = 10_000
+
+
+class SearchIndex:
+    """
+    参数:
+    catalog (pd.DataFrame): SheetIndex.indicator_catalog，需含 指标名称 / 指标序号 / 指标显示名称。
+    """
+
+    def __init__(self, catalog):
+        rows = catalog.drop_duplicates('指标显示名称').sort_values('指标显示名称')
+        # 与页面原先的下拉选项相同：按显示名称排序
+        self.options = rows['指标显示名称'].tolist()
+        self._texts = [option.lower() for option in self.options]
+        self._numbers = [str(number).lower() for number in rows['指标序号']]
+        self._grams = _build_grams(self._texts)
+        self._initials = None
+        self._initial_grams = None
+        if lazy_pinyin is not None:
+            self._initials = [_initials(name) for name in rows['指标名称']]
+            self._initial_grams = _build_grams(self._initials)
+
+    def search(self, query):
+        """返回匹配 query 的显示名称列表（已按相关度排序）；query 为空时返回全部选项。"""
+        keywords = query.lower().split()
+        if not keywords:
+            return list(self.options)
+
+        scores = None
+        for keyword in keywords:
+            matched = self._match(keyword)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {i: min(scores[i], pos) for i, pos in matched.items() if i in scores}
+            if not scores:
+                return []
+
+        exact = query.strip().lower()
+        order = sorted(scores, key=lambda i: (self._numbers[i] != exact, scores[i], len(self.options[i]), i))
+        return [self.options[i] for i in order]
+
+    def _match(self, keyword):
+        """返回 {选项下标: 关键词首次出现的位置}。"""
+        matched = {}
+        for i in _candidates(self._grams, keyword, len(self._texts)):
+            pos = self._texts[i].find(keyword)
+            if pos >= 0:
+                matched[i] = pos
+        if self._initials is not None and keyword.isascii() and keyword.isalpha():
+            for i in _candidates(self._initial_grams, keyword, len(self._initials)):
+                if i not in matched:
+                    pos = self._initials[i].find(keyword)
+                    if pos >= 0:
+                        matched[i] = _PINYIN_OFFSET + pos
+        return matched
+
+    def __len__(self):
+        return len(self.options)
+
+
+def _initials(name):
+    return "".join(lazy_pinyin(name, style=Style.FIRST_LETTER)).lower()
+
+
+def _build_grams(texts):
+    grams = {}
+    for i, text in enumerate(texts):
+        for gram in set(text) | {text[j:j + 2] for j in range(len(text) - 1)}:
+            grams.setdefault(gram, set()).add(i)
+    return grams
+
+
+def _candidates(grams, keyword, size):
+    """由倒排表求出可能包含 keyword 的选项下标（可能有误报，需再做子串确认）。"""
+    if len(keyword) == 1:
+        return grams.get(keyword, ())
+    result = None
+    for j in range(len(keyword) - 1):
+        postings = grams.get(keyword[j:j + 2])
+        if not postings:
+            return ()
+        result = set(postings) if result is None else result & postings
+        if not result:
+            return ()
+    return result if result is not None else range(size)
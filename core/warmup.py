@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+进程启动后的数据预热。
+
+Streamlit 只在有人打开页面时才执行页面脚本：重启后第一位打开中央 / 地方页面的用户要等
+解析工作簿（或读列式缓存）、建行位置索引和排名、读省界、冷启动 plotly，全部做完才能看到图。
+这里把这些工作放到后台线程里，在用户看到主页或登录表单、输入密码的同时完成：
+
+- 主页和两个页面在脚本开头调用 start_background()，每个数据版本只启动一次，立即返回；
+- 页面的 st.cache_resource 加载函数通过 resource() 取预热好的对象（与预热线程是同一个对象，
+  不重复占用内存）；预热正在进行时等它做完这一项，不在页面线程里重复构建；预热失败或已超时则照常自己构建；
+- report() 返回各步骤的状态和耗时，主页用 render_status() 显示，预热完成前每秒刷新一次。
+
+预热的最后一步在后台载入默认视图的预渲染图表（core.prerender）。
+
+命令行（部署后执行一次，建好列式缓存和预渲染文件，并打印各步骤耗时）：
+    python -m core.warmup [--file 1_data.xlsx]
+"""
+
+import argparse
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from . import data_store, geo, indexing, prerender, rankings, search
+
+# 页面等待预热中某一项的最长时间（秒），超过后自己构建
+WAIT_SECONDS = 120
+
+_cond = threading.Condition()
+# 数据版本 -> 'loading' / 'ready' / 'failed: ...'
+_status = {}
+# 数据版本 -> [{"step", "state", "ms"}]，state 为 等待 / 进行中 / 完成 / 失败
+_steps = {}
+# (数据版本, 工作表, 名称) -> 预热好的对象
+_resources = {}
+
+_MISSING = object()
+
+
+def sheet_steps(version, sheet_name, file_path):
+    """一个工作表的预热步骤：[(步骤名, 资源名, 构建函数)]，构建函数可以读取前面步骤的结果。"""
+    entity_col = data_store.SHEET_ENTITY[sheet_name]
+    steps = [
+        (f"{sheet_name}：数据", 'data', lambda: data_store.load_shared_sheet(sheet_name, file_path)),
+        (f"{sheet_name}：行位置索引", 'index', lambda: indexing.SheetIndex(_get(version, sheet_name, 'data'), entity_col)),
+        (f"{sheet_name}：排名", 'rankings',
+         lambda: rankings.RankingCube(_get(version, sheet_name, 'data'), entity_col, version)),
+    ]
+    if sheet_name == '中央':
+        steps.append((f"{sheet_name}：指标搜索", 'search',
+                      lambda: search.SearchIndex(_get(version, sheet_name, 'index').indicator_catalog)))
+    return steps
+
+
+def warm_plotly():
+    """首张图要初始化 plotly 的校验器和模板（约 0.5 秒），先用一张小图做掉。"""
+    import plotly.express as px
+    px.bar(x=[0], y=[0]).to_json()
+
+
+def warm_geojson():
+    # 开启静态文件服务时页面只引用省界文件的地址，不需要读入
+    if not st.get_option("server.enableStaticServing") or not geo.geojson_url():
+        geo.load_china_geojson()
+
+
+def plan(version, file_path):
+    """全部预热步骤：[(步骤名, (工作表, 资源名) 或 None, 函数)]。"""
+    steps = [("列式缓存", None, lambda: data_store.build_cache(list(data_store.SHEET_ENTITY), file_path))]
+    for sheet_name in data_store.SHEET_ENTITY:
+        steps += [(step, (sheet_name, name), build) for step, name, build in sheet_steps(version, sheet_name, file_path)]
+    steps += [
+        ("省界", None, warm_geojson),
+        ("plotly", None, warm_plotly),
+        ("默认视图", None, lambda: _join(prerender.start_background(version, file_path))),
+    ]
+    return steps
+
+
+def _join(thread):
+    # 页面已经先启动了预渲染时这里拿不到线程，不等待，进度见 prerender.status()
+    if thread is not None:
+        thread.join()
+
+
+def _get(version, sheet_name, name):
+    with _cond:
+        return _resources[(version, sheet_name, name)]
+
+
+def _set_step(version, i, **fields):
+    with _cond:
+        _steps[version][i].update(fields)
+
+
+def run(version, file_path=data_store.DATA_FILE):
+    """按顺序执行全部预热步骤，某一步出错时停止，后续步骤留给页面按需构建。"""
+    steps = plan(version, file_path)
+    with _cond:
+        _status[version] = 'loading'
+        _steps[version] = [{"step": step, "state": "等待", "ms": None} for step, _, _ in steps]
+    for i, (step, target, func) in enumerate(steps):
+        _set_step(version, i, state="进行中")
+        t0 = time.perf_counter()
+        try:
+            value = func()
+        except Exception as e:
+            _set_step(version, i, state="失败", ms=(time.perf_counter() - t0) * 1000)
+            with _cond:
+                _status[version] = f"failed: {step}: {e}"
+                _cond.notify_all()
+            return
+        _set_step(version, i, state="完成", ms=(time.perf_counter() - t0) * 1000)
+        if target is not None:
+            with _cond:
+                _resources[(version, *target)] = value
+                _cond.notify_all()
+    with _cond:
+        _status[version] = 'ready'
+        _cond.notify_all()
+
+
+def start_background(version, file_path=data_store.DATA_FILE):
+    """每个数据版本只启动一次后台预热线程，立即返回。数据文件不存在（version 为 None）时什么都不做。"""
+    if version is None:
+        return
+    with _cond:
+        if version in _status:
+            return
+        _status[version] = 'loading'
+        # 数据更新后旧版本的对象不再使用，释放预热这边的引用
+        for key in [key for key in _resources if key[0] != version]:
+            del _resources[key]
+    thread = threading.Thread(target=run, args=(version, file_path), name=f"warmup-{version}", daemon=True)
+    thread.start()
+
+
+def resource(version, sheet_name, name, build, timeout=WAIT_SECONDS):
+    """
+    返回预热好的对象（name 为 data / index / rankings / search）。
+    预热正在进行时等它建好这一项；没有预热、预热失败或等待超时时调用无参数的 build() 自己构建。
+    """
+    key = (version, sheet_name, name)
+    with _cond:
+        _cond.wait_for(lambda: key in _resources or _status.get(version) != 'loading', timeout)
+        value = _resources.get(key, _MISSING)
+    return build() if value is _MISSING else value
+
+
+def status(version):
+    with _cond:
+        return _status.get(version, 'idle')
+
+
+def report(version):
+    """各预热步骤的状态和耗时（ms，未完成时为 None）。"""
+    with _cond:
+        return [dict(step) for step in _steps.get(version, [])]
+
+
+def render_status(version):
+    """主页上的预热进度。预热进行中时每秒只刷新这一块，完成后整页重跑一次，停止刷新。"""
+    loading = status(version) == 'loading'
+    st.fragment(_status_panel, run_every=1 if loading else None)(version, loading)
+
+
+def _status_panel(version, was_loading):
+    state = status(version)
+    if was_loading and state != 'loading':
+        st.rerun()
+    steps = report(version)
+    done = sum(step["state"] == "完成" for step in steps)
+    if state == 'ready':
+        label = f"数据已就绪（预热用时 {sum(step['ms'] for step in steps) / 1000:.1f} 秒）"
+    elif state.startswith('failed'):
+        label = "数据预热未完成，页面打开时将按需加载"
+    else:
+        label = f"正在后台准备数据（{done}/{len(steps)}）……"
+    with st.expander(label, expanded=False):
+        st.dataframe(
+            pd.DataFrame(steps).rename(columns={"step": "步骤", "state": "状态", "ms": "耗时 (ms)"}).round(1),
+            use_container_width=True, hide_index=True
+        )
+        if state.startswith('failed'):
+            st.caption(state)
+        st.caption(f"默认视图预渲染：{prerender.status(version)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="预热数据缓存并报告各步骤耗时")
+    parser.add_argument("--file", default=data_store.DATA_FILE, help="Excel 数据文件路径")
+    args = parser.parse_args(argv)
+
+    version = data_store.data_version(args.file)
+    if version is None:
+        parser.error(f"数据文件 '{args.file}' 未找到")
+    run(version, args.file)
+    for step in report(version):
+        ms = f"{step['ms']:>10.1f}" if step["ms"] is not None else f"{'-':>10}"
+        print(f"{step['step']:<16}{step['state']:>6}{ms}")
+    print(f"数据版本 {version}：{status(version)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+"""
+按行流式解析 xlsx 工作表，边解析边转换类型。
+
+与 pd.read_excel + astype(str).str.replace 的做法相比：
+- 工作表 XML 从 zip 中流式读取，每处理完一行就释放对应的 XML 元素；
+- 数值 在解析时直接去掉 '%' 并转成 float，无法转换的行当场丢弃；
+- 年份/季度 等整数列直接转成 int，不会先生成一整列字符串；
+- 文本列中重复的字符串只保留一个对象；
+- 多个工作表可以在进程池中并行解析（见 read_sheets）。
+
+增量刷新（core.refresh）另外用到 iter_raw_rows / raw_cells：只把工作表切成一行行的原始字节，
+不建 XML 树，再用 parse_raw_rows 只解析其中需要的那部分行。
+"""
+
+import html
+import io
+import math
+import multiprocessing
+import os
+import posixpath
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ROOT_RE = re.compile(rb'<worksheet\b[^>]*>')
+_EMPTY_ROW_RE = re.compile(rb'<row\b[^>]*?/>')
+_CELL_RE = re.compile(rb'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_REF_CELL_RE = re.compile(rb'<c r="([A-Z]+)\d+"([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_ATTR_RE = re.compile(rb'(\w+)="([^"]*)"')
+_TYPE_RE = re.compile(rb'\bt="([^"]*)"')
+_ROW_REF_RE = re.compile(rb'<row\b[^>]*?\sr="(\d+)"')
+_V_RE = re.compile(rb'<v>(.*?)</v>', re.S)
+_T_RE = re.compile(rb'<t(?:\s[^>]*)?>(.*?)</t>', re.S)
+
+INT_COLUMNS = {'年份', '季度', '企业序号', '省份编号'}
+# 数值列：去掉 '%' 后转 float，转不了的整行丢弃
+VALUE_COLUMN = '数值'
+
+
+def sheet_paths(zf):
+    """返回 {工作表名: zip 内 XML 路径}。"""
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels.iter(f"{_PKG_REL_NS}Relationship"):
+        target = rel.get("Target")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join("xl", target))
+        targets[rel.get("Id")] = target
+    return {
+        sheet.get("name"): targets[sheet.get(f"{_REL_NS}id")]
+        for sheet in workbook.iter(f"{_NS}sheet")
+    }
+
+
+def shared_strings(zf):
+    try:
+        data = zf.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    strings = []
+    with data:
+        for _, elem in ElementTree.iterparse(data):
+            if elem.tag == f"{_NS}si":
+                strings.append("".join(t.text or "" for t in elem.iter(f"{_NS}t")))
+                elem.clear()
+    return strings
+
+
+def read_sheet(file_path, sheet_name):
+    """
+    流式读取一个工作表，返回与页面原先 load_data 清洗结果一致的 DataFrame
+    （数值 为 float，整数列为 int64，其余为 object）。
+    数值 直接取单元格中的值，不再经过 float -> str -> float 的往返，个别值的末位会因此更精确。
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        strings = shared_strings(zf)
+        with open_sheet(zf, sheet_name) as data:
+            columns, values = _parse_rows(data, strings)
+    return _to_frame(columns, values)
+
+
+def pool_workers(jobs, max_workers=None):
+    """并行解析的工作进程数：不超过任务数、max_workers 和 CPU 核数。"""
+    return min(jobs, max_workers or jobs, os.cpu_count() or 1)
+
+
+def process_pool(workers):
+    """
+    并行解析用的进程池。子进程用 spawn 启动：调用方（Streamlit 服务、后台预热线程）是多线程进程，
+    fork 出的子进程可能卡在 fork 时由其他线程持有的锁（导入锁、pyarrow / logging 的锁）上。
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def read_sheets(file_path, sheet_names, max_workers=None):
+    """在进程池中并行解析多个工作表，返回 {工作表名: DataFrame}。只有一个 CPU 核时依次解析。"""
+    sheet_names = list(sheet_names)
+    workers = pool_workers(len(sheet_names), max_workers)
+    if workers <= 1:
+        return {name: read_sheet(file_path, name) for name in sheet_names}
+    with process_pool(workers) as pool:
+        frames = pool.map(read_sheet, [file_path] * len(sheet_names), sheet_names)
+        return dict(zip(sheet_names, frames))
+
+
+def open_sheet(zf, sheet_name):
+    """打开 zip 中某个工作表的 XML 流。"""
+    paths = sheet_paths(zf)
+    if sheet_name not in paths:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    return zf.open(paths[sheet_name])
+
+
+def iter_raw_rows(data, chunk_size=1 << 20):
+    """
+    把工作表 XML 流切成一个个 <row> 元素的原始字节，不建 XML 树。
+
+    第一个产出值是根元素 <worksheet ...> 的起始标签，之后可以用它把挑出来的行
+    重新拼成完整文档（见 parse_raw_rows）。只支持默认命名空间的工作表（Excel、openpyxl 的写法）。
+    """
+    buffer = b""
+    root = None
+    while True:
+        chunk = data.read(chunk_size)
+        buffer += chunk
+        if root is None:
+            match = _ROOT_RE.search(buffer)
+            if match is None:
+                if chunk:
+                    continue
+                raise ValueError("工作表 XML 中没有找到 <worksheet> 根元素")
+            root = match.group(0)
+            yield root
+            buffer = buffer[match.end():]
+        # 单元格内容中不会出现 "<row"，每段 "...</row>" 中最后一个 "<row" 就是该行的起点，
+        # 它前面只可能是没有单元格的自闭合行
+        pieces = buffer.split(b"</row>")
+        buffer = pieces.pop()
+        for piece in pieces:
+            start = piece.rfind(b"<row")
+            if b"<row" in piece[:start]:
+                yield from _EMPTY_ROW_RE.findall(piece, 0, start)
+            yield piece[start:] + b"</row>"
+        if not chunk:
+            yield from _EMPTY_ROW_RE.findall(buffer)
+            break
+
+
+def cell_pattern(indexes):
+    """生成只匹配指定列（从 0 开始的列号）单元格的正则，供 raw_cells 使用。"""
+    letters = b"|".join(_column_letters(i).encode() for i in sorted(indexes))
+    return re.compile(rb'<c r="(' + letters + rb')\d+"([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+
+
+def raw_cells(row, strings, pattern=None):
+    """
+    用正则从一行的原始字节中取出 {列号: 值}，取值规则与 _cell_value 相同。
+    传入 cell_pattern 生成的 pattern 时只取这几列；单元格没有 r 引用时退回逐个单元格解析。
+    """
+    if pattern is not None:
+        cells = {}
+        for letters, attrs, body in pattern.findall(row):
+            kind = _TYPE_RE.search(attrs)
+            cells[_column_index(letters.decode(), 0)] = _raw_cell_value(
+                kind.group(1) if kind else b"n", body, strings)
+        if cells:
+            return cells
+    cells = {}
+    for match in _CELL_RE.finditer(row):
+        attrs = dict(_ATTR_RE.findall(match.group(1)))
+        ref = attrs.get(b"r")
+        index = _column_index(ref.decode() if ref else None, len(cells))
+        cells[index] = _raw_cell_value(attrs.get(b"t", b"n"), match.group(2) or b"", strings)
+    return cells
+
+
+def canonical_row(row, strings):
+    """
+    一行单元格值的规范字节表示，供比较行内容：共享字符串换成文本，不含行号、单元格引用的行号和样式，
+    其余单元格保留原始的值字节。Excel 重写共享字符串表（下标变化）后，值没变的行结果不变。
+    """
+    parts = []
+    for letters, attrs, body in _REF_CELL_RE.findall(row):
+        kind = _TYPE_RE.search(attrs)
+        kind = kind.group(1) if kind else b"n"
+        if kind == b"s":
+            match = _V_RE.search(body)
+            if match is not None:
+                body = strings[int(match.group(1))].encode("utf-8")
+        parts.append(letters + b"\x01" + kind + b"\x01" + body)
+    return b"\x02".join(parts)
+
+
+def parse_raw_rows(root, rows, strings):
+    """把表头行和挑出来的数据行（原始字节）拼回一个工作表文档，按 read_sheet 的规则解析。"""
+    document = root + b"<sheetData>" + b"".join(rows) + b"</sheetData></worksheet>"
+    columns, values = _parse_rows(io.BytesIO(document), strings)
+    return _to_frame(columns, values)
+
+
+def to_int(value):
+    """整数列的转换规则，与解析时相同。无法转换时抛出 ValueError。"""
+    return _to_int(value)
+
+
+def row_number(row):
+    """原始行字节中的行号（r 属性），没有时返回 None。"""
+    match = _ROW_REF_RE.match(row)
+    return int(match.group(1)) if match else None
+
+
+def to_value(value):
+    """数值 列的转换规则：去掉 '%' 后转 float，失败时为 NaN（该行会被丢弃）。"""
+    return _to_value(value)
+
+
+def _parse_rows(data, strings):
+    """逐行解析 <sheetData>，返回 (列名列表, 每列一个已转换类型的 list)。"""
+    row_tag, cell_tag = f"{_NS}row", f"{_NS}c"
+    v_tag, t_tag = f"{_NS}v", f"{_NS}t"
+    columns = None
+    converters = None
+    values = None
+    value_pos = None
+
+    for _, elem in ElementTree.iterparse(data):
+        if elem.tag != row_tag:
+            continue
+        row_number = elem.get("r")
+        cells = {}
+        for cell in elem.iter(cell_tag):
+            cells[_column_index(cell.get("r"), len(cells))] = _cell_value(cell, strings, v_tag, t_tag)
+        elem.clear()
+        if not cells:
+            continue
+
+        if columns is None:
+            # 第一行是表头
+            width = max(cells) + 1
+            columns = [cells.get(i) or f"Unnamed: {i}" for i in range(width)]
+            converters = [_converter(name) for name in columns]
+            values = [[] for _ in columns]
+            value_pos = columns.index(VALUE_COLUMN) if VALUE_COLUMN in columns else None
+            continue
+
+        # 先看 数值：页脚、备注等只填了几列的行在这里丢弃，不再转换其他列
+        if value_pos is not None:
+            value = converters[value_pos](cells.get(value_pos))
+            if math.isnan(value):
+                continue
+        row = []
+        for i, name in enumerate(columns):
+            if i == value_pos:
+                row.append(value)
+                continue
+            try:
+                row.append(converters[i](cells.get(i)))
+            except ValueError as e:
+                raise ValueError(f"工作表第 {row_number or '?'} 行 '{name}' 列: {e}") from None
+        for column, item in zip(values, row):
+            column.append(item)
+
+    return columns or [], values or []
+
+
+def _to_frame(columns, values):
+    data = {}
+    for name, column in zip(columns, values):
+        if name in INT_COLUMNS:
+            data[name] = np.array(column, dtype=np.int64)
+        elif name == VALUE_COLUMN:
+            data[name] = np.array(column, dtype=np.float64)
+        else:
+            arr = np.empty(len(column), dtype=object)
+            arr[:] = column
+            data[name] = arr
+    return pd.DataFrame(data, columns=columns)
+
+
+def _converter(name):
+    if name in INT_COLUMNS:
+        return _to_int
+    if name == VALUE_COLUMN:
+        return _to_value
+    return _text_converter()
+
+
+def _to_int(value):
+    try:
+        if isinstance(value, str):
+            return int(float(value))
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"无法转换为整数: {value!r}") from None
+
+
+def _to_value(value):
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        value = value.replace('%', '')
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+def _text_converter():
+    """文本列的转换函数。同一列中重复的字符串只保留一个对象，长表中可省下大部分内存。"""
+    seen = {}
+
+    def convert(value):
+        if value is None:
+            return None
+        # 与 read_excel 一致：整数值的数字单元格读成 int，再按页面的做法转成字符串
+        if isinstance(value, float) and value.is_integer():
+            value = str(int(value))
+        else:
+            value = str(value)
+        return seen.setdefault(value, value)
+
+    return convert
+
+
+def _cell_value(cell, strings, v_tag, t_tag):
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(t_tag))
+    v = cell.find(v_tag)
+    if v is None or v.text is None:
+        return None
+    if kind == "s":
+        return strings[int(v.text)]
+    if kind == "n":
+        return float(v.text)
+    if kind == "b":
+        return v.text == "1"
+    if kind == "e":
+        return None
+    return v.text
+
+
+def _raw_cell_value(kind, body, strings):
+    if kind == b"inlineStr":
+        return "".join(html.unescape(t.decode("utf-8")) for t in _T_RE.findall(body))
+    match = _V_RE.search(body)
+    if match is None:
+        return None
+    text = html.unescape(match.group(1).decode("utf-8"))
+    if kind == b"s":
+        return strings[int(text)]
+    if kind == b"n":
+        return float(text)
+    if kind == b"b":
+        return text == "1"
+    if kind == b"e":
+        return None
+    return text
+
+
+def _column_letters(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _column_index(ref, default):
+    """把 "C12" 这样的单元格引用转成从 0 开始的列号；没有引用时按顺序编号。"""
+    if not ref:
+        return default
+    index = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        index = index * 26 + (ord(ch.upper()) - 64)
+    return index - 1
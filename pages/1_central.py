@@ -2,11 +2,16 @@
 # pages/1_中央企业.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+
+from core import (comparison, data_store, defaults, export, figures, indexing, multi, panel_cache, perf, periods,
+                  prerender, rankings, search, warmup)
 
  
 
 st.set_page_config(layout="wide")
+perf.start_run("中央企业")
+# 显示登录表单的同时在后台预热数据和索引（每个数据版本只启动一次），登录后直接使用
+warmup.start_background(data_store.data_version())
     
 
 def check_password():
@@ -41,20 +46,18 @@ def check_password():
 
 if check_password():
     
-    @st.cache_data
-    def load_data(sheet_name):
-        file_path = "1_data.xlsx"
+    # 本页只加载一个工作表，各加载函数的缓存条目数就是数据版本数：保留当前版本和上一版
+    # （刷新时仍在使用旧版本的会话），更早版本的整表数据、索引和排名随之释放
+    @st.cache_resource(max_entries=2)
+    def load_data(sheet_name, data_version):
+        # 所有会话共享同一个只读 DataFrame，派生列已在加载时算好，页面不应再修改它
+        perf.record_miss()
+        file_path = data_store.DATA_FILE
         try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
-            
-            df['数值'] = df['数值'].astype(str).str.replace('%', '', regex=False)
-            df['数值'] = pd.to_numeric(df['数值'], errors='coerce')
-            df.dropna(subset=['数值'], inplace=True)
-    
-            df['年份'] = df['年份'].astype(int)
-            df['季度'] = df['季度'].astype(int)
-            #df['指标序号'] = df['指标序号'].astype(int)
-            return df
+            # 首次读取后走 .cache/ 下的列式缓存，不再每次解析 Excel
+            return warmup.resource(
+                data_version, sheet_name, 'data', lambda: data_store.load_shared_sheet(sheet_name, file_path)
+            )
         except FileNotFoundError:
             st.error(f"错误：数据文件 '{file_path}' 未找到。请确保它和 pages 文件夹在同一级目录。")
             return pd.DataFrame()
@@ -62,53 +65,287 @@ if check_password():
             st.error(f"读取Excel文件时出错: {e}")
             return pd.DataFrame()
     
-    def get_filtered_data(df, indicator, start_year, start_quarter, end_year, end_quarter):
-        df['时间点'] = df['年份'] + df['季度'] / 10.0
-        start_point = start_year + start_quarter / 10.0
-        end_point = end_year + end_quarter / 10.0
-        filtered = df[
-            (df['指标名称'] == indicator) &
-            (df['时间点'] >= start_point) &
-            (df['时间点'] <= end_point)
-        ]
-        return filtered.copy()
+    @st.cache_resource(max_entries=2)
+    def load_index(sheet_name, data_version):
+        """每个数据版本只建一次行位置索引，所有会话共用"""
+        perf.record_miss()
+        return warmup.resource(
+            data_version, sheet_name, 'index', lambda: indexing.SheetIndex(load_data(sheet_name, data_version), '企业名称')
+        )
+    
+    @st.cache_resource(max_entries=2)
+    def load_rankings(sheet_name, data_version):
+        """每个 (指标, 年份, 季度) 的排名在数据加载后一次排好，随数据版本自动失效"""
+        perf.record_miss()
+        return warmup.resource(
+            data_version, sheet_name, 'rankings',
+            lambda: rankings.RankingCube(load_data(sheet_name, data_version), '企业名称', data_version)
+        )
+    
+    @st.cache_resource(max_entries=2)
+    def load_search_index(sheet_name, data_version):
+        """指标搜索的倒排索引和排好序的下拉选项，每个数据版本只建一次"""
+        perf.record_miss()
+        return warmup.resource(
+            data_version, sheet_name, 'search', lambda: search.SearchIndex(load_index(sheet_name, data_version).indicator_catalog)
+        )
+    
+    @st.cache_resource(max_entries=256)
+    def load_panel_matrix(sheet_name, data_version, display_name):
+        """某个指标的 企业 × 期序 矩阵及各期排名，按指标缓存，切换对比期时只做切片"""
+        perf.record_miss()
+        return comparison.build_matrix(load_index(sheet_name, data_version), display_name)
+    
+    @st.cache_resource(max_entries=64)
+    def load_indicator_batch(sheet_name, data_version, display_names):
+        """多个指标一次批量透视成 指标 × 企业 × 期序 矩阵，按指标组合缓存"""
+        perf.record_miss()
+        return multi.IndicatorBatch(load_index(sheet_name, data_version), display_names)
+    
+    # 趋势片段中时间序列范围下拉框的 key（起始年份、起始季度、终止年份、终止季度）
+    TREND_RANGE_KEYS = ("start_year", "start_quarter", "end_year", "end_quarter")
+    
+    @st.fragment
+    @perf.fragment("指标选择")
+    def indicator_picker(search_index, shown_display_name):
+        """
+        指标选择（片段）：关键词搜索和指标下拉框。
+        片段单独重跑后选中的指标与整页展示的 shown_display_name 不同时整页重跑，页面其余部分都依赖所选指标。
+        """
+        with st.container(border=True):
+            st.subheader("分析指标选择")
+            
+            # 排好序的显示名称随搜索索引一起预先生成
+            indicator_display_options = search_index.options
+            
+            search_term = st.text_input("指标关键词搜索：", placeholder="先输入关键词搜索，再筛选下方列表")
+            
+            if search_term:
+                # 支持多个关键词（空格分隔）、指标序号和拼音首字母，结果按相关度排序，默认选中最相关的一项
+                with perf.stage("指标搜索"):
+                    filtered_options = search_index.search(search_term)
+                index_to_use = 0
+            else:
+                filtered_options = indicator_display_options
+                default_indicator = defaults.CENTRAL_DEFAULT_INDICATOR
+                try:
+                    index_to_use = filtered_options.index(default_indicator)
+                except ValueError:
+                    index_to_use = 0
+
+            # 带 key 的下拉框会沿用会话中保存的值：一次无结果的搜索后它一直是 None，
+            # 换了搜索结果后也可能不在选项中，这时清掉，按上面的 index 重新选
+            if st.session_state.get("indicator") not in filtered_options:
+                st.session_state.pop("indicator", None)
+
+            selected_display_name = st.selectbox(
+                "请从筛选结果中选择您需要分析的指标：",
+                options=filtered_options,
+                index=index_to_use,
+                label_visibility="collapsed",
+                key="indicator"
+            )
+        if selected_display_name != shown_display_name:
+            st.rerun()
+        return selected_display_name
+    
+    def get_filtered_data(index, indicator, start_year, start_quarter, end_year, end_quarter):
+        # 以整数期序表示时间，在按时间排好序的指标数据上二分查找区间，结果已按时间先后排列
+        start_point = periods.period_ordinal(start_year, start_quarter)
+        end_point = periods.period_ordinal(end_year, end_quarter)
+        return index.indicator_range(indicator, start_point, end_point)
+    
+    def top_panel(ranking_cube, data_version, display_name, indicator, panel_year, panel_quarter, axis_title):
+        """
+        Top 10 面板：(排名前 10 的行, 条形图)。结果放在全进程的面板缓存中，
+        其他会话看过的 (指标, 年份, 季度) 直接复用，不再取排名和构图。无数据时图为 None。
+        """
+        key = prerender.view_key('中央', 'bar', display_name, panel_year, panel_quarter)
+    
+        def build():
+            perf.record_miss()
+            with perf.stage("Top 10 排名"):
+                panel_data = ranking_cube.top(indicator, panel_year, panel_quarter, 10)
+            if panel_data.empty:
+                return panel_data, None
+            # 默认视图优先使用启动时预渲染好的图，未命中时照常构图
+            with perf.stage("px.bar", cached=True):
+                fig_bar = prerender.lookup(data_version, key)
+                if fig_bar is None:
+                    perf.record_miss()
+                    fig_bar = figures.top_bar(
+                        panel_data, title=f'{panel_year}年Q{panel_quarter} - Top 10',
+                        axis_title=axis_title, color_map=figures.entity_colors(panel_data['企业名称'].tolist())
+                    )
+            return panel_data, fig_bar
+    
+        return panel_cache.get_or_build(data_version, key, build)
+    
+    def trend_panel(index, data_version, display_name, indicator, panel_year, panel_quarter,
+                    start_year, start_quarter, end_year, end_quarter, top_10_companies, axis_title):
+        """Top 10 趋势面板：(Top 10 企业在所选区间内的行, 折线图)，同样在面板缓存中共享。"""
+        key = prerender.view_key('中央', 'line', display_name, panel_year, panel_quarter,
+                                 start_year, start_quarter, end_year, end_quarter)
+    
+        def build():
+            perf.record_miss()
+            with perf.stage("时间序列筛选"):
+                time_series_filtered_df = get_filtered_data(index, indicator, start_year, start_quarter, end_year, end_quarter)
+                time_series_data = time_series_filtered_df[time_series_filtered_df['企业名称'].isin(top_10_companies)]
+            if time_series_data.empty:
+                return time_series_data, None
+            with perf.stage("px.line", cached=True):
+                fig_line = prerender.lookup(data_version, key)
+                if fig_line is None:
+                    perf.record_miss()
+                    fig_line = figures.trend_line(
+                        time_series_data,
+                        title=f'Top 10 企业趋势 ({start_year}Q{start_quarter} - {end_year}Q{end_quarter})',
+                        axis_title=axis_title, color_map=figures.entity_colors(top_10_companies)
+                    )
+            return time_series_data, fig_line
+    
+        return panel_cache.get_or_build(data_version, key, build)
+    
+    @st.fragment
+    @perf.fragment("Top 10 趋势")
+    def trend_view(index, data_version, display_name, indicator, panel_year, panel_quarter,
+                   year_options, quarter_options, top_10_companies, axis_title):
+        """
+        Top 10 企业趋势（片段）。时间序列范围只影响这张图，它的下拉框放在片段内：
+        修改区间时只重跑这一块、只重新发送折线图，页面其余部分不动。
+        """
+        st.subheader("时间序列数据：Top 10 企业趋势")
+        range_col1, range_col2 = st.columns(2)
+        with range_col1:
+            start_year = st.selectbox("起始年份", options=year_options, index=len(year_options)-1, key="start_year")
+            start_quarter = st.selectbox("起始季度", options=quarter_options, index=0, key="start_quarter")
+        with range_col2:
+            end_year = st.selectbox("终止年份", options=year_options, index=0, key="end_year")
+            # --- 核心修正：index不再写死 ---
+            end_quarter_index = len(quarter_options) - 1
+            end_quarter = st.selectbox("终止季度", options=quarter_options, index=end_quarter_index, key="end_quarter")
+    
+        with perf.stage("Top 10 趋势面板", cached=True):
+            time_series_data, fig_line = trend_panel(
+                index, data_version, display_name, indicator, panel_year, panel_quarter,
+                start_year, start_quarter, end_year, end_quarter, top_10_companies, axis_title
+            )
+        if time_series_data.empty:
+            st.warning("在选定时间范围内，Top 10 企业无数据。")
+        else:
+            perf.plotly_chart(fig_line, "st.plotly_chart (line)", use_container_width=True)
+    
+    @st.fragment
+    @perf.fragment("跨期对比")
+    def create_comparison(data_version, selected_display_name, panel_year, panel_quarter):
+        """全部企业在本期与对比期（环比 / 同比）之间的数值、增长率和排名变化（片段：切换对比方式只重跑这一块）。"""
+        with st.container(border=True):
+            st.subheader("跨期对比：环比 / 同比与排名变化")
+            if not st.toggle("显示全部企业的跨期对比", key="compare_on"):
+                return
+            compare_mode = st.radio("对比方式", options=list(comparison.MODES), horizontal=True, key="compare_mode")
+            current_ordinal = periods.period_ordinal(panel_year, panel_quarter)
+            with perf.stage("跨期对比", cached=True):
+                panel_matrix = load_panel_matrix('中央', data_version, selected_display_name)
+                compare_df = panel_matrix.compare(current_ordinal, compare_mode)
+            base_label = panel_matrix.base_label(current_ordinal, compare_mode)
+            st.markdown(f"本期：**{periods.period_label(current_ordinal)}**，对比期：**{base_label}**")
+            if compare_df['对比期数值'].isna().all():
+                st.info(f"{base_label} 无该指标数据，无法计算{compare_mode}。")
+            st.dataframe(
+                compare_df, use_container_width=True, hide_index=True,
+                column_config={
+                    '本期数值': st.column_config.NumberColumn(format="%.1f"),
+                    '对比期数值': st.column_config.NumberColumn(format="%.1f"),
+                    '变化': st.column_config.NumberColumn(format="%.1f"),
+                    '增长率(%)': st.column_config.NumberColumn(format="%.1f%%"),
+                    '排名变化': st.column_config.NumberColumn(format="%+d", help="正数表示名次上升"),
+                }
+            )
+    
+    @st.fragment
+    @perf.fragment("多指标分析")
+    def create_multi_view(central_index, search_index, data_version, selected_chapter, selected_display_name,
+                          panel_year, panel_quarter):
+        """同时分析多个指标：整个章节或手动挑选的指标，以小多图或相关性热力图展示（片段：本区的操作只重跑这一块）。"""
+        with st.container(border=True):
+            st.subheader("多指标分析：小多图 / 相关性热力图")
+            if not st.toggle("同时分析多个指标", key="multi_on"):
+                return
+            catalog = central_index.indicator_catalog
+            chapter_list = catalog['所属章节'].drop_duplicates().tolist()
+            pick_options = ["（手动挑选指标）"] + chapter_list
+            multi_chapter = st.selectbox(
+                "选择整个章节，或手动挑选指标", options=pick_options,
+                index=pick_options.index(selected_chapter) if selected_chapter in pick_options else 0,
+                key="multi_chapter"
+            )
+            if multi_chapter == pick_options[0]:
+                multi_names = st.multiselect("选择指标", options=search_index.options, default=[selected_display_name], key="multi_names")
+            else:
+                multi_names = sorted(catalog.loc[catalog['所属章节'] == multi_chapter, '指标显示名称'].unique())
+            multi_view = st.radio("展示方式", options=["小多图", "相关性热力图"], horizontal=True, key="multi_view")
+            current_ordinal = periods.period_ordinal(panel_year, panel_quarter)
+            
+            if not multi_names:
+                st.warning("请至少选择一个指标。")
+            else:
+                # 所有选中指标一次批量透视，按指标组合缓存
+                with perf.stage("多指标批量取数", cached=True):
+                    batch = load_indicator_batch('中央', data_version, tuple(multi_names))
+                if multi_view == "小多图":
+                    with perf.stage("小多图构图"):
+                        panels = multi.small_multiples(batch, current_ordinal)
+                    if len(batch) > len(panels):
+                        st.caption(f"共 {len(batch)} 个指标，仅显示前 {len(panels)} 个。")
+                    grid = st.columns(3)
+                    for i, (name, fig) in enumerate(panels):
+                        with grid[i % 3]:
+                            if len(fig.data[0].x) == 0:
+                                st.caption(f"{name}：{panel_year}年Q{panel_quarter} 无数据")
+                            else:
+                                st.plotly_chart(fig, use_container_width=True, key=f"multi_{i}")
+                else:
+                    corr = batch.correlation(current_ordinal)
+                    if corr.empty:
+                        st.warning("所选指标在本期的共同数据不足，无法计算相关系数。")
+                    else:
+                        with perf.stage("热力图构图"):
+                            fig_corr = figures.correlation_heatmap(corr, f"{panel_year}年Q{panel_quarter} 指标相关系数（按企业计算）")
+                        perf.plotly_chart(fig_corr, "st.plotly_chart (heatmap)", use_container_width=True)
+                        # 热力图只标指标序号，完整名称列在下方
+                        st.dataframe(
+                            pd.DataFrame({'标签': batch.labels(), '指标': batch.display_names}).query('标签 in @corr.columns'),
+                            use_container_width=True, hide_index=True
+                        )
     
-    df_central = load_data(sheet_name='中央')
+    with perf.stage("data_version"):
+        data_version = data_store.data_version()
+    # 后台载入默认视图的预渲染图表（每个数据版本只启动一次），不阻塞本次运行
+    prerender.start_background(data_version)
+    with perf.stage("load_data", cached=True):
+        df_central = load_data('中央', data_version)
     
     if df_central.empty:
         st.stop()
     
+    with perf.stage("load_index", cached=True):
+        central_index = load_index('中央', data_version)
+    with perf.stage("load_rankings", cached=True):
+        central_rankings = load_rankings('中央', data_version)
+    with perf.stage("load_search_index", cached=True):
+        search_index = load_search_index('中央', data_version)
+    
     st.header("中央企业指标分析仪表盘")
     
     
     
     # --- 1. 全局指标筛选器 ---
-    with st.container(border=True):
-        st.subheader("分析指标选择")
-        
-        # 在整个数据集上创建显示名称
-        df_central['指标显示名称'] = df_central['指标名称'] + ' --- ' + df_central['指标序号'].astype(str)
-        indicator_display_options = sorted(df_central['指标显示名称'].unique())
-        
-        search_term = st.text_input("指标关键词搜索：", placeholder="先输入关键词搜索，再筛选下方列表")
-        
-        if search_term:
-            filtered_options = [opt for opt in indicator_display_options if search_term.lower() in opt.lower()]
-            index_to_use = 0
-        else:
-            filtered_options = indicator_display_options
-            default_indicator = "截至本填报期末，本企业研发人员占比（%），指标68/指标4 --- 3(68/4)"
-            try:
-                index_to_use = filtered_options.index(default_indicator)
-            except ValueError:
-                index_to_use = 0
-                
-        selected_display_name = st.selectbox(
-            "请从筛选结果中选择您需要分析的指标：",
-            options=filtered_options,
-            index=index_to_use,
-            label_visibility="collapsed"
-        )
+    # 片段内输入关键词只重跑这一块；选中的指标变了才整页重跑（传入整页当前展示的指标作比较）
+    selected_display_name = indicator_picker(
+        search_index, st.session_state.get("indicator", defaults.CENTRAL_DEFAULT_INDICATOR)
+    )
     
     if not selected_display_name:
         st.warning("请选择一个指标以开始分析。")
@@ -117,7 +354,8 @@ if check_password():
               
     # --- 2. 根据所选指标，准备数据和后续筛选器 ---
     original_indicator = selected_display_name.split(' --- ')[0]
-    df_indicator_data = df_central[df_central['指标名称'] == original_indicator].copy()
+    with perf.stage("指标筛选"):
+        df_indicator_data = central_index.indicator_rows(original_indicator)
     
     selected_chapter = df_indicator_data['所属章节'].iloc[0] if not df_indicator_data.empty else "未知章节"
     unit_series = df_indicator_data['单位'].dropna()
@@ -126,52 +364,35 @@ if check_password():
     
     
     # --- 3. 全局时间筛选器 ---
+    # 面板时间点影响 Top 10、趋势、跨期对比和导出，修改时整页重跑；
+    # 时间序列范围只影响趋势图，它的下拉框放在下方的趋势片段中
     with st.container(border=True):
         st.subheader("时间范围筛选")
-        left_filter_col, right_filter_col = st.columns(2)
     
         # 准备时间选项
         year_options = sorted(df_indicator_data['年份'].unique(), reverse=True)
         quarter_options = sorted(df_indicator_data['季度'].unique())
         
+        st.markdown("**面板数据时间点**")
+        left_filter_col, right_filter_col = st.columns(2)
         with left_filter_col:
-            st.markdown("**面板数据时间点**")
             panel_year = st.selectbox("选择年份", options=year_options, key="panel_year")
-            panel_quarter = st.selectbox("选择季度", options=quarter_options, key="panel_quarter")
-    
         with right_filter_col:
-            st.markdown("**时间序列范围**")
-            range_col1, range_col2 = st.columns(2)
-            with range_col1:
-                start_year = st.selectbox("起始年份", options=year_options, index=len(year_options)-1, key="start_year")
-                start_quarter = st.selectbox("起始季度", options=quarter_options, index=0, key="start_quarter")
-            with range_col2:
-                end_year = st.selectbox("终止年份", options=year_options, index=0, key="end_year")
-                # --- 核心修正：index不再写死 ---
-                end_quarter_index = len(quarter_options) - 1
-                end_quarter = st.selectbox("终止季度", options=quarter_options, index=end_quarter_index, key="end_quarter")
+            panel_quarter = st.selectbox("选择季度", options=quarter_options, key="panel_quarter")
     
      
     
     
     # --- 4. 仪表盘展示 ---
     with st.container(border=True):
-        # 准备数据
-        panel_data = df_indicator_data[
-            (df_indicator_data['年份'] == panel_year) &
-            (df_indicator_data['季度'] == panel_quarter)
-        ].nlargest(10, '数值')
+        # 准备数据：面板的数据切片和图表从全进程共享的面板缓存中取，缓存的对象不应修改
+        with perf.stage("Top 10 面板", cached=True):
+            panel_data, fig_bar = top_panel(
+                central_rankings, data_version, selected_display_name, original_indicator,
+                panel_year, panel_quarter, axis_title
+            )
     
         top_10_companies = panel_data['企业名称'].tolist()
-        color_sequence = px.colors.qualitative.Plotly
-        color_map = {company: color_sequence[i % len(color_sequence)] for i, company in enumerate(top_10_companies)}
-    
-        time_series_filtered_df = get_filtered_data(df_indicator_data, original_indicator, start_year, start_quarter, end_year, end_quarter)
-        time_series_data = time_series_filtered_df[time_series_filtered_df['企业名称'].isin(top_10_companies)].copy()
-        if not time_series_data.empty:
-            time_series_data.sort_values(by=['年份', '季度'], inplace=True)
-            time_series_data['时间'] = time_series_data['年份'].astype(str) + '-Q' + time_series_data['季度'].astype(str)
-    
         
         st.markdown(f"#### 所属章节：**{selected_chapter}**")
         st.markdown(f"#### 当前分析指标：**{selected_display_name}**")
@@ -184,27 +405,44 @@ if check_password():
             if panel_data.empty:
                 st.warning("当前筛选条件下无数据。")
             else:
-                fig_bar = px.bar(
-                    panel_data, x='数值', y='企业名称', orientation='h',
-                    title=f'{panel_year}年Q{panel_quarter} - Top 10', text='数值',
-                    color='企业名称', color_discrete_map=color_map
-                )
-                fig_bar.update_layout(yaxis_title="企业名称", xaxis_title=axis_title, showlegend=False)
-                fig_bar.update_yaxes(categoryorder='total ascending')
-                fig_bar.update_traces(texttemplate='%{text:.1f}', textposition='outside')
-                fig_bar.update_traces(hovertemplate='<b>%{y}</b><br>数值: %{x:.1f}<extra></extra>')
-                st.plotly_chart(fig_bar, use_container_width=True)
+                perf.plotly_chart(fig_bar, "st.plotly_chart (bar)", use_container_width=True)
     
         with right_col:
-            st.subheader("时间序列数据：Top 10 企业趋势")
-            if time_series_data.empty:
-                st.warning("在选定时间范围内，Top 10 企业无数据。")
-            else:
-                fig_line = px.line(
-                    time_series_data, x='时间', y='数值', color='企业名称', markers=True,
-                    title=f'Top 10 企业趋势 ({start_year}Q{start_quarter} - {end_year}Q{end_quarter})',
-                    color_discrete_map=color_map
-                )
-                fig_line.update_layout(xaxis_title="时间", yaxis_title=axis_title, legend_title="企业名称")
-                fig_line.update_traces(hovertemplate='时间: %{x}<br>数值: %{y:.1f}<extra></extra>')
-                st.plotly_chart(fig_line, use_container_width=True)
+            trend_view(
+                central_index, data_version, selected_display_name, original_indicator, panel_year, panel_quarter,
+                year_options, quarter_options, top_10_companies, axis_title
+            )
+    
+        def export_slices():
+            # 趋势区间在趋势片段中选择，可能在上次整页运行之后改过，每次从会话状态读取当前值
+            start_year, start_quarter, end_year, end_quarter = (st.session_state[key] for key in TREND_RANGE_KEYS)
+            panel_label = f"{panel_year}Q{panel_quarter}"
+            range_label = f"{start_year}Q{start_quarter}-{end_year}Q{end_quarter}"
+            return {
+                "Top 10 面板": (
+                    export.file_name(original_indicator, "Top10", panel_label),
+                    lambda: export.ranked(central_rankings.positions(original_indicator, panel_year, panel_quarter)[:10]),
+                ),
+                "Top 10 企业趋势": (
+                    export.file_name(original_indicator, "Top10趋势", panel_label, range_label),
+                    lambda: (trend_panel(
+                        central_index, data_version, selected_display_name, original_indicator, panel_year, panel_quarter,
+                        start_year, start_quarter, end_year, end_quarter, top_10_companies, axis_title
+                    )[0].index.to_numpy(), None),
+                ),
+                "指标完整历史（全部企业）": (
+                    export.file_name(original_indicator, "完整历史"),
+                    lambda: (central_index.range_positions(original_indicator), None),
+                ),
+            }
+    
+        # 导出（片段）：点击时才从列式缓存分块生成文件，平时重跑不做导出
+        export.download_panel("central_export", '中央', data_version, export_slices)
+    
+    
+    # --- 5. 跨期对比（片段） ---
+    create_comparison(data_version, selected_display_name, panel_year, panel_quarter)
+    # --- 6. 多指标分析（片段） ---
+    create_multi_view(central_index, search_index, data_version, selected_chapter, selected_display_name, panel_year, panel_quarter)
+    
+    perf.render_panel()
@@ -9,15 +9,19 @@ Created on Sun Jun 15 22:55:10 2025
 # pages/2_地方国企.py (已重构为函数式结构)
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import requests
 import numpy as np
 
+from core import (comparison, data_store, defaults, export, figures, geo, indexing, multi, panel_cache, perf, periods,
+                  prerender, rankings, warmup)
+
 # 兼容新版Numpy的补丁
 if not hasattr(np, 'bool8'):
     np.bool8 = np.bool_
 
 st.set_page_config(layout="wide")
+perf.start_run("地方国企")
+# 显示登录表单的同时在后台预热数据和索引（每个数据版本只启动一次），登录后直接使用
+warmup.start_background(data_store.data_version())
 
 def check_password():
     """如果用户已登录，返回 True，否则显示密码输入并返回 False"""
@@ -51,17 +55,18 @@ def check_password():
 
 if check_password():
         # --- 数据加载函数 ---
-    @st.cache_data
-    def load_data(sheet_name):
-        file_path = "1_data.xlsx"
+    # 本页只加载一个工作表，各加载函数的缓存条目数就是数据版本数：保留当前版本和上一版
+    # （刷新时仍在使用旧版本的会话），更早版本的整表数据、索引和排名随之释放
+    @st.cache_resource(max_entries=2)
+    def load_data(sheet_name, data_version):
+        # 所有会话共享同一个只读 DataFrame，派生列已在加载时算好，页面不应再修改它
+        perf.record_miss()
+        file_path = data_store.DATA_FILE
         try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
-            df['数值'] = df['数值'].astype(str).str.replace('%', '', regex=False)
-            df['数值'] = pd.to_numeric(df['数值'], errors='coerce')
-            df.dropna(subset=['数值'], inplace=True)
-            df['年份'] = df['年份'].astype(int)
-            df['季度'] = df['季度'].astype(int)
-            return df
+            # 首次读取后走 .cache/ 下的列式缓存，不再每次解析 Excel
+            return warmup.resource(
+                data_version, sheet_name, 'data', lambda: data_store.load_shared_sheet(sheet_name, file_path)
+            )
         except FileNotFoundError:
             st.error(f"错误：数据文件 '{file_path}' 未找到。")
             return pd.DataFrame()
@@ -69,20 +74,55 @@ if check_password():
             st.error(f"读取Excel文件时出错: {e}")
             return pd.DataFrame()
     
-    @st.cache_data
-    def get_china_geojson():
-        """从网络加载GeoJSON文件"""
-        url = "https://raw.githubusercontent.com/longwosion/geojson-map-china/master/china.json"
+    @st.cache_resource(max_entries=2)
+    def load_index(sheet_name, data_version):
+        """每个数据版本只建一次行位置索引，所有会话共用"""
+        perf.record_miss()
+        return warmup.resource(
+            data_version, sheet_name, 'index', lambda: indexing.SheetIndex(load_data(sheet_name, data_version), '省份')
+        )
+    
+    @st.cache_resource(max_entries=2)
+    def load_rankings(sheet_name, data_version):
+        """每个 (指标, 年份, 季度) 的排名在数据加载后一次排好，随数据版本自动失效"""
+        perf.record_miss()
+        return warmup.resource(
+            data_version, sheet_name, 'rankings',
+            lambda: rankings.RankingCube(load_data(sheet_name, data_version), '省份', data_version)
+        )
+    
+    @st.cache_resource(max_entries=256)
+    def load_panel_matrix(sheet_name, data_version, display_name):
+        """某个指标的 省份 × 期序 矩阵及各期排名，按指标缓存，切换对比期时只做切片"""
+        perf.record_miss()
+        return comparison.build_matrix(load_index(sheet_name, data_version), display_name)
+    
+    @st.cache_resource(max_entries=64)
+    def load_indicator_batch(sheet_name, data_version, display_names):
+        """多个指标一次批量透视成 指标 × 省份 × 期序 矩阵，按指标组合缓存"""
+        perf.record_miss()
+        return multi.IndicatorBatch(load_index(sheet_name, data_version), display_names)
+    
+    @st.cache_resource
+    def get_china_geojson(level=geo.DEFAULT_LEVEL):
+        """从仓库内的 static/geo 读取预先简化过的GeoJSON文件，不再访问网络"""
+        perf.record_miss()
+        # 开启了静态文件服务时只返回省界文件的地址：浏览器下载一次后缓存，图表 JSON 中不再嵌入省界
+        if st.get_option("server.enableStaticServing"):
+            url = geo.geojson_url(level)
+            if url:
+                return url
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return geo.load_china_geojson(level)
+        except (OSError, ValueError) as e:
             st.error(f"无法加载GeoJSON文件: {e}")
             return None
     
+    # 省份排名表显示的行数，导出的排名与之相同
+    RANKING_ROWS = 31+1#1是兵团
+    
     # --- 可复用的仪表盘创建函数 ---
-    def create_dashboard(panel_data, unit, geojson_data, panel_year, panel_quarter, selected_indicator, selected_chapter):
+    def create_dashboard(panel_data, unit, geojson_data, panel_year, panel_quarter, selected_indicator, selected_chapter, ranking_cube, data_version, selected_display_name):
         """
         为给定的章节数据创建一个完整的仪表盘。
         
@@ -90,6 +130,10 @@ if check_password():
         df_chapter (pd.DataFrame): 已经按章节筛选过的数据。
         chapter_title (str): 当前章节的标题，用于生成唯一的组件key。
         geojson_data: 用于绘制地图的GeoJSON数据。
+        ranking_cube (rankings.RankingCube): 预先排好的省份排名。
+        data_version (str): 数据版本号，用于查找预渲染的默认视图。
+        selected_display_name (str): 指标显示名称。同一指标名称可能对应多个指标序号，
+            地图（静态和逐季播放）和排名都按它取数，显示的是同一组行。
         """
     
         # --- 仪表盘布局 ---
@@ -99,62 +143,175 @@ if check_password():
         # --- 左侧地图 ---
         with left_col:
             st.subheader(f"数据地图：{selected_chapter}")
+            animate = st.toggle("逐季播放", key="map_animate", help="在浏览器中按季度播放本指标的全部数据，拖动滑块切换季度不重跑页面")
             
             if panel_data.empty or not geojson_data:
                 st.warning("当前筛选条件下无数据或无法加载地图，无法生成图表。")
+            elif animate:
+                # 整张动画图（各期数值 + 固定色阶）在面板缓存中共享；矩阵按指标缓存，兵团一次并入新疆
+                animation_key = prerender.view_key('地方', 'map_animation', selected_display_name, panel_year, panel_quarter,
+                                                   prerender.geo_ref(geojson_data))
+    
+                def build_animation():
+                    perf.record_miss()
+                    with perf.stage("地图矩阵"):
+                        provinces, ordinals, values = geo.map_matrix(
+                            load_panel_matrix('地方', data_version, selected_display_name), unit
+                        )
+                    with perf.stage("动画地图构图"):
+                        active = int(np.searchsorted(ordinals, periods.period_ordinal(panel_year, panel_quarter)))
+                        return figures.province_map_animation(
+                            provinces, [periods.period_label(o) for o in ordinals], values, geojson_data,
+                            indicator=selected_indicator, colorbar_title=axis_title,
+                            active=min(active, len(ordinals) - 1)
+                        )
+    
+                with perf.stage("动画地图面板", cached=True):
+                    fig = panel_cache.get_or_build(data_version, animation_key, build_animation)
+                perf.plotly_chart(fig, "st.plotly_chart (动画地图)", use_container_width=True)
             else:
                 # ... [地图数据准备和绘图逻辑与之前相同] ...
                 # 此处省略地图绘图代码，以保持简洁
-                df_for_map = panel_data.copy()
-                if unit != '%':
-                    has_xinjiang = '新疆维吾尔自治区' in df_for_map['省份'].values
-                    has_bingtuan = '新疆生产建设兵团' in df_for_map['省份'].values
-                    if has_xinjiang and has_bingtuan:
-                        xinjiang_value = df_for_map.loc[df_for_map['省份'] == '新疆维吾尔自治区', '数值'].iloc[0]
-                        bingtuan_value = df_for_map.loc[df_for_map['省份'] == '新疆生产建设兵团', '数值'].iloc[0]
-                        df_for_map.loc[df_for_map['省份'] == '新疆维吾尔自治区', '数值'] = xinjiang_value + bingtuan_value
-                df_for_map = df_for_map[df_for_map['省份'] != '新疆生产建设兵团']
-                
-                fig = px.choropleth(
-                    df_for_map,
-                    geojson=geojson_data,
-                    locations='省份',
-                    featureidkey="properties.name",
-                    color='数值',
-                    color_continuous_scale="spectral",
-                    #color_continuous_scale="rdylbu",
-                    title=f"{panel_year}年Q{panel_quarter} - {selected_indicator}"
-                )
-                fig.update_coloraxes(colorbar_title=axis_title)
-                fig.update_geos(fitbounds="locations", visible=False)
-                fig.update_layout(margin={"r":0, "t":40, "l":0, "b":0})
-                fig.update_traces(hovertemplate='<b>%{location}</b><br>数值: %{z:.1f}<extra></extra>')
-                st.plotly_chart(fig, use_container_width=True)
+                # 地图面板（地图数据 + 图表）在全进程的面板缓存中共享，其他会话看过的视图直接复用；
+                # 各章节的默认视图在启动时已预渲染，首次未命中缓存时也跳过构图
+                map_key = prerender.view_key('地方', 'map', selected_display_name, panel_year, panel_quarter,
+                                             prerender.geo_ref(geojson_data))
+    
+                def build_map_panel():
+                    perf.record_miss()
+                    with perf.stage("地图数据准备"):
+                        df_for_map = geo.map_frame(panel_data, unit)
+                    with perf.stage("px.choropleth", cached=True):
+                        fig = prerender.lookup(data_version, map_key)
+                        if fig is None:
+                            perf.record_miss()
+                            fig = figures.province_map(
+                                df_for_map, geojson_data,
+                                title=f"{panel_year}年Q{panel_quarter} - {selected_indicator}",
+                                colorbar_title=axis_title
+                            )
+                    return df_for_map, fig
+    
+                with perf.stage("地图面板", cached=True):
+                    df_for_map, fig = panel_cache.get_or_build(data_version, map_key, build_map_panel)
+                perf.plotly_chart(fig, "st.plotly_chart (choropleth)", use_container_width=True)
     
         # --- 右侧Top 10排名 ---
         with right_col:
             st.subheader("省份排名")
-            top_num = 31+1#1是兵团
+            top_num = RANKING_ROWS
             
             if panel_data.empty:
                 st.warning("无数据可供排名。")
             else:
-                top_10_data = panel_data.nlargest(top_num, '数值').copy()
-                top_10_data['排名'] = range(1, len(top_10_data) + 1)
-                top_10_data['数值'] = top_10_data['数值'].map('{:,.1f}'.format)
-                display_df = top_10_data[['排名', '省份', '数值']]
+                def build_ranking_panel():
+                    perf.record_miss()
+                    display_df = ranking_cube.ranking(selected_indicator, panel_year, panel_quarter, top_num,
+                                                      display_name=selected_display_name)
+                    display_df['数值'] = display_df['数值'].map('{:,.1f}'.format)
+                    return display_df
+    
+                # 排名表同样按视图缓存，缓存的表在会话间共享，不应修改
+                with perf.stage("省份排名", cached=True):
+                    ranking_key = prerender.view_key('地方', 'ranking', selected_display_name, panel_year, panel_quarter, top_num)
+                    display_df = panel_cache.get_or_build(data_version, ranking_key, build_ranking_panel)
                 
-                st.dataframe(
-                    display_df,
-                    use_container_width=True,
-                    hide_index=True
-                )
+                with perf.stage("st.dataframe (排名)"):
+                    st.dataframe(
+                        display_df,
+                        use_container_width=True,
+                        hide_index=True
+                    )
             
         info_message = "**数据说明**:\n\n1. 不包括港澳台地区"
         if unit != '%':
             info_message += "\n2. 由于标准地图文件中“新疆”为一个整体地理单元，我们在地图上展示的“新疆维吾尔自治区”颜色所代表的数值是 **自治区与兵团两者的总和**。"
         st.info(info_message)
     
+    @st.fragment
+    @perf.fragment("跨期对比")
+    def create_comparison(data_version, selected_display_name, panel_year, panel_quarter):
+        """全部省份在本期与对比期（环比 / 同比）之间的数值、增长率和排名变化（片段：切换对比方式只重跑这一块）。"""
+        with st.container(border=True):
+            st.subheader("跨期对比：环比 / 同比与排名变化")
+            if not st.toggle("显示全部省份的跨期对比", key="compare_on"):
+                return
+            compare_mode = st.radio("对比方式", options=list(comparison.MODES), horizontal=True, key="compare_mode")
+            current_ordinal = periods.period_ordinal(panel_year, panel_quarter)
+            with perf.stage("跨期对比", cached=True):
+                panel_matrix = load_panel_matrix('地方', data_version, selected_display_name)
+                compare_df = panel_matrix.compare(current_ordinal, compare_mode)
+            base_label = panel_matrix.base_label(current_ordinal, compare_mode)
+            st.markdown(f"本期：**{periods.period_label(current_ordinal)}**，对比期：**{base_label}**")
+            if compare_df['对比期数值'].isna().all():
+                st.info(f"{base_label} 无该指标数据，无法计算{compare_mode}。")
+            st.dataframe(
+                compare_df, use_container_width=True, hide_index=True,
+                column_config={
+                    '本期数值': st.column_config.NumberColumn(format="%.1f"),
+                    '对比期数值': st.column_config.NumberColumn(format="%.1f"),
+                    '变化': st.column_config.NumberColumn(format="%.1f"),
+                    '增长率(%)': st.column_config.NumberColumn(format="%.1f%%"),
+                    '排名变化': st.column_config.NumberColumn(format="%+d", help="正数表示名次上升"),
+                }
+            )
+    
+    @st.fragment
+    @perf.fragment("多指标分析")
+    def create_multi_view(data_version, catalog, selected_chapter, selected_display_name, panel_year, panel_quarter):
+        """同时分析多个指标：整个章节或手动挑选的指标，以小多图或相关性热力图展示（片段：本区的操作只重跑这一块）。"""
+        with st.container(border=True):
+            st.subheader("多指标分析：小多图 / 相关性热力图")
+            if not st.toggle("同时分析多个指标", key="multi_on"):
+                return
+            chapter_list = catalog['所属章节'].drop_duplicates().tolist()
+            pick_options = ["（手动挑选指标）"] + chapter_list
+            multi_chapter = st.selectbox(
+                "选择整个章节，或手动挑选指标", options=pick_options,
+                index=pick_options.index(selected_chapter) if selected_chapter in pick_options else 0,
+                key="multi_chapter"
+            )
+            if multi_chapter == pick_options[0]:
+                all_options = sorted(catalog['指标显示名称'].unique())
+                multi_names = st.multiselect("选择指标", options=all_options, default=[selected_display_name], key="multi_names")
+            else:
+                multi_names = sorted(catalog.loc[catalog['所属章节'] == multi_chapter, '指标显示名称'].unique())
+            multi_view = st.radio("展示方式", options=["小多图", "相关性热力图"], horizontal=True, key="multi_view")
+            if not multi_names:
+                st.warning("请至少选择一个指标。")
+                return
+            
+            current_ordinal = periods.period_ordinal(panel_year, panel_quarter)
+            # 所有选中指标一次批量透视，按指标组合缓存
+            with perf.stage("多指标批量取数", cached=True):
+                batch = load_indicator_batch('地方', data_version, tuple(multi_names))
+            if multi_view == "小多图":
+                with perf.stage("小多图构图"):
+                    panels = multi.small_multiples(batch, current_ordinal)
+                if len(batch) > len(panels):
+                    st.caption(f"共 {len(batch)} 个指标，仅显示前 {len(panels)} 个。")
+                grid = st.columns(3)
+                for i, (name, fig) in enumerate(panels):
+                    with grid[i % 3]:
+                        if len(fig.data[0].x) == 0:
+                            st.caption(f"{name}：{panel_year}年Q{panel_quarter} 无数据")
+                        else:
+                            st.plotly_chart(fig, use_container_width=True, key=f"multi_{i}")
+                return
+            
+            corr = batch.correlation(current_ordinal)
+            if corr.empty:
+                st.warning("所选指标在本期的共同数据不足，无法计算相关系数。")
+                return
+            with perf.stage("热力图构图"):
+                fig_corr = figures.correlation_heatmap(corr, f"{panel_year}年Q{panel_quarter} 指标相关系数（按省份计算）")
+            perf.plotly_chart(fig_corr, "st.plotly_chart (heatmap)", use_container_width=True)
+            # 热力图只标指标序号，完整名称列在下方
+            st.dataframe(
+                pd.DataFrame({'标签': batch.labels(), '指标': batch.display_names}).query('标签 in @corr.columns'),
+                use_container_width=True, hide_index=True
+            )
+    
     
     
     
@@ -162,34 +319,27 @@ if check_password():
     
     
     # --- 主页面逻辑 ---
-    df_local = load_data(sheet_name='地方')
-    china_geojson = get_china_geojson()
+    with perf.stage("data_version"):
+        data_version = data_store.data_version()
+    # 后台载入默认视图的预渲染图表（每个数据版本只启动一次），不阻塞本次运行
+    prerender.start_background(data_version)
+    with perf.stage("load_data", cached=True):
+        df_local = load_data('地方', data_version)
+    with perf.stage("get_china_geojson", cached=True):
+        china_geojson = get_china_geojson()
     
     if df_local.empty:
         st.stop()
+    
+    with perf.stage("load_index", cached=True):
+        local_index = load_index('地方', data_version)
+    with perf.stage("load_rankings", cached=True):
+        local_rankings = load_rankings('地方', data_version)
         
     # --- 新增：默认指标字典 ---
-    DEFAULT_INDICATORS_LOCAL = {
-        "基本情况统计": "截至本填报期末，监管企业营业收入（亿元）",
-        "零、总体要求": "截至本填报期末，本年度省级国资委及监管企业组织开展学习宣贯国有企业改革深化提升行动的专题会议及集中培训次数",
-        "一、优化国有经济布局结构，加快建设现代化产业体系": "截至本填报期末，本年度监管企业前瞻性战略性新兴产业营业收入占比（指标7/指标4）",
-        "二、完善国有企业科技创新机制，加快实现高水平自立自强": "截至本填报期末，本年度监管企业（全口径）研发投入强度（指标26/指标4）",
-        "三、强化国有企业对重点领域保障，支撑国家战略安全": "截至本填报期末，省级国资委针对国务院领导同志提出的十一大问题，开展专项清理整治的次数",
-        "四、以市场化方式推进整合重组，提升国有资本配置效率": "2023年以来，监管企业开展战略性重组的次（组）数",
-        "五、推动中国特色国有企业现代公司治理和市场化经营机制制度化长效化": "今年以来，一级企业通过竞争上岗方式新聘任的管理人员总人数占比（指标87/指标86）",
-        "六、健全以管资本为主的国资监管体制": "截至本填报期末，经营性国有资产集中统一监管比例",
-        "七、营造更加市场化法治化国际化的公平竞争环境": "截至本填报期末，各级子企业中，混合所有制企业户数（穿透式口径）占比（指标129/指标2）",
-        "八、全面加强国有企业党的领导和党的建设": "截至本填报期末，一级企业中已开展党建工作责任制考核的户数占比(指标135/指标1)",
-        "九、组织保障": "截至本填报期末，本地区国有企业改革深化提升行动整体任务完成百分比（自我评估值）"
-    }
-    
-    headers = [
-        "基本情况统计", "零、总体要求", "一、优化国有经济布局结构，加快建设现代化产业体系",
-        "二、完善国有企业科技创新机制，加快实现高水平自立自强", "三、强化国有企业对重点领域保障，支撑国家战略安全",
-        "四、以市场化方式推进整合重组，提升国有资本配置效率", "五、推动中国特色国有企业现代公司治理和市场化经营机制制度化长效化",
-        "六、健全以管资本为主的国资监管体制", "七、营造更加市场化法治化国际化的公平竞争环境",
-        "八、全面加强国有企业党的领导和党的建设", "九、组织保障"
-    ]
+    DEFAULT_INDICATORS_LOCAL = defaults.DEFAULT_INDICATORS_LOCAL
+    
+    headers = defaults.LOCAL_CHAPTERS
     
     # --- 新增：页面顶部的章节筛选器 ---
     st.header("地方国有企业改革深化提升行动重点量化指标仪表盘")
@@ -199,26 +349,27 @@ if check_password():
         with col1:
             
             chapter_options = headers
-            default_chapter = "基本情况统计"
+            default_chapter = defaults.LOCAL_DEFAULT_CHAPTER
             default_idx_chapter = chapter_options.index(default_chapter) if default_chapter in chapter_options else 0
             selected_chapter = st.selectbox("章节选择", options=chapter_options, index=default_idx_chapter)
     
         # 根据选择的章节，准备后续筛选器的选项
-        df_chapter = df_local[df_local['所属章节'] == selected_chapter].copy()
+        with perf.stage("章节筛选"):
+            df_chapter = local_index.chapter_rows(selected_chapter)
+            chapter_catalog = local_index.indicator_catalog[local_index.indicator_catalog['所属章节'] == selected_chapter]
     
         with col2:
             if df_chapter.empty:
                 st.selectbox("指标选择", options=["当前章节无可用指标"], disabled=True)
             else:
                 # 1. 创建 "指标序号 --- 指标名称" 格式的显示名称
-                df_chapter['指标显示名称'] = df_chapter['指标序号'].astype(str) + ' --- ' + df_chapter['指标名称']
-                indicator_options = sorted(df_chapter['指标显示名称'].unique())
+                indicator_options = sorted(chapter_catalog['指标显示名称'].unique())
                 
                 # 2. 根据新的格式来查找默认值
                 default_indicator_name = DEFAULT_INDICATORS_LOCAL.get(selected_chapter)
                 default_index = 0
                 if default_indicator_name:
-                    default_row = df_chapter[df_chapter['指标名称'] == default_indicator_name]
+                    default_row = chapter_catalog[chapter_catalog['指标名称'] == default_indicator_name]
                     if not default_row.empty:
                         default_indicator_number = default_row['指标序号'].iloc[0]
                         default_display_name = f"{default_indicator_number} --- {default_indicator_name}"
@@ -261,16 +412,15 @@ if check_password():
             st.warning("当前所选章节无可用数据。")
     else:
         # 筛选用于仪表盘的最终数据
-        panel_data = df_chapter[
-            (df_chapter['指标名称'] == selected_indicator) &
-            (df_chapter['年份'] == panel_year) &
-            (df_chapter['季度'] == panel_quarter)
-        ]
-        # 获取单位
-        unit_series = df_chapter[df_chapter['指标名称'] == selected_indicator]['单位'].dropna()
-        unit = unit_series.iloc[0] if not unit_series.empty else ''
+        with perf.stage("面板筛选"):
+            panel_data = local_index.panel_rows(selected_indicator, panel_year, panel_quarter, selected_display_name)
+            # 获取单位
+            unit_series = local_index.indicator_rows(selected_indicator)['单位'].dropna()
+            unit = unit_series.iloc[0] if not unit_series.empty else ''
     
         # --- 3. 严格按照指定的参数顺序进行函数调用 ---
+        # 地图和排名只依赖上方的章节 / 指标 / 年份 / 季度，这几项同时决定跨期对比、多指标分析和导出，
+        # 修改时整页重跑；下方各区是片段，区内的操作只重跑该区，不再重发地图
         create_dashboard(
             panel_data=panel_data, 
             unit=unit, 
@@ -279,5 +429,25 @@ if check_password():
             panel_quarter=panel_quarter, 
             selected_indicator=selected_indicator,
             selected_chapter=selected_chapter,
-            
+            ranking_cube=local_rankings,
+            data_version=data_version,
+            selected_display_name=selected_display_name,
         )
+        
+        # 导出：点击时才从列式缓存分块生成文件，平时重跑不做导出
+        export.download_panel("province_export", '地方', data_version, {
+            "省份排名": (
+                export.file_name(selected_indicator, "省份排名", f"{panel_year}Q{panel_quarter}"),
+                lambda: export.ranked(local_rankings.positions(
+                    selected_indicator, panel_year, panel_quarter, selected_display_name)[:RANKING_ROWS]),
+            ),
+            "指标完整历史（全部省份）": (
+                export.file_name(selected_indicator, "完整历史"),
+                lambda: (local_index.range_positions(selected_indicator), None),
+            ),
+        })
+        
+        create_comparison(data_version, selected_display_name, panel_year, panel_quarter)
+        create_multi_view(data_version, local_index.indicator_catalog, selected_chapter, selected_display_name, panel_year, panel_quarter)
+    
+    perf.render_panel()
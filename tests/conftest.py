@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+# 在仓库根目录下运行 pytest 时可以直接 import core
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""中央页面的指标搜索：没有匹配结果的搜索不能让页面此后一直停在“请选择一个指标”。"""
+
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from core import data_store, defaults
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(not os.path.exists(data_store.DATA_FILE), reason="没有数据文件")
+
+
+def test_indicator_recovers_after_search_without_matches():
+    at = AppTest.from_file(os.path.join(ROOT_DIR, "pages", "1_central.py"), default_timeout=120)
+    at.session_state["password_correct"] = True
+    at.run()
+    assert at.selectbox(key="indicator").value == defaults.CENTRAL_DEFAULT_INDICATOR
+
+    at.text_input[0].input("不存在的指标关键词xyz").run()
+    assert not at.exception
+    assert at.selectbox(key="indicator").value is None
+    assert any("请选择一个指标" in w.value for w in at.warning)
+
+    at.text_input[0].input("").run()
+    assert not at.exception
+    assert at.selectbox(key="indicator").value == defaults.CENTRAL_DEFAULT_INDICATOR
+    assert not any("请选择一个指标" in w.value for w in at.warning)
+    assert len(at.get("plotly_chart")) > 0
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""导出按页面建索引时的数据版本取行，工作簿更新后不会从新数据中取错行。"""
+
+import io
+import os
+
+import pyarrow.csv as pa_csv
+import pytest
+from openpyxl import Workbook
+
+from core import data_store, export
+
+HEADER = ['所属章节', '指标序号', '指标名称', '年份', '季度', '省份编号', '省份', '单位', '数值']
+
+
+def write_workbook(path, values):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = '地方'
+    ws.append(HEADER)
+    for i, value in enumerate(values, start=1):
+        ws.append(['基本情况统计', 1, '一级企业户数', 2025, 1, i, f"省{i}", '户', value])
+    wb.save(path)
+    return str(path)
+
+
+def exported_values(content):
+    return pa_csv.read_csv(io.BytesIO(content)).column('数值').to_pylist()
+
+
+def test_export_reads_the_indexed_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, "CACHE_DIR", str(tmp_path / "cache"))
+    path = write_workbook(tmp_path / "data.xlsx", [10, 20, 30])
+    old_version = data_store.data_version(path)
+    data_store.load_table('地方', path)
+
+    content = export.export_rows('地方', old_version, [2, 0], 'CSV')
+    assert exported_values(content) == [30.0, 10.0]
+
+    # 工作簿更新：新版本的缓存建立后旧版本被删除，旧位置不能再用于导出
+    path = write_workbook(tmp_path / "data.xlsx", [99, 10, 20, 30])
+    os.utime(path, ns=(1, 1))
+    new_version = data_store.data_version(path)
+    assert new_version != old_version
+    data_store.load_table('地方', path)
+    with pytest.raises(ValueError, match="数据文件已更新"):
+        export.export_rows('地方', old_version, [2, 0], 'CSV')
+    assert exported_values(export.export_rows('地方', new_version, [3, 1], 'CSV')) == [30.0, 10.0]
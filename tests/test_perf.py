@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""性能埋点的开关：没有 secrets.toml 时不能在页面上留下错误框。"""
+
+from streamlit.testing.v1 import AppTest
+
+
+def perf_page():
+    from core import perf
+
+    perf.start_run("测试页")
+    with perf.stage("阶段"):
+        pass
+    perf.render_panel()
+
+
+def test_no_secrets_file_shows_no_error():
+    at = AppTest.from_function(perf_page)
+    at.run()
+    assert not at.exception
+    assert not at.error
+    assert not at.session_state["_perf"]["enabled"]
+
+
+def test_query_param_enables_perf():
+    at = AppTest.from_function(perf_page)
+    at.query_params["perf"] = "1"
+    at.run()
+    assert not at.error
+    assert [sample["stage"] for sample in at.session_state["_perf"]["samples"]] == ["阶段"]
+
+
+def test_secrets_enable_perf():
+    at = AppTest.from_function(perf_page)
+    at.secrets["perf"] = True
+    at.run()
+    assert at.session_state["_perf"]["enabled"]
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""季度期序和 SheetIndex 时间范围查询在季度边界上的行为。"""
+
+import pandas as pd
+import pytest
+
+from core import data_store, indexing, periods
+
+INDICATOR = '研发投入'
+# 2024-Q3 到 2025-Q2 四期，每期两家企业；行序故意打乱
+QUARTERS = [(2025, 1), (2024, 3), (2025, 2), (2024, 4)]
+
+
+@pytest.fixture(scope="module")
+def index():
+    rows = [
+        {'所属章节': '创新', '指标序号': '1', '指标名称': INDICATOR, '企业名称': company,
+         '年份': year, '季度': quarter, '数值': float(year * 10 + quarter)}
+        for year, quarter in QUARTERS for company in ('甲', '乙')
+    ]
+    df = data_store.add_derived_columns(pd.DataFrame(rows), '中央')
+    return indexing.SheetIndex(df, '企业名称')
+
+
+def quarters_of(index, positions):
+    rows = index.df.take(positions)
+    return list(zip(rows['年份'], rows['季度']))
+
+
+def test_ordinal_crosses_year_boundary():
+    assert periods.period_ordinal(2025, 1) - periods.period_ordinal(2024, 4) == 1
+    assert periods.ordinal_to_period(periods.period_ordinal(2024, 4) + 1) == (2025, 1)
+    assert periods.period_label(periods.period_ordinal(2024, 4)) == "2024-Q4"
+
+
+def test_range_across_year_boundary(index):
+    positions = index.range_positions(
+        INDICATOR, periods.period_ordinal(2024, 4), periods.period_ordinal(2025, 1)
+    )
+    assert quarters_of(index, positions) == [(2024, 4), (2024, 4), (2025, 1), (2025, 1)]
+
+
+def test_range_within_one_quarter(index):
+    ordinal = periods.period_ordinal(2024, 3)
+    positions = index.range_positions(INDICATOR, ordinal, ordinal)
+    assert quarters_of(index, positions) == [(2024, 3), (2024, 3)]
+    # 同期内保持原始行序
+    assert list(index.df.take(positions)['企业名称']) == ['甲', '乙']
+
+
+def test_inverted_range_is_empty(index):
+    positions = index.range_positions(
+        INDICATOR, periods.period_ordinal(2025, 2), periods.period_ordinal(2024, 3)
+    )
+    assert len(positions) == 0
+
+
+@pytest.mark.parametrize("start, end", [((2023, 1), (2024, 2)), ((2025, 3), (2026, 4))])
+def test_range_outside_data_is_empty(index, start, end):
+    positions = index.range_positions(INDICATOR, periods.period_ordinal(*start), periods.period_ordinal(*end))
+    assert len(positions) == 0
+    assert index.indicator_range(INDICATOR, periods.period_ordinal(*start), periods.period_ordinal(*end)).empty
+
+
+def test_open_ended_range_and_unknown_indicator(index):
+    assert len(index.range_positions(INDICATOR)) == 2 * len(QUARTERS)
+    assert len(index.range_positions('不存在的指标', 0, 10 ** 6)) == 0
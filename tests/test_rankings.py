@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""排名立方体与行位置索引：并列数值的先后规则；同一指标名称对应多个指标序号时按指标显示名称取行。"""
+
+import pandas as pd
+
+from core import indexing, rankings
+
+
+def local_frame():
+    rows = []
+    for number, values in [(104, [5, 3, 4]), (106, [1, 9, 2])]:
+        for province, value in zip(['北京市', '天津市', '河北省'], values):
+            rows.append({'所属章节': '五', '指标序号': number, '指标名称': '累计激励总人数', '年份': 2025, '季度': 1,
+                         '省份': province, '数值': float(value),
+                         '指标显示名称': f"{number} --- 累计激励总人数"})
+    return pd.DataFrame(rows)
+
+
+def test_display_name_selects_one_number():
+    df = local_frame()
+    cube = rankings.RankingCube(df, '省份')
+    index = indexing.SheetIndex(df, '省份')
+
+    assert len(cube.ranking('累计激励总人数', 2025, 1)) == 6
+    table = cube.ranking('累计激励总人数', 2025, 1, display_name="106 --- 累计激励总人数")
+    assert table['省份'].tolist() == ['天津市', '河北省', '北京市']
+    assert table['排名'].tolist() == [1, 2, 3]
+
+    panel = index.panel_rows('累计激励总人数', 2025, 1, "104 --- 累计激励总人数")
+    assert panel['数值'].tolist() == [5.0, 3.0, 4.0]
+
+
+def test_ties_keep_workbook_row_order():
+    # 数值降序，并列时按工作簿中的行序（不是按省份名，也不随 nlargest 的实现变化）
+    df = pd.DataFrame({
+        '指标名称': '一级企业户数', '年份': 2025, '季度': 1,
+        '省份': ['北京市', '天津市', '上海市', '重庆市', '安徽省', '甘肃省'],
+        '数值': [40.0, 32.0, 40.0, 36.0, 29.0, 29.0],
+    })
+    df = df.iloc[[0, 1, 2, 3, 5, 4]].reset_index(drop=True)
+    cube = rankings.RankingCube(df, '省份')
+    assert cube.ranking('一级企业户数', 2025, 1)['省份'].tolist() == [
+        '北京市', '上海市', '重庆市', '天津市', '甘肃省', '安徽省'
+    ]
+    assert cube.top('一级企业户数', 2025, 1, 2)['省份'].tolist() == ['北京市', '上海市']
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""按季度增量刷新：工作簿追加一期、改动一期后只重新解析这两期，结果与整表解析逐行相同。"""
+
+import re
+import zipfile
+
+import pandas as pd
+import pyarrow.feather as feather
+from openpyxl import Workbook
+
+from core import data_store, refresh
+
+SST_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+INLINE_RE = re.compile(rb'<c r="([A-Z]+\d+)" t="inlineStr"><is><t>(.*?)</t></is></c>')
+
+HEADER = ['所属章节', '指标序号', '指标名称', '年份', '季度', '省份编号', '省份', '单位', '数值']
+PROVINCES = ['北京市', '天津市', '河北省']
+
+
+def period_rows(year, quarter, base):
+    return [
+        ['基本情况统计', 1, '一级企业户数', year, quarter, i, province, '户', base + i]
+        for i, province in enumerate(PROVINCES, start=1)
+    ] + [['基本情况统计', 2, '二级企业户数', year, quarter, 1, '北京市', '户', f"{base / 10}%"]]
+
+
+def write_workbook(path, rows):
+    """写出共享字符串形式的工作簿（Excel 的保存方式），字符串按首次出现的顺序编号。"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = '地方'
+    for row in [HEADER, *rows]:
+        ws.append(row)
+    inline_path = f"{path}.inline"
+    wb.save(inline_path)
+    with zipfile.ZipFile(inline_path) as zin, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zout:
+        strings = {}
+
+        def shared(match):
+            index = strings.setdefault(match.group(2), len(strings))
+            return b'<c r="%s" t="s"><v>%d</v></c>' % (match.group(1), index)
+
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = INLINE_RE.sub(shared, data)
+            elif item.filename == "[Content_Types].xml":
+                data = data.replace(b"</Types>", b'<Override PartName="/xl/sharedStrings.xml" ContentType='
+                                    b'"application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml" />'
+                                    b"</Types>")
+            elif item.filename == "xl/_rels/workbook.xml.rels":
+                data = data.replace(b"</Relationships>", b'<Relationship Type="http://schemas.openxmlformats.org/'
+                                    b'officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml" '
+                                    b'Id="rIdSst" /></Relationships>')
+            zout.writestr(item, data)
+        items = b"".join(b"<si><t>%s</t></si>" % text for text in strings)
+        zout.writestr("xl/sharedStrings.xml", b'<sst xmlns="%s" count="%d" uniqueCount="%d">%s</sst>'
+                      % (SST_NS.encode(), len(strings), len(strings), items))
+    return str(path)
+
+
+def cached_frame(sheet_name, version):
+    return feather.read_table(data_store.cache_path(sheet_name, version)).to_pandas()
+
+
+def test_append_and_edit_refresh_incrementally(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, "CACHE_DIR", str(tmp_path / "cache"))
+    rows = period_rows(2024, 4, 10) + period_rows(2025, 1, 20) + period_rows(2025, 2, 30)
+    old_path = write_workbook(tmp_path / "old.xlsx", rows)
+    stats = refresh.refresh_sheet('地方', old_path)
+    assert stats["mode"] == "full"
+
+    # 改动 2025Q1 的一行（换成新的省份名），再追加 2025Q3（带新的单位）
+    rows[4] = ['基本情况统计', 1, '一级企业户数', 2025, 1, 4, '山西省', '户', 99]
+    rows += [[*row[:7], '家', row[8]] for row in period_rows(2025, 3, 40)]
+    new_path = write_workbook(tmp_path / "new.xlsx", rows)
+    # 与 Excel 保存时相同：共享字符串表被重写，新字符串插在中间，后面各期的下标整体后移
+    with zipfile.ZipFile(old_path) as old, zipfile.ZipFile(new_path) as new:
+        assert old.read("xl/sharedStrings.xml") != new.read("xl/sharedStrings.xml")
+
+    stats = refresh.refresh_sheet('地方', new_path)
+    assert stats["mode"] == "incremental"
+    assert stats["changed"] == ['2025-1', '2025-3']
+    assert stats["removed"] == []
+    assert stats["parsed_rows"] == 8
+
+    version = data_store.data_version(new_path)
+    merged = cached_frame('地方', version)
+    expected = data_store.parse_sheet('地方', new_path)
+    pd.testing.assert_frame_equal(merged, expected)
+    assert merged.loc[4, '省份'] == '山西省'
+
+
+def test_removed_period_is_dropped(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, "CACHE_DIR", str(tmp_path / "cache"))
+    rows = period_rows(2024, 4, 10) + period_rows(2025, 1, 20) + period_rows(2025, 2, 30)
+    refresh.refresh_sheet('地方', write_workbook(tmp_path / "old.xlsx", rows))
+
+    new_path = write_workbook(tmp_path / "new.xlsx", rows[4:])
+    stats = refresh.refresh_sheet('地方', new_path)
+    assert stats["mode"] == "incremental"
+    assert stats["changed"] == []
+    assert stats["removed"] == ['2024-4']
+    pd.testing.assert_frame_equal(
+        cached_frame('地方', data_store.data_version(new_path)), data_store.parse_sheet('地方', new_path)
+    )
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""流式解析与增量刷新对页脚、备注行的处理：与 read_excel + dropna(subset=['数值']) 的结果一致。"""
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from core import data_store, xlsx_stream
+
+HEADER = ['所属章节', '指标序号', '指标名称', '年份', '季度', '省份编号', '省份', '单位', '数值']
+ROWS = [
+    ['基本情况统计', 1, '一级企业户数', 2025, 1, 1, '北京市', '户', 40],
+    ['基本情况统计', 1, '一级企业户数', 2025, 1, 2, '天津市', '户', '32%'],
+    ['基本情况统计', 1, '一级企业户数', 2024, 4, 1, '北京市', '户', 38],
+]
+
+
+def write_workbook(path, footer, sheet_name='地方'):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = sheet_name
+    for row in [HEADER, *ROWS, *footer]:
+        ws.append(row)
+    wb.save(path)
+    return str(path)
+
+
+@pytest.fixture(params=["only_a", "empty_strings"])
+def footer(request):
+    if request.param == "only_a":
+        # Excel 中常见的页脚：只有第一列有内容
+        return [["注：数据截至本填报期末"]]
+    # pandas 写出的空行：每列都是空字符串
+    return [[""] * len(HEADER)]
+
+
+def test_footer_rows_are_dropped(tmp_path, footer):
+    path = write_workbook(tmp_path / "data.xlsx", footer)
+    df = xlsx_stream.read_sheet(path, '地方')
+    assert len(df) == len(ROWS)
+    assert df['数值'].tolist() == [40.0, 32.0, 38.0]
+    assert df['年份'].dtype == 'int64'
+    # 原先的做法：read_excel 后去掉 '%' 转数值，丢弃转换失败的行
+    raw = pd.read_excel(path, sheet_name='地方')
+    expected = pd.to_numeric(raw['数值'].astype(str).str.replace('%', ''), errors='coerce').dropna()
+    assert df['数值'].tolist() == expected.tolist()
+
+
+def test_refresh_skips_footer_rows(tmp_path, monkeypatch, footer):
+    monkeypatch.setattr(data_store, "CACHE_DIR", str(tmp_path / "cache"))
+    path = write_workbook(tmp_path / "data.xlsx", footer)
+    df = data_store.load_sheet('地方', path)
+    assert df['数值'].tolist() == [40.0, 32.0, 38.0]
+    assert df['季度'].tolist() == [1, 1, 4]
+
+
+def test_bad_integer_names_the_row(tmp_path):
+    bad = ['基本情况统计', 1, '一级企业户数', '二〇二五', 1, 3, '河北省', '户', 12]
+    path = write_workbook(tmp_path / "data.xlsx", [bad])
+    with pytest.raises(ValueError, match="第 5 行 '年份' 列"):
+        xlsx_stream.read_sheet(path, '地方')